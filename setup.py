@@ -38,11 +38,14 @@ setup(
         'requests',
         'pymongo',
         'psutil',
-        'elasticsearch',
+        'elasticsearch>=8',
         'kafka-python'
     ] + (
          ["pywin32"] if "nt" == os.name else []
         ),
+    extras_require={
+        'numpy': ['numpy']
+    },
     include_package_data=True,
     zip_safe=False,
     scripts=[
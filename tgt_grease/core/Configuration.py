@@ -177,7 +177,12 @@ default configuration is accessible!
                 'verbose': False,
                 'trace': False,
                 'foreground': False,
-                'file': Configuration.greaseDir + 'log' + os.sep + 'grease.log'
+                'file': Configuration.greaseDir + 'log' + os.sep + 'grease.log',
+                'async': False,
+                'queue_size': 10000,
+                'overflow': 'block',
+                'batch_size': 100,
+                'flush_interval': .5
             },
             'Notifications': {
                 'HipChat': {
@@ -188,6 +193,12 @@ default configuration is accessible!
                 'Slack': {
                     'enabled': False,
                     'webhookURL': ''
+                },
+                'Dispatcher': {
+                    'async': True,
+                    'queue_size': 1000,
+                    'coalesce_window': 60,
+                    'rate_limit': 30
                 }
             },
             'Configuration': {
@@ -197,7 +208,28 @@ default configuration is accessible!
                 'dir': Configuration.greaseDir + 'etc' + os.sep,
                 'source': None,
                 'config': None,
-                'mock': False
+                'mock': False,
+                'max_workers': 20,
+                'source_concurrency': 4,
+                'source_limits': {},
+                'time_budget': 600,
+                'partition': True,
+                'partition_replicas': 100,
+                'partition_refresh': 10,
+                'elastic_pool_size': 10,
+                'elastic_idle': 300,
+                'sql_pool_size': 5,
+                'url_pool_size': 20,
+                'url_connect_timeout': 5,
+                'url_read_timeout': 30,
+                'url_cache_size': 10000,
+                'async_max_tasks': 1000,
+                'async_workers': 4,
+                'backpressure': True,
+                'backpressure_shed': 5000,
+                'backpressure_pause': 20000,
+                'backpressure_refresh': 5,
+                'backpressure_delay': 5
             },
             'Import': {
                 'searchPath': [
@@ -212,7 +244,13 @@ default configuration is accessible!
             },
             "NodeInformation": {
                 "ResourceMax": 95,
-                "DeduplicationThreads": 150
+                "DeduplicationThreads": 150,
+                "DetectionWorkers": 1,
+                "DetectionBatchSize": 100,
+                "DetectionClaimTimeout": 10,
+                "DetectionCache": False,
+                "DetectionCacheTTL": 300,
+                "DetectionCacheSize": 10000
             },
             "Additional": {}
         }
@@ -1,11 +1,18 @@
 from tgt_grease.core import Configuration, Notifications
 from logging import config
 from datetime import datetime
+import threading
 import logging
+import atexit
 import os
 import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 GREASE_LOG_HANDLER = None
+GREASE_LOG_WRITER = None
 
 
 class Logging(object):
@@ -14,6 +21,9 @@ class Logging(object):
     This is the primary configuration source for GREASE logging. All log information will be passed here to
     enable centralized log aggregation
 
+    Note:
+        Set `async` in the Logging configuration to write log messages from a background thread. See AsyncLogWriter
+
     Attributes:
         _conf (Configuration): This is an instance of the Config to enable configuring loggers
         _logger (logging.Logger): This is the actual logger for GREASE
@@ -58,8 +68,16 @@ class Logging(object):
     def TriageMessage(self, message, additional=None, verbose=False, trace=False, notify=False, level=logging.DEBUG):
         """Central message handler
 
+        Note:
+            `message` may be a callable returning the message. It will only be called if the message is going to be
+            logged, so expensive messages on verbose/trace calls cost nothing when those modes are disabled
+
+        Note:
+            If `async` is enabled in the Logging configuration formatting & writing happen on the background log
+            writer. See AsyncLogWriter
+
         Args:
-            message (str): Message to Log
+            message (str|callable): Message to Log
             additional (object): Additional information to log
             verbose (bool): To be printed if verbose is enabled
             trace (bool): To be printed if trace is enabled
@@ -70,12 +88,57 @@ class Logging(object):
             bool: Log Success
 
         """
+        global GREASE_LOG_WRITER
         # first prevent verbose processing
         if verbose and not self._conf.get('Logging', 'verbose'):
             return True
         # prevent trace processing
         if trace and not self._conf.get('Logging', 'trace'):
             return True
+        foreground = bool(self._conf.get('Logging', 'foreground') or self.foreground)
+        if isinstance(GREASE_LOG_WRITER, AsyncLogWriter) and self._conf.get('Logging', 'async'):
+            # resolve lazy messages now so they reflect current state; the rest of formatting happens in the writer
+            if callable(message):
+                message = message()
+            queued = GREASE_LOG_WRITER.put(
+                (self, message, additional, verbose, trace, level, time.time(), foreground)
+            )
+            if notify:
+                return bool(self._notifications.SendMessage(
+                    self.FormatMessage(message, additional, verbose, trace, level),
+                    level
+                ))
+            return queued
+        message = self.FormatMessage(message, additional, verbose, trace, level)
+        # Foreground mode print log messages
+        if foreground:
+            print("{0}::{1}".format(datetime.utcnow(), message))
+        # actually log the message
+        if level is 0:
+            self._logger.log(logging.DEBUG, message)
+        else:
+            self._logger.log(level, message)
+        # notify if needed
+        if notify:
+            return bool(self._notifications.SendMessage(message, level))
+        return True
+
+    def FormatMessage(self, message, additional=None, verbose=False, trace=False, level=logging.DEBUG):
+        """Builds the final log line for a message
+
+        Args:
+            message (str|callable): Message to Log; callables are called to get the message
+            additional (object): Additional information to log
+            verbose (bool): Message is a verbose message
+            trace (bool): Message is a trace message
+            level (int): Log Level
+
+        Returns:
+            str: Formatted message
+
+        """
+        if callable(message):
+            message = message()
         # create a pre-message
         if level is 0:
             preMsg = "TRACE"
@@ -99,18 +162,18 @@ class Logging(object):
             message = "{0}::{1}::{2}::{3}".format(preMsg, self._conf.NodeIdentity, message, additional)
         else:
             message = "{0}::{1}::{2}".format(preMsg, self._conf.NodeIdentity, message)
-        # Foreground mode print log messages
-        if self._conf.get('Logging', 'foreground') or self.foreground:
-            print("{0}::{1}".format(datetime.utcnow(), message))
-        # actually log the message
-        if level is 0:
-            self._logger.log(logging.DEBUG, message)
-        else:
-            self._logger.log(level, message)
-        # notify if needed
-        if notify:
-            return bool(self._notifications.SendMessage(message, level))
-        return True
+        return message
+
+    def flush(self):
+        """Blocks until all queued log messages have been written
+
+        Returns:
+            None: Void Method; returns immediately if asynchronous logging is not in use
+
+        """
+        global GREASE_LOG_WRITER
+        if isinstance(GREASE_LOG_WRITER, AsyncLogWriter):
+            GREASE_LOG_WRITER.flush()
 
     def trace(self, message, additional=None, verbose=False, trace=True, notify=False):
         """Trace Messages
@@ -277,6 +340,28 @@ class Logging(object):
                 self.DefaultLogger()
         else:
             self.DefaultLogger()
+        self.ProvisionWriter()
+
+    def ProvisionWriter(self):
+        """Starts the background log writer if asynchronous logging is configured
+
+        The writer is shared by every Logging instance in the process
+
+        Returns:
+            None: Void Method
+
+        """
+        global GREASE_LOG_WRITER
+        if self._conf.get('Logging', 'async') and not isinstance(GREASE_LOG_WRITER, AsyncLogWriter):
+            GREASE_LOG_WRITER = AsyncLogWriter(
+                self._logger,
+                queue_size=self._conf.get('Logging', 'queue_size', 10000),
+                overflow=self._conf.get('Logging', 'overflow', 'block'),
+                batch_size=self._conf.get('Logging', 'batch_size', 100),
+                flush_interval=self._conf.get('Logging', 'flush_interval', .5)
+            )
+            # ensure queued messages make it to disk on exit
+            atexit.register(GREASE_LOG_WRITER.flush)
 
     def DefaultLogger(self):
         """Default Logging Provisioning
@@ -308,3 +393,150 @@ class Logging(object):
                 GREASE_LOG_HANDLER.setLevel(logging.DEBUG)
                 GREASE_LOG_HANDLER.setFormatter(self._formatter)
                 self._logger.addHandler(GREASE_LOG_HANDLER)
+
+
+class AsyncLogWriter(object):
+    """Background writer for asynchronous GREASE logging
+
+    Log entries are placed on a bounded in-memory queue by any thread and a single daemon thread formats & writes
+    them in batches. When the default GREASE handler is in use the batch is written to its stream and flushed once
+    rather than once per message
+
+    Attributes:
+        queue (queue.Queue): Bounded queue of pending log entries
+        overflow (str): Policy when the queue is full; `block` waits for space, `drop` discards the entry
+        batch_size (int): Maximum entries written per flush
+        flush_interval (float): Seconds to wait for a batch to fill before flushing
+        dropped (int): Total entries discarded because the queue was full
+
+    """
+
+    def __init__(self, logger, queue_size=10000, overflow='block', batch_size=100, flush_interval=.5):
+        self._logger = logger
+        self.queue = queue.Queue(maxsize=int(queue_size))
+        self.overflow = str(overflow)
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = float(flush_interval)
+        self.dropped = 0
+        self._dropped_reported = 0
+        self._dropped_lock = threading.Lock()
+        self._start()
+        if hasattr(os, 'register_at_fork'):
+            # threads do not survive fork; entries queued before it belong to the parent
+            os.register_at_fork(after_in_child=self._start)
+
+    def _start(self):
+        """Starts the writer thread with an empty queue"""
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self._dropped_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="GREASE LOG WRITER")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def put(self, entry):
+        """Queue an entry for writing
+
+        Args:
+            entry (tuple): (Logging, message, additional, verbose, trace, level, created, foreground)
+
+        Returns:
+            bool: False if the entry was dropped due to a full queue
+
+        """
+        entry = entry + (threading.current_thread().name,)
+        if self.overflow == 'drop':
+            try:
+                self.queue.put_nowait(entry)
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += 1
+                return False
+        else:
+            self.queue.put(entry)
+        return True
+
+    def flush(self):
+        """Blocks until every queued entry has been written
+
+        Returns:
+            None: Void Method
+
+        """
+        self.queue.join()
+
+    def _run(self):
+        """Writer loop; runs forever in the writer thread
+
+        Returns:
+            None: Never returns
+
+        """
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                try:
+                    if remaining > 0:
+                        batch.append(self.queue.get(timeout=remaining))
+                    else:
+                        batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                # never let the writer die; fall back to stderr so the failure is visible
+                print("GREASE LOG WRITER FAILED [{0}]".format(e))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _write(self, batch):
+        """Formats & writes a batch of entries
+
+        Args:
+            batch (list[tuple]): Entries from the queue
+
+        Returns:
+            None: Void Method
+
+        """
+        global GREASE_LOG_HANDLER
+        if isinstance(GREASE_LOG_HANDLER, logging.StreamHandler) and GREASE_LOG_HANDLER in self._logger.handlers:
+            handler = GREASE_LOG_HANDLER
+        else:
+            handler = None
+        lines = []
+        with self._dropped_lock:
+            dropped = self.dropped - self._dropped_reported
+            self._dropped_reported = self.dropped
+        if dropped:
+            batch = list(batch) + [(
+                None, "Log queue full; dropped [{0}] messages".format(dropped), None, False, False,
+                logging.WARNING, time.time(), False, self._thread.name
+            )]
+        for log, message, additional, verbose, trace, level, created, foreground, threadName in batch:
+            if log:
+                message = log.FormatMessage(message, additional, verbose, trace, level)
+            if foreground:
+                print("{0}::{1}".format(datetime.utcfromtimestamp(created), message))
+            if level == 0:
+                level = logging.DEBUG
+            record = self._logger.makeRecord(self._logger.name, level, __file__, 0, message, None, None)
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            record.threadName = threadName
+            if handler is None:
+                self._logger.handle(record)
+            elif record.levelno >= handler.level and handler.filter(record):
+                lines.append(handler.format(record))
+        if lines:
+            handler.acquire()
+            try:
+                if handler.stream is None and hasattr(handler, '_open'):
+                    handler.stream = handler._open()
+                handler.stream.write("\n".join(lines) + "\n")
+                handler.flush()
+            finally:
+                handler.release()
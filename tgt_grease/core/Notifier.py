@@ -1,9 +1,15 @@
 from tgt_grease.core import Configuration
 from logging import DEBUG, INFO, WARNING, ERROR, CRITICAL
-from urllib3.exceptions import HTTPError
-import requests
+import threading
+import atexit
 import json
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
+GREASE_NOTIFICATION_DISPATCHER = None
 
 
 class Notifications(object):
@@ -11,25 +17,45 @@ class Notifications(object):
 
     This is the class to handle all notifications to third party resources
 
+    Note:
+        Notifications are sent from a background thread unless `async` is set to False in the `Dispatcher` block of
+        the Notifications configuration. See NotificationDispatcher
+
     Attributes:
         _conf (Configuration): Configuration Object
         hipchat_url (str): This is the hipchat API url
         hipchat_token (str): set this to override the config for the auth token
         hipchat_room (str): set this to override the config for the room
+        timeout (int): Seconds to wait on a notification channel's API
 
     """
 
     _conf = None
+    _sessions = None
     # HipChat Configuration
     hipchat_url = "https://api.hipchat.com/v2/room/"
     hipchat_token = None
     hipchat_room = None
+    timeout = 10
 
     def __init__(self, Config=None):
+        global GREASE_NOTIFICATION_DISPATCHER
         if Config and isinstance(Config, Configuration):
             self._conf = Config
         else:
             self._conf = Configuration()
+        # requests sessions are not thread safe so each thread sending notifications gets its own
+        self._sessions = threading.local()
+        if self._dispatcher_config().get('async', True) \
+                and not isinstance(GREASE_NOTIFICATION_DISPATCHER, NotificationDispatcher):
+            GREASE_NOTIFICATION_DISPATCHER = NotificationDispatcher(
+                self,
+                queue_size=self._dispatcher_config().get('queue_size', 1000),
+                coalesce_window=self._dispatcher_config().get('coalesce_window', 60),
+                rate_limit=self._dispatcher_config().get('rate_limit', 30)
+            )
+            # give pending notifications a chance to go out on exit
+            atexit.register(GREASE_NOTIFICATION_DISPATCHER.flush, 10)
 
     def SendMessage(self, message, level=DEBUG, channel=None):
         """Send Message to configured channels
@@ -43,6 +69,9 @@ class Notifications(object):
         Note:
             if you use the channel argument and the channel is not found you will receive False back
 
+        Note:
+            If the dispatcher is enabled this only queues the message & returns True; False if the queue was full
+
         Args:
             message (str): Message to send
             level (int): Level of message to be sent
@@ -52,9 +81,13 @@ class Notifications(object):
             bool: Success of sending
 
         """
-        if channel \
-                and 'enabled' in self._conf.get('Notifications', channel, {}) \
-                and self._conf.get('Notifications', channel, {}).get('enabled'):
+        global GREASE_NOTIFICATION_DISPATCHER
+        if channel and not self.enabled_channels(channel):
+            return False
+        if isinstance(GREASE_NOTIFICATION_DISPATCHER, NotificationDispatcher) \
+                and self._dispatcher_config().get('async', True):
+            return GREASE_NOTIFICATION_DISPATCHER.put(message, level, channel)
+        if channel:
             return bool(self._route_notification(channel, message, level))
         else:
             # Capture object for notification channel statuses
@@ -78,6 +111,53 @@ class Notifications(object):
                 # nothing was configured to run return true
                 return True
 
+    def enabled_channels(self, channel=None):
+        """Returns the notification channels a message will be sent to
+
+        Args:
+            channel (str): Specific channel to notify
+
+        Returns:
+            list[str]: Enabled channels
+
+        """
+        channels = []
+        for Notifier, Config in self._conf.get('Notifications', default={}).items():
+            if channel and Notifier != channel:
+                continue
+            if isinstance(Config, dict) and 'enabled' in Config and Config.get('enabled'):
+                channels.append(Notifier)
+        return channels
+
+    def _dispatcher_config(self):
+        """Returns the notification dispatcher configuration
+
+        Returns:
+            dict: Dispatcher configuration; empty if not configured
+
+        """
+        dispatcher = self._conf.get('Notifications', 'Dispatcher', {})
+        if isinstance(dispatcher, dict):
+            return dispatcher
+        return {}
+
+    def _get_session(self):
+        """Returns the HTTP session used for notifications
+
+        The session is reused between messages of the calling thread so connections to the channel's API are kept
+        alive
+
+        Returns:
+            requests.Session: HTTP session
+
+        """
+        import requests
+        if self._sessions is None:
+            self._sessions = threading.local()
+        if getattr(self._sessions, 'session', None) is None:
+            self._sessions.session = requests.Session()
+        return self._sessions.session
+
     def _route_notification(self, channel, message, level):
         """Handle actual calling of notification channels
 
@@ -134,20 +214,23 @@ class Notifications(object):
                 self._conf.get('Notifications', 'HipChat').get('room'),
                 self._conf.get('Notifications', 'HipChat').get('token')
             )
+        from urllib3.exceptions import HTTPError
+        import requests
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 url=url,
                 data={
                     'message': message,
                     'color': color
                 },
-                verify=False
+                verify=False,
+                timeout=self.timeout
                 )
             if response.status_code == 204:
                 return True
             else:
                 return False
-        except HTTPError:
+        except (HTTPError, requests.RequestException):
             return False
 
     def send_slack_message(self, message):
@@ -163,13 +246,210 @@ class Notifications(object):
 
         webhook_url = self._conf.get('Notifications', 'Slack').get('webhookURL')
         slack_data = {'text': message}
+        from urllib3.exceptions import HTTPError
+        import requests
 
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 webhook_url, data=json.dumps(slack_data),
-                headers={'Content-Type': 'application/json'}
+                headers={'Content-Type': 'application/json'},
+                timeout=self.timeout
             )
             return True
-        except HTTPError:
+        except (HTTPError, requests.RequestException):
+            return False
+
+
+class NotificationDispatcher(object):
+    """Background dispatcher for GREASE notifications
+
+    Messages are queued by any thread and sent by a single daemon thread so failing services never stall the thread
+    that logged the error. Identical messages to a channel within `coalesce_window` seconds are sent once, followed by
+    a single summary with how many times they repeated. Each channel is limited to `rate_limit` messages a minute,
+    overridable via a `rate_limit` key in that channel's configuration; a limit of 0 disables rate limiting
+
+    Attributes:
+        queue (queue.Queue): Bounded queue of pending (channel, message, level) notifications
+        coalesce_window (float): Seconds identical messages are coalesced for
+        rate_limit (int): Default messages per minute per channel
+        sent (int): Notifications sent successfully
+        failed (int): Notifications a channel failed to send
+        coalesced (int): Notifications folded into an earlier identical one
+        rate_limited (int): Notifications discarded by a channel's rate limit
+        dropped (int): Notifications discarded because the queue was full
+
+    """
+
+    def __init__(self, notifications, queue_size=1000, coalesce_window=60, rate_limit=30):
+        self._notifications = notifications
+        self.queue = queue.Queue(maxsize=int(queue_size))
+        self.coalesce_window = float(coalesce_window)
+        self.rate_limit = int(rate_limit)
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.dropped = 0
+        # (channel, level, message) -> [window start, repeats]
+        self._windows = {}
+        # channel -> [tokens, last refill]
+        self._buckets = {}
+        self._thread = threading.Thread(target=self._run, name="GREASE NOTIFICATION DISPATCHER")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def put(self, message, level=DEBUG, channel=None):
+        """Queue a message for every enabled channel (or only `channel`)
+
+        Args:
+            message (str): Message to send
+            level (int): Level of message to be sent
+            channel (str): Specific channel to notify
+
+        Returns:
+            bool: False if a notification was dropped because the queue was full or `channel` is not enabled
+
+        """
+        channels = self._notifications.enabled_channels(channel)
+        if channel and not channels:
+            return False
+        queued = True
+        for enabled in channels:
+            try:
+                self.queue.put_nowait((enabled, message, level))
+            except queue.Full:
+                self.dropped += 1
+                queued = False
+        return queued
+
+    def flush(self, timeout=None):
+        """Waits for queued notifications to be processed
+
+        Args:
+            timeout (float): Maximum seconds to wait; waits forever if None
+
+        Returns:
+            bool: True if the queue was emptied
+
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                if deadline is None:
+                    self.queue.all_tasks_done.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                    self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self):
+        """Dispatch loop; runs forever in the dispatcher thread
+
+        Returns:
+            None: Never returns
+
+        """
+        while True:
+            try:
+                channel, message, level = self.queue.get(timeout=min(max(self.coalesce_window, .1), 1))
+            except queue.Empty:
+                self._expire_windows()
+                continue
+            try:
+                self._dispatch(channel, message, level)
+            except Exception:
+                # a broken channel must never kill the dispatcher
+                pass
+            finally:
+                self.queue.task_done()
+            self._expire_windows()
+
+    def _dispatch(self, channel, message, level):
+        """Sends a message unless an identical one was sent within the coalesce window
+
+        Args:
+            channel (str): Channel to notify
+            message (str): Message to send
+            level (int): Level to send at
+
+        Returns:
+            None: Void Method
+
+        """
+        key = (channel, level, message)
+        window = self._windows.get(key)
+        if window and time.time() - window[0] < self.coalesce_window:
+            window[1] += 1
+            self.coalesced += 1
+            return
+        self._windows[key] = [time.time(), 0]
+        self._send(channel, message, level)
+
+    def _expire_windows(self):
+        """Closes finished coalesce windows, sending a summary for any that saw repeats
+
+        Returns:
+            None: Void Method
+
+        """
+        now = time.time()
+        for key, window in list(self._windows.items()):
+            if now - window[0] < self.coalesce_window:
+                continue
+            del self._windows[key]
+            if window[1]:
+                channel, level, message = key
+                try:
+                    self._send(
+                        channel,
+                        "{0} [repeated {1} times in {2} seconds]".format(message, window[1], self.coalesce_window),
+                        level
+                    )
+                except Exception:
+                    pass
+
+    def _send(self, channel, message, level):
+        """Sends a message if the channel's rate limit allows
+
+        Args:
+            channel (str): Channel to notify
+            message (str): Message to send
+            level (int): Level to send at
+
+        Returns:
+            bool: If the message was sent successfully
+
+        """
+        if not self._take_token(channel):
+            self.rate_limited += 1
             return False
+        if self._notifications._route_notification(channel, message, level):
+            self.sent += 1
+            return True
+        self.failed += 1
+        return False
+
+    def _take_token(self, channel):
+        """Token bucket rate limiting per channel
+
+        Args:
+            channel (str): Channel to take a token for
 
+        Returns:
+            bool: True if the channel may send
+
+        """
+        limit = self._notifications._conf.get('Notifications', channel, {}).get('rate_limit', self.rate_limit)
+        limit = float(limit)
+        if limit <= 0:
+            return True
+        now = time.time()
+        bucket = self._buckets.setdefault(channel, [limit, now])
+        bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * limit / 60.0)
+        bucket[1] = now
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
@@ -2,7 +2,6 @@ from unittest import TestCase
 from unittest.case import SkipTest
 from tgt_grease.core import GreaseContainer
 from tgt_grease.enterprise.Model import Detect
-import pkg_resources
 import os
 import json
 
@@ -89,6 +88,7 @@ class AutomationTest(TestCase):
             self.assertTrue(config, "Ensuring MongoDB has configuration")
             config = dict(config)
         elif str(self.configuration).startswith("pkg://"):
+            import pkg_resources
             if os.path.isfile(pkg_resources.resource_filename('tgt_grease', str(self.configuration).split("://")[1])):
                 with open(pkg_resources.resource_filename('tgt_grease', str(self.configuration).split("://")[1]), 'rb') as fil:
                     config = json.loads(fil.read())
@@ -0,0 +1,69 @@
+from unittest import TestCase, skipIf
+import subprocess
+import sys
+import os
+
+
+class TestImportTime(TestCase):
+    """Guards the startup latency of the GREASE CLI & daemon
+
+    Importing GREASE should never pull in the client libraries for sources, kafka or notifications. These are loaded on
+    first use instead. MongoDB's driver is not among them since every command connects to MongoDB anyway.
+
+    """
+
+    heavy_modules = ['kafka', 'elasticsearch', 'psycopg2', 'requests', 'psutil', 'pkg_resources', 'numpy']
+    # generous ceiling in milliseconds for `import tgt_grease`; eager imports used to cost roughly 600ms alone
+    import_budget = 1000
+
+    def test_heavy_modules_not_imported(self):
+        output = self._run_python(
+            ['-c', "import sys; import tgt_grease; print(','.join(sorted(sys.modules.keys())))"]
+        )[0]
+        loaded = set(output.strip().split(','))
+        for module in self.heavy_modules:
+            self.assertNotIn(module, loaded, "[{0}] was imported eagerly by tgt_grease".format(module))
+
+    @skipIf(sys.version_info < (3, 7), "-X importtime requires Python 3.7+")
+    def test_import_time_report(self):
+        report = self._import_time_report()
+        self.assertIn('tgt_grease', report)
+        for module in self.heavy_modules:
+            self.assertNotIn(module, report, "[{0}] was imported eagerly by tgt_grease".format(module))
+        # report the slowest imports on failure to help track down regressions
+        slowest = sorted(report.items(), key=lambda item: item[1], reverse=True)[:10]
+        self.assertLess(
+            report.get('tgt_grease') / 1000.0,
+            self.import_budget,
+            "\n".join("{0:>10}us {1}".format(cumulative, module) for module, cumulative in slowest)
+        )
+
+    def _import_time_report(self):
+        """Runs `python -X importtime` against tgt_grease
+
+        Returns:
+            dict: top level module name -> cumulative import time in microseconds
+
+        """
+        stderr = self._run_python(['-X', 'importtime', '-c', 'import tgt_grease'])[1]
+        report = {}
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, module = line.split('|')
+            if not cumulative.strip().isdigit():
+                # header line
+                continue
+            report[module.strip()] = int(cumulative.strip())
+        return report
+
+    @staticmethod
+    def _run_python(args):
+        proc = subprocess.Popen(
+            [sys.executable] + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        )
+        stdout, stderr = proc.communicate()
+        return stdout.decode('utf-8', 'ignore'), stderr.decode('utf-8', 'ignore')
@@ -1,5 +1,9 @@
 from unittest import TestCase
 from tgt_grease.core import Configuration, Logging
+from tgt_grease.core.Logging import AsyncLogWriter
+import threading
+import logging
+import time
 import os
 
 
@@ -52,6 +56,59 @@ class TestLogging(TestCase):
         after = self._log_line_count()
         self.assertTrue(initial + 1 == after)
 
+    def test_lazy_message_not_built_when_disabled(self):
+        log = Logging()
+        called = []
+        log.getConfig().set('verbose', False, 'Logging')
+        self.assertTrue(log.debug(lambda: called.append(True), verbose=True))
+        self.assertFalse(called)
+
+    def test_lazy_message(self):
+        log = Logging()
+        initial = self._log_line_count()
+        self.assertTrue(log.debug(lambda: "Test Lazy Message {0}".format(1)))
+        after = self._log_line_count()
+        self.assertTrue(initial + 1 == after)
+
+    def test_async_logging(self):
+        conf = Configuration()
+        conf.set('async', True, 'Logging')
+        conf.set('flush_interval', .05, 'Logging')
+        try:
+            log = Logging(conf)
+            initial = self._log_line_count()
+            for i in range(10):
+                self.assertTrue(log.info("Test Async Message {0}".format(i), {'key': 'value'}))
+            log.flush()
+            after = self._log_line_count()
+            self.assertEqual(initial + 10, after)
+        finally:
+            conf.set('async', False, 'Logging')
+
+    def test_async_writer_drop_policy(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        class BlockingHandler(logging.Handler):
+            def emit(self, record):
+                started.set()
+                release.wait(5)
+
+        logger = logging.getLogger('GREASE_ASYNC_TEST')
+        logger.propagate = False
+        logger.addHandler(BlockingHandler())
+        writer = AsyncLogWriter(logger, queue_size=1, overflow='drop', batch_size=1, flush_interval=0)
+        entry = (None, "message", None, False, False, logging.INFO, time.time(), False)
+        # first entry is picked up by the writer which then blocks in the handler
+        self.assertTrue(writer.put(entry))
+        self.assertTrue(started.wait(5))
+        # second fills the queue, third is dropped
+        self.assertTrue(writer.put(entry))
+        self.assertFalse(writer.put(entry))
+        self.assertEqual(writer.dropped, 1)
+        release.set()
+        writer.flush()
+
     def _log_line_count(self):
         conf = Configuration()
         if os.path.isfile(conf.get('Logging', 'file')):
@@ -0,0 +1,96 @@
+from unittest import TestCase
+from tgt_grease.core import Configuration, Notifications
+from tgt_grease.core import Notifier
+from tgt_grease.core.Notifier import NotificationDispatcher
+from logging import ERROR
+import threading
+import time
+
+
+class RecordingNotifications(Notifications):
+    """Notifications that records messages instead of calling third party services"""
+
+    def __init__(self, Config=None):
+        super(RecordingNotifications, self).__init__(Config)
+        self.messages = []
+
+    def enabled_channels(self, channel=None):
+        return ['Test'] if channel in (None, 'Test') else []
+
+    def _route_notification(self, channel, message, level):
+        self.messages.append((channel, message, level))
+        return not message.startswith("Fail")
+
+
+class TestNotifications(TestCase):
+
+    def test_no_channels_enabled(self):
+        n = Notifications(Configuration())
+        self.assertTrue(n.SendMessage("Test Message"))
+
+    def test_dispatcher_coalesces_identical_messages(self):
+        n = RecordingNotifications(Configuration())
+        d = NotificationDispatcher(n, coalesce_window=.5, rate_limit=0)
+        for _ in range(5):
+            self.assertTrue(d.put("Mongo is down", ERROR))
+        self.assertTrue(d.put("Something else", ERROR))
+        self.assertTrue(d.flush(5))
+        self.assertEqual(d.coalesced, 4)
+        self.assertEqual([m[1] for m in n.messages], ["Mongo is down", "Something else"])
+        # once the window closes a summary goes out
+        deadline = time.time() + 5
+        while len(n.messages) < 3 and time.time() < deadline:
+            time.sleep(.1)
+        self.assertEqual(len(n.messages), 3)
+        self.assertTrue(n.messages[2][1].startswith("Mongo is down [repeated 4 times"))
+
+    def test_dispatcher_rate_limit(self):
+        n = RecordingNotifications(Configuration())
+        d = NotificationDispatcher(n, coalesce_window=0, rate_limit=3)
+        for i in range(10):
+            d.put("Message {0}".format(i), ERROR)
+        self.assertTrue(d.flush(5))
+        self.assertEqual(len(n.messages), 3)
+        self.assertEqual(d.rate_limited, 7)
+
+    def test_dispatcher_is_default(self):
+        n = Notifications(Configuration())
+        self.assertIsInstance(Notifier.GREASE_NOTIFICATION_DISPATCHER, NotificationDispatcher)
+        self.assertTrue(n._dispatcher_config().get('async', True))
+
+    def test_dispatcher_counts_successful_sends(self):
+        n = RecordingNotifications(Configuration())
+        d = NotificationDispatcher(n, coalesce_window=0, rate_limit=0)
+        d.put("Message", ERROR)
+        d.put("Failing message", ERROR)
+        self.assertTrue(d.flush(5))
+        self.assertEqual(len(n.messages), 2)
+        self.assertEqual(d.sent, 1)
+        self.assertEqual(d.failed, 1)
+
+    def test_dispatcher_unknown_channel(self):
+        n = RecordingNotifications(Configuration())
+        d = NotificationDispatcher(n)
+        self.assertFalse(d.put("Message", ERROR, channel='NotAChannel'))
+        self.assertTrue(d.flush(5))
+        self.assertEqual(n.messages, [])
+
+    def test_unknown_channel(self):
+        n = RecordingNotifications(Configuration())
+        # send on the calling thread
+        n._dispatcher_config = lambda: {'async': False}
+        self.assertFalse(n.SendMessage("Message", ERROR, channel='NotAChannel'))
+        self.assertEqual(n.messages, [])
+        self.assertTrue(n.SendMessage("Message", ERROR, channel='Test'))
+        self.assertEqual(n.messages, [('Test', "Message", ERROR)])
+
+    def test_session_per_thread(self):
+        n = Notifications(Configuration())
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(n._get_session())) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIs(n._get_session(), n._get_session())
+        self.assertEqual(len(set(id(session) for session in sessions + [n._get_session()])), 4)
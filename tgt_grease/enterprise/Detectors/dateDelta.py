@@ -1,5 +1,7 @@
 from tgt_grease.enterprise.Model import Detector
+from .dateParser import parse_date
 import datetime
+import operator
 
 
 class DateDelta(Detector):
@@ -36,9 +38,20 @@ class DateDelta(Detector):
         Change the format to any supported https://docs.python.org/2/library/datetime.html#strftime-and-strptime-behavior
     Note:
         If date field not provided will be assumed to be UTC Time
+    Note:
+        Use the format `epoch` or `epoch_ms` for seconds or milliseconds since the epoch
 
     """
 
+    operators = {
+        '<': operator.lt,
+        '<=': operator.le,
+        '>': operator.gt,
+        '>=': operator.ge,
+        '=': operator.eq,
+        '!=': operator.ne
+    }
+
     def processObject(self, source, ruleConfig):
         """Processes an object and returns valid rule data
 
@@ -57,46 +70,83 @@ class DateDelta(Detector):
             tuple: first element boolean for success; second dict for any fields returned as variables
 
         """
-        finalBool = False
-        final = {}
-        # type checks
         if not isinstance(source, dict):
             return False, {}
+        return self.processCompiled(source, self.compile(ruleConfig))
+
+    def compile(self, ruleConfig):
+        """Validates rule configuration & computes its deltas
+
+        Args:
+            ruleConfig (list[dict]): Rule Configuration Data
+
+        Returns:
+            list[tuple]: (field, format, comparison, variable name) per block; None if rule configuration is invalid
+
+        """
         if not isinstance(ruleConfig, list):
-            return False, {}
+            return None
+        compiled = []
         for block in ruleConfig:
             if not isinstance(block, dict):
                 self.ioc.getLogger().error(
                     "INVALID DATERANGE LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
                     notify=False
                 )
-                return False, {}
-            # ensure field is there and date format
-            if not block.get('field') in source \
-                    or 'format' not in block \
+                return None
+            if block.get('variable') and block.get('variable_name'):
+                variable_name = str(block.get('variable_name'))
+            else:
+                variable_name = None
+            if 'format' not in block \
                     or not block.get('delta') \
                     or not block.get('operator') \
                     or not block.get('direction') \
                     or block.get('delta') not in ['weeks', 'days', 'hours', 'minutes', 'seconds', 'milliseconds', 'microseconds'] \
                     or not block.get('delta_value'):
+                compiled.append((block.get('field'), None, None, variable_name))
+            else:
+                compiled.append(
+                    (block.get('field'), block.get('format'), self.compile_comparison(block), variable_name)
+                )
+        return compiled
+
+    def processCompiled(self, source, compiled):
+        """Processes an object against compiled rule configuration
+
+        Args:
+            source (dict): Source Data
+            compiled (list[tuple]): Result of `compile`
+
+        Return:
+            tuple: first element boolean for success; second dict for any fields returned as variables
+
+        """
+        finalBool = False
+        final = {}
+        if not isinstance(source, dict) or compiled is None:
+            return False, {}
+        # parsed field values & current dates by format, shared by blocks
+        parsed = {}
+        for field, fmt, comparison, variable_name in compiled:
+            # ensure field is there and date format
+            if field not in source or fmt is None:
                 self.ioc.getLogger().error(
                     "malformed rule block; fields [delta, operator, format] are required but not found"
                     " or field not found in source",
                     notify=False
                 )
                 return False, {}
-            if not source.get(block.get('field')):
+            if not source.get(field):
                 self.ioc.getLogger().error(
                     "field equated to False!",
                     notify=False
                 )
                 return False, {}
-            if self.timeCompare(source.get(block.get('field')), block):
+            if comparison and self.compare(source.get(field), fmt, comparison, parsed, field):
                 finalBool = True
-                if block.get('variable') and block.get('variable_name'):
-                    final[str(block.get('variable_name'))] = source.get(block.get('field'))
-                else:
-                    continue
+                if variable_name:
+                    final[variable_name] = source.get(field)
             else:
                 self.ioc.getLogger().trace("Field Failed Range Comparison", verbose=True)
                 return False, {}
@@ -113,48 +163,82 @@ class DateDelta(Detector):
             bool: if the range is successful then true else false
 
         """
+        comparison = self.compile_comparison(LogicalBlock)
+        if not comparison:
+            return False
+        return self.compare(field, LogicalBlock.get('format'), comparison)
+
+    def compile_comparison(self, LogicalBlock):
+        """Computes the comparison of a logical block
+
+        Args:
+            LogicalBlock (dict): Logical Block
+
+        Returns:
+            tuple: (operator function, delta, compare date or None to compare to now); None if the block is invalid
+
+        """
+        if LogicalBlock.get('direction') == 'future':
+            direction = 1
+        elif LogicalBlock.get('direction') == 'past':
+            direction = -1
+        else:
+            self.ioc.getLogger().error("key [direction] is not future or past", notify=False)
+            return None
+        if LogicalBlock.get('operator') not in self.operators:
+            self.ioc.getLogger().error(
+                "Invalid operator provided [{0}]".format(LogicalBlock.get('operator')),
+                notify=False
+            )
+            return None
         try:
-            source_date = datetime.datetime.strptime(field, LogicalBlock.get('format'))
-            if LogicalBlock.get('direction') is 'future':
-                direction = 1
-            elif LogicalBlock.get('direction') is 'past':
-                direction = -1
-            else:
-                self.ioc.getLogger().error("key [direction] is not future or past", notify=False)
-                return False
-            # setup compare object
+            delta = datetime.timedelta(**{
+                str(LogicalBlock.get('delta')): int(LogicalBlock.get('delta_value'))
+            }) * direction
             if LogicalBlock.get('date'):
-                compare_date = datetime.datetime.strptime(LogicalBlock.get('date'), LogicalBlock.get('format')) \
-                               + datetime.timedelta(**{
-                                    str(LogicalBlock.get('delta')): int(LogicalBlock.get('delta_value'))
-                               }) \
-                               * direction
-            else:
-                compare_date = datetime.datetime.utcnow().strftime(LogicalBlock.get('format'))
-                compare_date = datetime.datetime.strptime(compare_date, LogicalBlock.get('format')) \
-                               + datetime.timedelta(**{
-                                    str(LogicalBlock.get('delta')): int(LogicalBlock.get('delta_value'))
-                               }) \
-                               * direction
-            if LogicalBlock.get('operator') == '<':
-                ReturnBool = (source_date < compare_date)
-            elif LogicalBlock.get('operator') == '<=':
-                ReturnBool = (source_date <= compare_date)
-            elif LogicalBlock.get('operator') == '>':
-                ReturnBool = (source_date > compare_date)
-            elif LogicalBlock.get('operator') == '>=':
-                ReturnBool = (source_date >= compare_date)
-            elif LogicalBlock.get('operator') == '=':
-                ReturnBool = (source_date == compare_date)
-            elif LogicalBlock.get('operator') == '!=':
-                ReturnBool = (source_date != compare_date)
+                compare_date = parse_date(LogicalBlock.get('date'), LogicalBlock.get('format')) + delta
             else:
-                self.ioc.getLogger().error(
-                    "Invalid operator provided [{0}]".format(LogicalBlock.get('operator')),
-                    notify=False
-                )
-                return False
-            return ReturnBool
+                compare_date = None
+        except ValueError:
+            # probable datetime format error
+            self.ioc.getLogger().error("Value error processing rule!", notify=False)
+            return None
+        except TypeError:
+            # probable datetime format error
+            self.ioc.getLogger().error("Type error processing rule!", notify=False)
+            return None
+        return self.operators[LogicalBlock.get('operator')], delta, compare_date
+
+    def compare(self, field, fmt, comparison, parsed=None, key=None):
+        """Compares a date to a computed comparison
+
+        Args:
+            field (str): field to compare
+            fmt (str): Format of the field
+            comparison (tuple): Result of `compile_comparison`
+            parsed (dict): Optional cache of parsed field values & current dates
+            key (str): Key of the field in the parsed cache
+
+        Returns:
+            bool: if the comparison is successful then true else false
+
+        """
+        if parsed is None:
+            parsed = {}
+        operation, delta, compare_date = comparison
+        try:
+            if (key, fmt) not in parsed:
+                parsed[(key, fmt)] = parse_date(field, fmt)
+            source_date = parsed[(key, fmt)]
+            if compare_date is None:
+                # current date at the precision of the format, cached under a key no field can have
+                if (fmt,) not in parsed:
+                    if fmt in ('epoch', 'epoch_ms'):
+                        parsed[(fmt,)] = datetime.datetime.utcnow()
+                    else:
+                        parsed[(fmt,)] = parse_date(datetime.datetime.utcnow().strftime(fmt), fmt)
+                compare_date = parsed[(fmt,)] + delta
+            return operation(source_date, compare_date)
         except ValueError:
             # probable datetime format error
             self.ioc.getLogger().error("Value error processing rule!", notify=False)
@@ -0,0 +1,65 @@
+import datetime
+import re
+
+# formats with a fixed layout parsed without strptime; values not matching the layout fall back to strptime
+ISO_FORMATS = {
+    '%Y-%m-%d': re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})\Z'),
+    '%Y-%m-%dT%H:%M:%S': re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})\Z'),
+    '%Y-%m-%d %H:%M:%S': re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2}) ([0-9]{2}):([0-9]{2}):([0-9]{2})\Z'),
+    '%Y-%m-%dT%H:%M:%SZ': re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})Z\Z'),
+    '%Y-%m-%dT%H:%M:%S.%f': re.compile(
+        r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})\.([0-9]{1,6})\Z'
+    ),
+    '%Y-%m-%d %H:%M:%S.%f': re.compile(
+        r'([0-9]{4})-([0-9]{2})-([0-9]{2}) ([0-9]{2}):([0-9]{2}):([0-9]{2})\.([0-9]{1,6})\Z'
+    ),
+    '%Y-%m-%dT%H:%M:%S.%fZ': re.compile(
+        r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})\.([0-9]{1,6})Z\Z'
+    )
+}
+# epoch formats and their units per second
+EPOCH_FORMATS = {
+    'epoch': 1,
+    'epoch_ms': 1000
+}
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def parse_date(value, fmt):
+    """Parses a date the way `datetime.strptime` does, skipping strptime for common formats
+
+    Note:
+        The formats `epoch` & `epoch_ms` parse seconds & milliseconds since the epoch as UTC
+
+    Args:
+        value (str/int/float): Date to parse
+        fmt (str): strptime format or epoch format
+
+    Returns:
+        datetime.datetime: Parsed date
+
+    Raises:
+        ValueError: If the value does not match the format
+        TypeError: If the value or format are of the wrong type
+
+    """
+    if fmt in EPOCH_FORMATS:
+        try:
+            return EPOCH + datetime.timedelta(seconds=float(value) / EPOCH_FORMATS[fmt])
+        except OverflowError:
+            raise ValueError("Epoch [{0}] is out of the range of dates".format(value))
+    layout = ISO_FORMATS.get(fmt)
+    if layout is not None and isinstance(value, str):
+        match = layout.match(value)
+        if match:
+            parts = match.groups()
+            return datetime.datetime(
+                int(parts[0]),
+                int(parts[1]),
+                int(parts[2]),
+                int(parts[3]) if len(parts) > 3 else 0,
+                int(parts[4]) if len(parts) > 3 else 0,
+                int(parts[5]) if len(parts) > 3 else 0,
+                int(parts[6].ljust(6, '0')) if len(parts) > 6 else 0
+            )
+    return datetime.datetime.strptime(value, fmt)
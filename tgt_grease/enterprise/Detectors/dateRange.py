@@ -1,5 +1,5 @@
 from tgt_grease.enterprise.Model import Detector
-import datetime
+from .dateParser import parse_date
 
 
 class DateRange(Detector):
@@ -33,6 +33,8 @@ class DateRange(Detector):
         Change the format to any supported https://docs.python.org/2/library/datetime.html#strftime-and-strptime-behavior
     Note:
         To find an exact date/time set min one below the target and max one above the target
+    Note:
+        Use the format `epoch` or `epoch_ms` for seconds or milliseconds since the epoch
 
     """
 
@@ -54,39 +56,75 @@ class DateRange(Detector):
             tuple: first element boolean for success; second dict for any fields returned as variables
 
         """
-        finalBool = False
-        final = {}
-        # type checks
         if not isinstance(source, dict):
             return False, {}
+        return self.processCompiled(source, self.compile(ruleConfig))
+
+    def compile(self, ruleConfig):
+        """Validates rule configuration & parses its bounds
+
+        Args:
+            ruleConfig (list[dict]): Rule Configuration Data
+
+        Returns:
+            list[tuple]: (field, format, bounds, variable name) per block; None if rule configuration is invalid
+
+        """
         if not isinstance(ruleConfig, list):
-            return False, {}
+            return None
+        compiled = []
         for block in ruleConfig:
             if not isinstance(block, dict):
                 self.ioc.getLogger().error(
                     "INVALID DATERANGE LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
                     notify=False
                 )
-                return False, {}
+                return None
+            if block.get('variable') and block.get('variable_name'):
+                variable_name = str(block.get('variable_name'))
+            else:
+                variable_name = None
+            if 'format' not in block:
+                compiled.append((block.get('field'), None, None, variable_name))
+            else:
+                compiled.append((block.get('field'), block.get('format'), self.compile_bounds(block), variable_name))
+        return compiled
+
+    def processCompiled(self, source, compiled):
+        """Processes an object against compiled rule configuration
+
+        Args:
+            source (dict): Source Data
+            compiled (list[tuple]): Result of `compile`
+
+        Return:
+            tuple: first element boolean for success; second dict for any fields returned as variables
+
+        """
+        finalBool = False
+        final = {}
+        if not isinstance(source, dict) or compiled is None:
+            return False, {}
+        # parsed field values by field & format, shared by blocks on the same field
+        parsed = {}
+        for field, fmt, bounds, variable_name in compiled:
             # ensure field is there and date format
-            if not block.get('field') in source or 'format' not in block:
+            if field not in source or fmt is None:
                 self.ioc.getLogger().error(
                     "malformed rule block; field and/or format not found in source",
                     notify=False
                 )
                 return False, {}
-            if not source.get(block.get('field')):
+            if not source.get(field):
                 self.ioc.getLogger().error(
                     "field equated to False!",
                     notify=False
                 )
                 return False, {}
-            if self.timeCompare(source.get(block.get('field')), block):
+            if bounds and self.compare_bounds(source.get(field), fmt, bounds, parsed, field):
                 finalBool = True
-                if block.get('variable') and block.get('variable_name'):
-                    final[str(block.get('variable_name'))] = source.get(block.get('field'))
-                else:
-                    continue
+                if variable_name:
+                    final[variable_name] = source.get(field)
             else:
                 self.ioc.getLogger().trace("Field Failed Range Comparison", verbose=True)
                 return False, {}
@@ -103,34 +141,60 @@ class DateRange(Detector):
             bool: if the range is successful then true else false
 
         """
+        bounds = self.compile_bounds(LogicalBlock)
+        if not bounds:
+            return False
+        return self.compare_bounds(field, LogicalBlock.get('format'), bounds)
+
+    def compile_bounds(self, LogicalBlock):
+        """Parses the bounds of a logical block
+
+        Args:
+            LogicalBlock (dict): Logical Block
+
+        Returns:
+            tuple: (min, max) as datetime, absent bounds are None; None if the bounds are invalid
+
+        """
+        # ensure at least min OR max is present
+        if not LogicalBlock.get('min') and not LogicalBlock.get('max'):
+            self.ioc.getLogger().trace("[min] and/or [max] not found in config block", verbose=True)
+            return None
         try:
-            source_date = datetime.datetime.strptime(field, LogicalBlock.get('format'))
-            # Ensure field is present
-            # ensure at least min OR max is present
-            if not LogicalBlock.get('min') and not LogicalBlock.get('max'):
-                self.ioc.getLogger().trace("[min] and/or [max] not found in config block", verbose=True)
-                return False
-            if LogicalBlock.get('min') and LogicalBlock.get('max'):
-                # Min & Max Defined
-                if datetime.datetime.strptime(LogicalBlock.get('min'), LogicalBlock.get('format')) <= source_date <= datetime.datetime.strptime(LogicalBlock.get('max'), LogicalBlock.get('format')):
-                    return True
-                else:
-                    return False
-            elif LogicalBlock.get('min') and not LogicalBlock.get('max'):
-                # Min Defined
-                if source_date >= datetime.datetime.strptime(LogicalBlock.get('min'), LogicalBlock.get('format')):
-                    return True
-                else:
-                    return False
-            elif not LogicalBlock.get('min') and LogicalBlock.get('max'):
-                # Max Defined
-                if source_date <= datetime.datetime.strptime(LogicalBlock.get('max'), LogicalBlock.get('format')):
-                    return True
-                else:
-                    return False
+            return (
+                parse_date(LogicalBlock.get('min'), LogicalBlock.get('format')) if LogicalBlock.get('min') else None,
+                parse_date(LogicalBlock.get('max'), LogicalBlock.get('format')) if LogicalBlock.get('max') else None
+            )
+        except ValueError:
+            # probable datetime format error
+            self.ioc.getLogger().error("Value error processing rule!", notify=False)
+            return None
+        except TypeError:
+            # probable datetime format error
+            self.ioc.getLogger().error("Type error processing rule!", notify=False)
+            return None
+
+    def compare_bounds(self, field, fmt, bounds, parsed=None, key=None):
+        """Compares a date to parsed bounds
+
+        Args:
+            field (str): field to compare
+            fmt (str): Format of the field
+            bounds (tuple): Result of `compile_bounds`
+            parsed (dict): Optional cache of parsed field values
+            key (str): Key of the field in the parsed cache
+
+        Returns:
+            bool: if the range is successful then true else false
+
+        """
+        try:
+            if parsed is not None and (key, fmt) in parsed:
+                source_date = parsed[(key, fmt)]
             else:
-                self.ioc.getLogger().error("Failed to find either min OR max in LogicalBlock", verbose=True, notify=False)
-                return False
+                source_date = parse_date(field, fmt)
+                if parsed is not None:
+                    parsed[(key, fmt)] = source_date
         except ValueError:
             # probable datetime format error
             self.ioc.getLogger().error("Value error processing rule!", notify=False)
@@ -139,3 +203,8 @@ class DateRange(Detector):
             # probable datetime format error
             self.ioc.getLogger().error("Type error processing rule!", notify=False)
             return False
+        if bounds[0] is not None and source_date < bounds[0]:
+            return False
+        if bounds[1] is not None and source_date > bounds[1]:
+            return False
+        return True
@@ -41,45 +41,104 @@ class Exists(Detector):
             tuple: first element boolean for success; second dict for any fields returned as variables
 
         """
-        final = {}
-        finalBool = False
-        # type checks
         if not isinstance(source, dict):
             return False, {}
+        return self.processCompiled(source, self.compile(ruleConfig))
+
+    def compile(self, ruleConfig):
+        """Validates rule configuration
+
+        Args:
+            ruleConfig (list[dict]): Rule Configuration Data
+
+        Returns:
+            list[tuple]: (field, variable name) per block; None if rule configuration is invalid
+
+        """
         if not isinstance(ruleConfig, list):
+            return None
+        compiled = []
+        for block in ruleConfig:
+            if not isinstance(block, dict):
+                self.ioc.getLogger().error(
+                    "INVALID EXISTS LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
+                    notify=False
+                )
+                return None
+            if block.get('variable') and block.get('variable_name'):
+                compiled.append((block.get('field'), str(block.get('variable_name'))))
+            else:
+                compiled.append((block.get('field'), None))
+        return compiled
+
+    def processCompiled(self, source, compiled):
+        """Processes an object against compiled rule configuration
+
+        Args:
+            source (dict): Source Data
+            compiled (list[tuple]): Result of `compile`
+
+        Return:
+            tuple: first element boolean for success; second dict for any fields returned as variables
+
+        """
+        final = {}
+        finalBool = False
+        if not isinstance(source, dict) or compiled is None:
             return False, {}
-        else:
-            # loop through configuration for each set of logical configurations
-            for block in ruleConfig:
-                if not isinstance(block, dict):
-                    self.ioc.getLogger().error(
-                        "INVALID EXISTS LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
-                        notify=False
+        # loop through configuration for each set of logical configurations
+        for field, variable_name in compiled:
+            # look for field and perform exists check
+            if field in source:
+                if source.get(field):
+                    finalBool = True
+                    if variable_name:
+                        final[variable_name] = source.get(field)
+                else:
+                    # truthy false field value
+                    self.ioc.getLogger().trace(
+                        lambda: "Field [{0}] equated to false [{1}]".format(field, source.get(field)),
+                        verbose=True
                     )
                     return False, {}
-                else:
-                    # look for field and perform exists check
-                    if block.get('field') in source:
-                        if source.get(block.get('field')):
-                            finalBool = True
-                            if block.get('variable') and block.get('variable_name'):
-                                final[str(block.get('variable_name'))] = source.get(block.get('field'))
-                            else:
-                                continue
-                        else:
-                            # truthy false field value
-                            self.ioc.getLogger().trace(
-                                "Field [{0}] equated to false [{1}]".format(
-                                    block.get('field'),
-                                    source.get(block.get('field'))
-                                ),
-                                verbose=True
-                            )
-                            return False, {}
-                    else:
-                        self.ioc.getLogger().trace(
-                            "Field not found in source [{0}]".format(block.get('field')),
-                            verbose=True
-                        )
-                        return False, {}
-            return finalBool, final
+            else:
+                self.ioc.getLogger().trace(
+                    lambda: "Field not found in source [{0}]".format(field),
+                    verbose=True
+                )
+                return False, {}
+        return finalBool, final
+
+    def processCompiledBatch(self, sources, compiled):
+        """Processes a batch of objects against compiled rule configuration
+
+        Each block filters the indices of the sources still passing, so the checks of every other block are skipped
+        for a failed source. Results always match `processCompiled` for every source
+
+        Args:
+            sources (list[dict]): Source Data
+            compiled (list[tuple]): Result of `compile`
+
+        Return:
+            tuple: first element list of booleans for success per source; second list of dict for variables per source
+
+        """
+        count = len(sources)
+        if compiled is None or not compiled:
+            return [False] * count, [{} for _ in range(count)]
+        # indices of the sources still passing every block
+        alive = [index for index, source in enumerate(sources) if isinstance(source, dict)]
+        for field, variable_name in compiled:
+            alive = [index for index in alive if sources[index].get(field)]
+        self.ioc.getLogger().trace(
+            lambda: "Exists passed [{0}] of [{1}] objects".format(len(alive), count),
+            verbose=True
+        )
+        mask = [False] * count
+        variables = [{} for _ in range(count)]
+        for index in alive:
+            mask[index] = True
+            for field, variable_name in compiled:
+                if variable_name:
+                    variables[index][variable_name] = sources[index].get(field)
+        return mask, variables
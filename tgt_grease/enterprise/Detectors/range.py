@@ -29,6 +29,8 @@ class Range(Detector):
         If both are provided then the field would need to be inside the range provided
     Note:
         To find an exact number set min one below the target and max one above the target
+    Note:
+        Batches are evaluated as NumPy columns when NumPy is installed
 
     """
 
@@ -50,54 +52,183 @@ class Range(Detector):
             tuple: first element boolean for success; second dict for any fields returned as variables
 
         """
-        final = {}
-        finalBool = False
-        # type checks
         if not isinstance(source, dict):
             return False, {}
+        return self.processCompiled(source, self.compile(ruleConfig))
+
+    def compile(self, ruleConfig):
+        """Validates rule configuration & coerces its bounds
+
+        Args:
+            ruleConfig (list[dict]): Rule Configuration Data
+
+        Returns:
+            list[tuple]: (field, bounds, variable name) per block; None if rule configuration is invalid
+
+        """
         if not isinstance(ruleConfig, list):
+            return None
+        compiled = []
+        for block in ruleConfig:
+            if not isinstance(block, dict):
+                self.ioc.getLogger().error(
+                    "INVALID RANGE LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
+                    notify=False
+                )
+                return None
+            if block.get('variable') and block.get('variable_name'):
+                compiled.append((block.get('field'), self.compile_bounds(block), str(block.get('variable_name'))))
+            else:
+                compiled.append((block.get('field'), self.compile_bounds(block), None))
+        return compiled
+
+    def processCompiled(self, source, compiled):
+        """Processes an object against compiled rule configuration
+
+        Args:
+            source (dict): Source Data
+            compiled (list[tuple]): Result of `compile`
+
+        Return:
+            tuple: first element boolean for success; second dict for any fields returned as variables
+
+        """
+        final = {}
+        finalBool = False
+        if not isinstance(source, dict) or compiled is None:
             return False, {}
-        else:
-            # loop through configuration for each set of logical configurations
-            for block in ruleConfig:
-                if not isinstance(block, dict):
-                    self.ioc.getLogger().error(
-                        "INVALID RANGE LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
-                        notify=False
-                    )
-                    return False, {}
-                else:
-                    # look for field and perform range check
-                    if block.get('field') in source:
-                        # perform range operation since field exists
-                        if source.get(block.get('field')):
-                            if self.range_compare(source.get(block.get('field')), block):
-                                finalBool = True
-                                if block.get('variable') and block.get('variable_name'):
-                                    final[str(block.get('variable_name'))] = source.get(block.get('field'))
-                                else:
-                                    continue
-                            else:
-                                self.ioc.getLogger().trace("Field Failed Range Comparison", verbose=True)
-                                return False, {}
-                        else:
-                            # truthy false field value
-                            self.ioc.getLogger().trace(
-                                "Field [{0}] equated to false [{1}]".format(
-                                    block.get('field'),
-                                    source.get(block.get('field'))
-                                ),
-                                verbose=True
-                            )
-                            return False, {}
+        # loop through configuration for each set of logical configurations
+        for field, bounds, variable_name in compiled:
+            # look for field and perform range check
+            if field in source:
+                # perform range operation since field exists
+                if source.get(field):
+                    if bounds and self.compare_bounds(source.get(field), bounds):
+                        finalBool = True
+                        if variable_name:
+                            final[variable_name] = source.get(field)
                     else:
-                        self.ioc.getLogger().trace(
-                            "Field not found in source [{0}]".format(block.get('field')),
-                            verbose=True
-                        )
+                        self.ioc.getLogger().trace("Field Failed Range Comparison", verbose=True)
                         return False, {}
+                else:
+                    # truthy false field value
+                    self.ioc.getLogger().trace(
+                        lambda: "Field [{0}] equated to false [{1}]".format(field, source.get(field)),
+                        verbose=True
+                    )
+                    return False, {}
+            else:
+                self.ioc.getLogger().trace(
+                    lambda: "Field not found in source [{0}]".format(field),
+                    verbose=True
+                )
+                return False, {}
         return finalBool, final
 
+    def processCompiledBatch(self, sources, compiled):
+        """Processes a batch of objects against compiled rule configuration as NumPy columns
+
+        Each block pulls its field out of the sources still passing into a single column, which is compared with the
+        bounds as a whole. Results always match `processCompiled` for every source
+
+        Note:
+            Falls back to processing each object when NumPy is not installed. Columns NumPy cannot hold as numbers,
+            like ones with strings or values too large for 64 bits, are compared value by value
+
+        Args:
+            sources (list[dict]): Source Data
+            compiled (list[tuple]): Result of `compile`
+
+        Return:
+            tuple: first element list of booleans for success per source; second list of dict for variables per source
+
+        """
+        try:
+            import numpy
+        except ImportError:
+            return super(Range, self).processCompiledBatch(sources, compiled)
+        count = len(sources)
+        if compiled is None or not compiled:
+            return [False] * count, [{} for _ in range(count)]
+        # indices of the sources still passing every block
+        alive = [index for index, source in enumerate(sources) if isinstance(source, dict)]
+        for field, bounds, variable_name in compiled:
+            if not bounds or not alive:
+                alive = []
+                break
+            # falsy values fail the block so they are all held as 0
+            column = [sources[index].get(field) or 0 for index in alive]
+            passed = self.compare_column(numpy, column, bounds)
+            alive = [index for index, ok in zip(alive, passed) if ok]
+        self.ioc.getLogger().trace(
+            lambda: "Range passed [{0}] of [{1}] objects".format(len(alive), count),
+            verbose=True
+        )
+        mask = [False] * count
+        variables = [{} for _ in range(count)]
+        for index in alive:
+            mask[index] = True
+            for field, bounds, variable_name in compiled:
+                if variable_name:
+                    variables[index][variable_name] = sources[index].get(field)
+        return mask, variables
+
+    def compare_column(self, numpy, column, bounds):
+        """Compares a column of field values to compiled bounds
+
+        Args:
+            numpy (module): NumPy
+            column (list): Field values; falsy values must be given as 0
+            bounds (tuple): Result of `compile_bounds`
+
+        Returns:
+            list[bool]: if the range is successful per value
+
+        """
+        try:
+            values = numpy.array(column)
+            if values.ndim != 1 or values.dtype.kind not in 'bif':
+                raise ValueError("column is not numeric")
+            if values.dtype.kind == 'f':
+                # ints & floats are compared with their own bounds, like compare_bounds
+                isInt = numpy.array([not isinstance(value, float) for value in column], dtype=bool)
+            else:
+                values = values.astype(numpy.int64)
+                isInt = numpy.ones(len(column), dtype=bool)
+            passed = values != 0
+            if isInt.all():
+                passed &= self.compare_array(numpy, values, bounds[0], bounds[2])
+            elif isInt.any():
+                ints = numpy.array([value for value, numeric in zip(column, isInt) if numeric], dtype=numpy.int64)
+                passed[isInt] &= self.compare_array(numpy, ints, bounds[0], bounds[2])
+                passed[~isInt] &= self.compare_array(numpy, values[~isInt], bounds[1], bounds[3])
+            else:
+                passed &= self.compare_array(numpy, values, bounds[1], bounds[3])
+            return passed.tolist()
+        except (ValueError, TypeError, OverflowError):
+            return [bool(value) and self.compare_bounds(value, bounds) for value in column]
+
+    @staticmethod
+    def compare_array(numpy, values, minValue, maxValue):
+        """Compares a NumPy array to bounds
+
+        Args:
+            numpy (module): NumPy
+            values (numpy.ndarray): Values to compare
+            minValue (int/float): Lower bound; None if absent
+            maxValue (int/float): Upper bound; None if absent
+
+        Returns:
+            numpy.ndarray: if the range is successful per value; positive comparisons so NaN fails every range
+
+        """
+        passed = numpy.ones(len(values), dtype=bool)
+        if minValue is not None:
+            passed &= values >= minValue
+        if maxValue is not None:
+            passed &= values <= maxValue
+        return passed
+
     def range_compare(self, field, LogicalBlock):
         """Compares number range to a field
 
@@ -109,68 +240,67 @@ class Range(Detector):
             bool: if the range is successful then true else false
 
         """
-        # Ensure field is present
+        bounds = self.compile_bounds(LogicalBlock)
+        if not bounds:
+            return False
+        return self.compare_bounds(field, bounds)
+
+    def compile_bounds(self, LogicalBlock):
+        """Validates & coerces the bounds of a logical block
+
+        Note:
+            Bounds are kept as both int & float since the field type decides which comparison is used
+
+        Args:
+            LogicalBlock (dict): Logical Block
+
+        Returns:
+            tuple: (int min, float min, int max, float max), absent bounds are None; None if the bounds are invalid
+
+        """
         # ensure at least min OR max is present
         if not LogicalBlock.get('min') and not LogicalBlock.get('max'):
             self.ioc.getLogger().trace("[min] and/or [max] not found in config block", verbose=True)
-            return False
+            return None
         if LogicalBlock.get('min') and not isinstance(LogicalBlock.get('min'), (int, float)):
             self.ioc.getLogger().trace("min not of type int or float", verbose=True)
-            return False
+            return None
         if LogicalBlock.get('max') and not isinstance(LogicalBlock.get('max'), (int, float)):
             self.ioc.getLogger().trace("max not of type int or float", verbose=True)
-            return False
+            return None
+        minValue = LogicalBlock.get('min') or None
+        maxValue = LogicalBlock.get('max') or None
+        return (
+            None if minValue is None else int(minValue),
+            None if minValue is None else float(minValue),
+            None if maxValue is None else int(maxValue),
+            None if maxValue is None else float(maxValue)
+        )
+
+    def compare_bounds(self, field, bounds):
+        """Compares a field to compiled bounds
+
+        Args:
+            field (int/float/long): field to compare
+            bounds (tuple): Result of `compile_bounds`
+
+        Returns:
+            bool: if the range is successful then true else false
+
+        """
         # ensure field is an number
         if not isinstance(field, (int, float)):
             self.ioc.getLogger().trace("Field is NaN", verbose=True)
             return False
-        if LogicalBlock.get('min') and LogicalBlock.get('max'):
-            # Min & Max Defined
-            if isinstance(field, int):
-                minValue = int(LogicalBlock.get('min'))
-                maxValue = int(LogicalBlock.get('max'))
-                field = int(field)
-            elif isinstance(field, float):
-                minValue = float(LogicalBlock.get('min'))
-                maxValue = float(LogicalBlock.get('max'))
-                field = float(field)
-            else:
-                self.ioc.getLogger().error("Internal Casting Error; Failed to determine field type", notify=False)
-                return False
-            if minValue <= field <= maxValue:
-                return True
-            else:
-                return False
-        elif LogicalBlock.get('min') and not LogicalBlock.get('max'):
-            # Min Defined
-            if isinstance(field, int):
-                minValue = int(LogicalBlock.get('min'))
-                field = int(field)
-            elif isinstance(field, float):
-                minValue = float(LogicalBlock.get('min'))
-                field = float(field)
-            else:
-                self.ioc.getLogger().error("Internal Casting Error; Failed to determine field type", notify=False)
-                return False
-            if field >= minValue:
-                return True
-            else:
-                return False
-        elif not LogicalBlock.get('min') and LogicalBlock.get('max'):
-            # Max Defined
-            if isinstance(field, int):
-                maxValue = int(LogicalBlock.get('max'))
-                field = int(field)
-            elif isinstance(field, float):
-                maxValue = float(LogicalBlock.get('max'))
-                field = float(field)
-            else:
-                self.ioc.getLogger().error("Internal Casting Error; Failed to determine field type", notify=False)
-                return False
-            if field <= maxValue:
-                return True
-            else:
-                return False
+        if isinstance(field, int):
+            minValue, maxValue = bounds[0], bounds[2]
+            field = int(field)
         else:
-            self.ioc.getLogger().error("Failed to find either min OR max in LogicalBlock", verbose=True, notify=False)
+            minValue, maxValue = bounds[1], bounds[3]
+            field = float(field)
+        # positive comparisons so NaN fails every range
+        if minValue is not None and not field >= minValue:
+            return False
+        if maxValue is not None and not field <= maxValue:
             return False
+        return True
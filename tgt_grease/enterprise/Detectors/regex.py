@@ -1,4 +1,5 @@
 from tgt_grease.enterprise.Model import Detector
+import functools
 import re
 
 
@@ -23,8 +24,15 @@ class Regex(Detector):
             }
         }
 
+    Note:
+        Blocks that do not create a context variable only need one match. Duplicate patterns on a field are checked
+        once, and plain text patterns on a field are combined into a single substring check
+
     """
 
+    # patterns without these are plain text
+    metacharacters = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
     def processObject(self, source, ruleConfig):
         """Processes an object and returns valid rule data
 
@@ -43,54 +51,120 @@ class Regex(Detector):
             tuple: first element boolean for success; second dict for any fields returned as variables
 
         """
-        final = {}
-        finalBool = False
         if not isinstance(source, dict):
             return False, {}
+        return self.processCompiled(source, self.compile(ruleConfig))
+
+    def compile(self, ruleConfig):
+        """Validates rule configuration & compiles its patterns
+
+        Args:
+            ruleConfig (list[dict]): Rule Configuration Data
+
+        Returns:
+            list[tuple]: (field, match function, variable name) per block; None if rule configuration is invalid
+
+        """
         if not isinstance(ruleConfig, list):
+            return None
+        compiled = []
+        # field -> patterns of blocks without variables
+        searches = {}
+        # field -> plain text patterns of blocks without variables
+        literals = {}
+        for block in ruleConfig:
+            if not isinstance(block, dict):
+                self.ioc.getLogger().error(
+                    "INVALID REGEX LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
+                    notify=False
+                )
+                return None
+            try:
+                pattern = re.compile(block.get('pattern'))
+            except (re.error, TypeError):
+                self.ioc.getLogger().error(
+                    "INVALID REGEX PATTERN [{0}]".format(block.get('pattern')),
+                    notify=False
+                )
+                return None
+            if block.get('variable') and block.get('variable_name'):
+                compiled.append((block.get('field'), pattern.findall, str(block.get('variable_name'))))
+            elif isinstance(pattern.pattern, str) and not self.metacharacters.search(pattern.pattern):
+                literals.setdefault(block.get('field'), []).append(pattern.pattern)
+            elif pattern.pattern not in searches.setdefault(block.get('field'), {}):
+                # a single match is all that is needed without a context variable
+                searches[block.get('field')][pattern.pattern] = pattern.search
+        for field, fieldLiterals in literals.items():
+            compiled.append((field, functools.partial(self.contains_all, tuple(set(fieldLiterals))), None))
+        for field, fieldSearches in searches.items():
+            for search in fieldSearches.values():
+                compiled.append((field, search, None))
+        return compiled
+
+    @staticmethod
+    def contains_all(literals, value):
+        """Checks a value contains every plain text pattern
+
+        Note:
+            For a pattern without metacharacters `re.findall` finds a match exactly when the pattern is a substring
+
+        Args:
+            literals (tuple): Plain text patterns
+            value (str): Field value
+
+        Returns:
+            bool: If every pattern is in the value
+
+        """
+        for literal in literals:
+            if literal not in value:
+                return False
+        return True
+
+    def processCompiled(self, source, compiled):
+        """Processes an object against compiled rule configuration
+
+        Args:
+            source (dict): Source Data
+            compiled (list[tuple]): Result of `compile`
+
+        Return:
+            tuple: first element boolean for success; second dict for any fields returned as variables
+
+        """
+        final = {}
+        finalBool = False
+        if not isinstance(source, dict) or compiled is None:
             return False, {}
-        else:
-            # loop through configuration for each set of logical configurations
-            for block in ruleConfig:
-                if not isinstance(block, dict):
-                    self.ioc.getLogger().error(
-                        "INVALID REGEX LOGICAL BLOCK! NOT TYPE LIST [{0}]".format(str(type(block))),
-                        notify=False
-                    )
-                    return False, {}
-                else:
-                    # look for field and perform regex
-                    if block.get('field') in source:
-                        if source.get(block.get('field')):
-                            result = re.findall(block.get('pattern'), str(source.get(block.get('field'))))
-                            if len(result):
-                                finalBool = True
-                                if block.get('variable') and block.get('variable_name'):
-                                    final[str(block.get('variable_name'))] = result
-                                else:
-                                    continue
-                            else:
-                                self.ioc.getLogger().trace(
-                                    "Field did not pass regex",
-                                    verbose=True
-                                )
-                                return False, {}
-                        else:
-                            # truthy false field value
-                            self.ioc.getLogger().trace(
-                                "Field [{0}] equates to false [{1}]".format(
-                                    block.get('field'),
-                                    source.get(block.get('field'))
-                                ),
-                                notify=False,
-                                verbose=True
-                            )
-                            return False, {}
+        # loop through configuration for each set of logical configurations
+        for field, matcher, variable_name in compiled:
+            # look for field and perform regex
+            if field in source:
+                if source.get(field):
+                    result = matcher(str(source.get(field)))
+                    if result:
+                        finalBool = True
+                        if variable_name:
+                            final[variable_name] = result
                     else:
                         self.ioc.getLogger().trace(
-                            "Field not found in source [{0}]".format(block.get('field')),
-                            notify=False,
+                            "Field did not pass regex",
                             verbose=True
                         )
                         return False, {}
-            return finalBool, final
+                else:
+                    # truthy false field value
+                    self.ioc.getLogger().trace(
+                        lambda: "Field [{0}] equates to false [{1}]".format(field, source.get(field)),
+                        notify=False,
+                        verbose=True
+                    )
+                    return False, {}
+            else:
+                self.ioc.getLogger().trace(
+                    lambda: "Field not found in source [{0}]".format(field),
+                    notify=False,
+                    verbose=True
+                )
+                return False, {}
+        return finalBool, final
@@ -0,0 +1,36 @@
+from unittest import TestCase
+from tgt_grease.enterprise.Detectors.dateParser import parse_date, ISO_FORMATS
+import datetime
+
+
+class TestDateParser(TestCase):
+
+    def test_iso_formats_match_strptime(self):
+        date = datetime.datetime(2017, 11, 24, 13, 5, 9, 120000)
+        for fmt in ISO_FORMATS:
+            value = date.strftime(fmt)
+            self.assertEqual(parse_date(value, fmt), datetime.datetime.strptime(value, fmt))
+
+    def test_fallback_to_strptime(self):
+        # single digit months are accepted by strptime but not the fast path
+        self.assertEqual(parse_date('2017-1-5', '%Y-%m-%d'), datetime.datetime(2017, 1, 5))
+        self.assertEqual(parse_date('24/11/2017', '%d/%m/%Y'), datetime.datetime(2017, 11, 24))
+
+    def test_invalid_dates(self):
+        with self.assertRaises(ValueError):
+            parse_date('2017-13-01', '%Y-%m-%d')
+        with self.assertRaises(ValueError):
+            parse_date('cats', '%Y-%m-%dT%H:%M:%S')
+        with self.assertRaises(TypeError):
+            parse_date(None, '%Y-%m-%d')
+
+    def test_epoch(self):
+        self.assertEqual(parse_date(1511528709, 'epoch'), datetime.datetime(2017, 11, 24, 13, 5, 9))
+        self.assertEqual(parse_date('1511528709120', 'epoch_ms'), datetime.datetime(2017, 11, 24, 13, 5, 9, 120000))
+        with self.assertRaises(ValueError):
+            parse_date('cats', 'epoch')
+        # past the range of dates
+        with self.assertRaises(ValueError):
+            parse_date('99999999999999999', 'epoch')
+        with self.assertRaises(ValueError):
+            parse_date(float('inf'), 'epoch_ms')
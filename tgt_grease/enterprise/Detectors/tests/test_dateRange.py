@@ -42,6 +42,11 @@ class TestDateRange(TestCase):
         self.assertFalse(r.timeCompare('2017-11-25', {'max': '2017-11-24', 'format': '%Y-%m-%d'}))
         self.assertFalse(r.timeCompare('2017-11-27', {'min': '2017-11-24', 'max': '2017-11-26', 'format': '%Y-%m-%d'}))
 
+    def test_range_compare_epoch_overflow(self):
+        r = DateRange()
+        self.assertFalse(r.timeCompare('99999999999999999', {'min': '0', 'format': 'epoch'}))
+        self.assertFalse(r.timeCompare('1511528709', {'min': '99999999999999999', 'format': 'epoch'}))
+
     def test_emptyList(self):
         r = DateRange()
         state, data = r.processObject({}, [])
@@ -214,3 +219,15 @@ class TestDateRange(TestCase):
         )
         self.assertFalse(state)
         self.assertEqual(len(data), 0)
+
+    def test_epoch_and_shared_field(self):
+        r = DateRange()
+        compiled = r.compile([
+            {'field': 'time', 'min': 1511528700, 'format': 'epoch'},
+            {'field': 'time', 'max': 1511528800, 'format': 'epoch', 'variable': True, 'variable_name': 'time'}
+        ])
+        state, data = r.processCompiled({'time': 1511528709}, compiled)
+        self.assertTrue(state)
+        self.assertEqual(data.get('time'), 1511528709)
+        self.assertFalse(r.processCompiled({'time': 1511528900}, compiled)[0])
+
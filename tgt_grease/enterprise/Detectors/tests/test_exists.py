@@ -148,3 +148,23 @@ class TestExists(TestCase):
         )
         self.assertFalse(state)
         self.assertEqual(len(data), 0)
+
+    def test_batch_matches_objects(self):
+        e = Exists()
+        ruleConfig = [
+            {'field': 'test', 'variable': True, 'variable_name': 'test1'},
+            {'field': 'ver'}
+        ]
+        sources = [
+            {'test': 'data', 'ver': 'var'},
+            {'test': 'data'},
+            {'test': '', 'ver': 'var'},
+            {'test': 5, 'ver': [1]},
+            []
+        ]
+        mask, variables = e.processBatch(sources, ruleConfig)
+        self.assertEqual(mask, [True, False, False, True, False])
+        for source, passed, data in zip(sources, mask, variables):
+            self.assertEqual((passed, data), e.processObject(source, ruleConfig))
+        self.assertEqual(e.processBatch(sources, []), ([False] * len(sources), [{}] * len(sources)))
+        self.assertEqual(e.processBatch([], ruleConfig), ([], []))
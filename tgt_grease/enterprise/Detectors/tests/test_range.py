@@ -1,5 +1,6 @@
 from unittest import TestCase
 from tgt_grease.enterprise.Detectors import Range
+import time
 
 
 class TestRange(TestCase):
@@ -42,6 +43,13 @@ class TestRange(TestCase):
         r = Range()
         self.assertFalse(r.range_compare('cats', {'max': 4, 'min': 1}))
 
+    def test_range_compare_nan(self):
+        r = Range()
+        self.assertFalse(r.range_compare(float('nan'), {'min': 1}))
+        self.assertFalse(r.range_compare(float('nan'), {'max': 4}))
+        self.assertFalse(r.range_compare(float('nan'), {'max': 4, 'min': 1}))
+        self.assertEqual(r.processObject({'count': float('nan')}, [{'field': 'count', 'min': 1}]), (False, {}))
+
     def test_range_compare_bad_min_or_max(self):
         r = Range()
         self.assertFalse(r.range_compare(3, {'min': 'cat'}))
@@ -229,3 +237,90 @@ class TestRange(TestCase):
         )
         self.assertFalse(state)
         self.assertEqual(len(data), 0)
+
+    def test_batch_matches_objects(self):
+        r = Range()
+        ruleConfig = [
+            {'field': 'count', 'min': 2, 'max': 8.5, 'variable': True, 'variable_name': 'count'},
+            {'field': 'ratio', 'max': 1}
+        ]
+        sources = [
+            {'count': 5, 'ratio': .5},
+            {'count': 8.7, 'ratio': .5},
+            {'count': 8, 'ratio': 0.9},
+            {'count': 2.0, 'ratio': 2},
+            {'count': 'cats', 'ratio': .5},
+            {'count': 0, 'ratio': .5},
+            {'ratio': .5},
+            {'count': True, 'ratio': .5},
+            []
+        ]
+        mask, variables = r.processBatch(sources, ruleConfig)
+        self.assertEqual(mask, [True, False, True, False, False, False, False, False, False])
+        for source, passed, data in zip(sources, mask, variables):
+            self.assertEqual((passed, data), r.processObject(source, ruleConfig))
+        # values too large for a column are processed one by one
+        self.assertEqual(r.processBatch([{'count': 2 ** 70, 'ratio': .5}], ruleConfig), ([False], [{}]))
+        self.assertEqual(r.processBatch(sources, []), ([False] * len(sources), [{}] * len(sources)))
+
+    def test_batch_matches_objects_edge_cases(self):
+        r = Range()
+
+        class Integer(int):
+            pass
+
+        class Float(float):
+            pass
+
+        values = [
+            0, 1, 2, 3, 8, 9, -5, 1.0, 1.5, 2.0, 8.5, 8.6, True, False, None, '', 'cats', '5', [], [5], [1, 2], {},
+            {'a': 1}, float('nan'), float('inf'), float('-inf'), 2 ** 62, 2 ** 63, 2 ** 70, -2 ** 70, Integer(5),
+            Float(5.5), complex(5, 1)
+        ]
+        ruleConfigs = [
+            [{'field': 'count', 'min': 1.5, 'max': 8.5, 'variable': True, 'variable_name': 'count'}],
+            [{'field': 'count', 'min': 2}],
+            [{'field': 'count', 'max': 8.5}],
+            [{'field': 'count', 'min': -2 ** 70, 'max': 2 ** 70}]
+        ]
+        # every value alone, and mixed together in one column
+        columns = [[value] for value in values] + [values, [1, 2.5, 9], [float('nan'), 3.0], [2 ** 70, 5], [True, 5]]
+        for ruleConfig in ruleConfigs:
+            for column in columns:
+                sources = [{'count': value} for value in column] + [{}, [], {'other': 5}]
+                mask, variables = r.processBatch(sources, ruleConfig)
+                for source, passed, data in zip(sources, mask, variables):
+                    self.assertEqual(
+                        (passed, data),
+                        r.processObject(source, ruleConfig),
+                        "batch differs for {0} against {1}".format(source, ruleConfig)
+                    )
+
+    def test_batch_nan(self):
+        r = Range()
+        sources = [{'count': float('nan')}, {'count': 5.0}, {'count': float('nan')}]
+        self.assertEqual(r.processBatch(sources, [{'field': 'count', 'min': 1}])[0], [False, True, False])
+        self.assertEqual(r.processBatch(sources, [{'field': 'count', 'max': 10}])[0], [False, True, False])
+
+    def test_batch_benchmark_50k(self):
+        r = Range()
+        compiled = r.compile([
+            {'field': 'count', 'min': 2, 'max': 8.5, 'variable': True, 'variable_name': 'count'},
+            {'field': 'ratio', 'max': 1}
+        ])
+        sources = [
+            {'count': [i % 20, (i % 200) / 10.0, None][i % 3], 'ratio': (i % 20) / 10.0} for i in range(50000)
+        ]
+
+        def best(method):
+            timings = []
+            for _ in range(3):
+                start = time.time()
+                result = method(sources, compiled)
+                timings.append(time.time() - start)
+            return min(timings), result
+
+        batch_time, batch = best(r.processCompiledBatch)
+        loop_time, loop = best(super(Range, r).processCompiledBatch)
+        self.assertEqual(batch, loop)
+        self.assertLess(batch_time, loop_time)
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from tgt_grease.enterprise.Detectors import Regex
+import time
 
 
 class TestRegex(TestCase):
@@ -175,3 +176,39 @@ class TestRegex(TestCase):
         )
         self.assertFalse(state)
         self.assertEqual(len(data), 0)
+
+    def test_combined_patterns(self):
+        r = Regex()
+        compiled = r.compile([
+            {'field': 'test', 'pattern': 'da'},
+            {'field': 'test', 'pattern': 'at'},
+            {'field': 'test', 'pattern': 'ta$'},
+            {'field': 'test', 'pattern': 'ta$'},
+            {'field': 'test', 'pattern': '.*', 'variable': True, 'variable_name': 'test1'}
+        ])
+        # plain text patterns are combined & duplicate patterns checked once
+        self.assertEqual(len(compiled), 3)
+        state, data = r.processCompiled({'test': 'data'}, compiled)
+        self.assertTrue(state)
+        self.assertEqual(data.get('test1'), ['data', ''])
+        self.assertFalse(r.processCompiled({'test': 'date'}, compiled)[0])
+        self.assertFalse(r.processCompiled({'test': 'data'}, r.compile([
+            {'field': 'test', 'pattern': 'da'},
+            {'field': 'test', 'pattern': 'cat'}
+        ]))[0])
+
+    def test_benchmark_1k_patterns(self):
+        r = Regex()
+        ruleConfig = []
+        for i in range(1000):
+            ruleConfig.append({'field': 'field{0}'.format(i % 10), 'pattern': r'\bx{0}\b'.format(i)})
+        source = {}
+        for i in range(10):
+            source['field{0}'.format(i)] = " ".join("x{0}".format(j) for j in range(i, 1000, 10))
+        compiled = r.compile(ruleConfig)
+        records = 200
+        start = time.time()
+        for _ in range(records):
+            self.assertTrue(r.processCompiled(source, compiled)[0])
+        elapsed = time.time() - start
+        self.assertLess(elapsed, 30)
@@ -0,0 +1,36 @@
+from abc import ABCMeta, abstractmethod
+from .BaseSource import BaseSourceClass
+
+
+class AsyncSourceClass(BaseSourceClass):
+    """Base Class for sources spending their time waiting on I/O
+
+    Implement `parse_source` as a coroutine, `async def parse_source(self, configuration)`, setting data to
+    `self._data` as any other source would. The scan engine awaits async sources on its event loop, see `ScanEventLoop`,
+    so thousands of configurations can wait on the network at once without a thread each. Deduplication & scheduling
+    of their data still happens in threads
+
+    Note:
+        Async sources require Python 3.5+
+    Note:
+        Anything blocking in `parse_source` stalls every async source of the node; run blocking calls with
+        `loop.run_in_executor`
+    Note:
+        `mock_data` stays synchronous; mocked async sources are run like any other source
+
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def parse_source(self, configuration):
+        """Coroutine parsing the source for data
+
+        Args:
+            configuration (dict): Configuration for the sourcing to occur with
+
+        Returns:
+            bool: If True data will be scheduled for ingestion after deduplication. If False the engine will bail out
+
+        """
+        pass
@@ -40,3 +40,67 @@ class Detector(object):
 
         """
         pass
+
+    def compile(self, ruleConfig):
+        """Prepares rule configuration once so it can be run against many sources
+
+        Detection compiles each logical block of a prototype configuration once per configuration version, then
+        passes the result to `processCompiled` for every source. Detectors can override this to validate blocks,
+        coerce parameters & compile patterns ahead of time. The default passes the rule configuration through as is
+
+        Args:
+            ruleConfig (list[dict]): Rule Configuration Data
+
+        Returns:
+            object: Compiled rule configuration; None if the rule configuration is invalid
+
+        """
+        return ruleConfig
+
+    def processCompiled(self, source, compiled):
+        """Processes an object against compiled rule configuration
+
+        Args:
+            source (dict): Source Data
+            compiled (object): Result of `compile`
+
+        Return:
+            tuple: first element boolean for success; second dict for any fields returned as variables
+
+        """
+        return self.processObject(source, compiled)
+
+    def processBatch(self, sources, ruleConfig):
+        """Processes a batch of objects and returns valid rule data for each
+
+        Args:
+            sources (list[dict]): Source Data
+            ruleConfig (list[dict]): Rule Configuration Data
+
+        Return:
+            tuple: first element list of booleans for success per source; second list of dict for variables per source
+
+        """
+        return self.processCompiledBatch(sources, self.compile(ruleConfig))
+
+    def processCompiledBatch(self, sources, compiled):
+        """Processes a batch of objects against compiled rule configuration
+
+        Detectors can override this to evaluate the batch column by column. The default loops over the sources
+
+        Args:
+            sources (list[dict]): Source Data
+            compiled (object): Result of `compile`
+
+        Return:
+            tuple: first element list of booleans for success per source; second list of dict for variables per source
+
+        """
+        mask = []
+        variables = []
+        for source in sources:
+            result, resultData = self.processCompiled(source, compiled)
+            mask.append(bool(result))
+            variables.append(resultData)
+        return mask, variables
+
@@ -1,4 +1,14 @@
 from abc import ABCMeta, abstractmethod
+from decimal import Decimal
+import datetime
+import hashlib
+import json
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 
 class BaseSourceClass(object):
@@ -10,6 +20,16 @@ class BaseSourceClass(object):
         field_set (None or list): If none all fields found will be duplicated otherwise only fields listed will be
         deduplication_expiry (int): Hours to retain deduplication data
         deduplication_expiry_max (int): Days to deduplicate for **maximum**
+        checkpoint (object): Highest watermark seen by the last parse; committed once its data is scheduled
+        checkpoint_keys (list[str]): Keys of the records read at `checkpoint`, see `checkpoint_key`
+        committed (tuple): Watermark loaded by `load_checkpoint` & the set of keys of the records read at it
+        scheduled (bool): If the scan schedule started the configuration, see `is_due`
+
+    Note:
+        Sources supporting checkpoints read only records with a `checkpoint` field at or above the value committed
+        by the last successful scan of the configuration, skipping records that scan already read at the value so a
+        scan stopping partway through a run of equal values resumes inside it. Checkpoints are kept in the
+        `SourceCheckpoints` collection
 
     """
 
@@ -21,6 +41,10 @@ class BaseSourceClass(object):
         self.deduplication_expiry = 12
         self.deduplication_expiry_max = 7
         self.field_set = None
+        self.checkpoint = None
+        self.checkpoint_keys = []
+        self.committed = None
+        self.scheduled = False
 
     @abstractmethod
     def mock_data(self, configuration):
@@ -62,6 +86,28 @@ class BaseSourceClass(object):
         """
         pass
 
+    def is_due(self, configuration):
+        """Checks the `hour` & `minute` of a configuration against the current UTC time
+
+        Configurations started by the scan schedule are always due; the schedule already checked them & may start them
+        late, like when they were held back
+
+        Args:
+            configuration (dict): Configuration for the sourcing to occur with
+
+        Returns:
+            bool: If the configuration is due to be parsed
+
+        """
+        if self.scheduled:
+            return True
+        now = datetime.datetime.utcnow()
+        if configuration.get('hour') and now.hour != int(configuration.get('hour')):
+            return False
+        if configuration.get('minute') and now.minute != int(configuration.get('minute')):
+            return False
+        return True
+
     def get_data(self):
         """Returns data from source
 
@@ -70,3 +116,218 @@ class BaseSourceClass(object):
 
         """
         return self._data
+
+    def streams(self, configuration):
+        """Checks if a configuration is scanned through `iter_data`
+
+        Override this in sources implementing `iter_data` so the scan engine deduplicates & schedules their data a
+        chunk at a time instead of reading it all through `parse_source` first
+
+        Args:
+            configuration (dict): Configuration for the sourcing to occur with
+
+        Returns:
+            bool: If the scan engine should stream the configuration
+
+        """
+        return False
+
+    def iter_data(self, configuration, chunk_size=1000):
+        """Streams data from the source in chunks
+
+        Override this to yield data as it is read so only a chunk is held in memory at a time. By default the source is
+        parsed with `parse_source` & its data is yielded in chunks. Watermarks should be tracked as data is yielded;
+        they are committed once every chunk was scheduled
+
+        Args:
+            configuration (dict): Configuration for the sourcing to occur with
+            chunk_size (int): Maximum records per chunk
+
+        Returns:
+            generator: Chunks as list[dict] of *single dimension* dictionaries
+
+        Raises:
+            ValueError: If the source failed to parse
+
+        """
+        if not self.parse_source(configuration):
+            raise ValueError("Source failed to parse configuration [{0}]".format(configuration.get('name')))
+        data = self.get_data()
+        for start in range(0, len(data), int(chunk_size)):
+            yield data[start:start + int(chunk_size)]
+
+    @staticmethod
+    def get_checkpoint(ioc, configuration):
+        """Gets the committed watermark of a configuration
+
+        Args:
+            ioc (GreaseContainer): IOC to access MongoDB with
+            configuration (dict): Configuration to get the watermark of
+
+        Returns:
+            object: Watermark; None if the configuration has none yet
+
+        """
+        checkpoint = ioc.getCollection('SourceCheckpoints').find_one({'configuration': configuration.get('name')})
+        if checkpoint:
+            return checkpoint.get('value')
+        return None
+
+    def load_checkpoint(self, ioc, configuration):
+        """Gets the committed watermark of a configuration, remembering the records read at it
+
+        Args:
+            ioc (GreaseContainer): IOC to access MongoDB with
+            configuration (dict): Configuration to get the watermark of
+
+        Returns:
+            object: Watermark; None if the configuration has none yet
+
+        """
+        checkpoint = ioc.getCollection('SourceCheckpoints').find_one({'configuration': configuration.get('name')})
+        if not checkpoint:
+            self.committed = None
+            return None
+        self.committed = (checkpoint.get('value'), set(checkpoint.get('keys') or []))
+        return checkpoint.get('value')
+
+    @staticmethod
+    def checkpoint_key(record):
+        """Hashes a record to recognize it when read again at the watermark
+
+        Args:
+            record (dict): Record read from the source
+
+        Returns:
+            str: Hash of the record
+
+        """
+        return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def track_checkpoint(self, value, record=None):
+        """Raises the pending watermark to a value read from the source
+
+        With a record its key is kept while the value is the watermark, so the next scan can skip it
+
+        Args:
+            value (object): Watermark field of a record
+            record (dict): Record the value was read from
+
+        Returns:
+            bool: False if the record was read at the committed watermark by the last scan, see `load_checkpoint`
+
+        """
+        if value is None:
+            return True
+        key = self.checkpoint_key(record) if record is not None else None
+        try:
+            if self.checkpoint is None or value > self.checkpoint:
+                self.checkpoint = value
+                self.checkpoint_keys = []
+            if key is not None and value == self.checkpoint:
+                self.checkpoint_keys.append(key)
+        except TypeError:
+            # incomparable watermarks keep the first seen
+            pass
+        if key is None or not self.committed or key not in self.committed[1]:
+            return True
+        # decimals are committed as text
+        return (str(value) if isinstance(value, Decimal) else value) != self.committed[0]
+
+    def commit_checkpoint(self, ioc, configuration):
+        """Commits the pending watermark of a configuration once its data was scheduled
+
+        Args:
+            ioc (GreaseContainer): IOC to access MongoDB with
+            configuration (dict): Configuration the data was sourced with
+
+        Returns:
+            bool: If a watermark was committed
+
+        """
+        if not configuration.get('checkpoint') or self.checkpoint is None:
+            return False
+        value = self.checkpoint
+        if isinstance(value, Decimal):
+            # MongoDB can not store decimals; the source compares the text as a number
+            value = str(value)
+        ioc.getCollection('SourceCheckpoints').update_one(
+            {'configuration': configuration.get('name')},
+            {
+                '$set': {
+                    'source': configuration.get('source'),
+                    'field': configuration.get('checkpoint'),
+                    'value': value,
+                    'keys': self.checkpoint_keys,
+                    'updateTime': datetime.datetime.utcnow()
+                }
+            },
+            upsert=True
+        )
+        return True
+
+    @staticmethod
+    def merge_streams(streams, batchSize=1000, buffer=4, name="GREASE SOURCE STREAM"):
+        """Reads streams in parallel threads, yielding records as they arrive
+
+        Records pass through a bounded queue in batches so at most `buffer` batches per stream are held in memory.
+        Readers stop once the returned generator is closed
+
+        Args:
+            streams (list[callable]): Each returns an iterable of records when called in its reader thread
+            batchSize (int): Records queued at a time
+            buffer (int): Batches queued per stream
+            name (str): Prefix of the reader thread names
+
+        Returns:
+            generator: Records of every stream in the order they arrive
+
+        Raises:
+            BaseException: The first error raised by a stream
+
+        """
+        batches = queue.Queue(maxsize=max(int(buffer), 1) * max(len(streams), 1))
+        stop = threading.Event()
+
+        def read(stream):
+            batch = []
+            try:
+                for record in stream():
+                    if stop.is_set():
+                        return
+                    batch.append(record)
+                    if len(batch) >= batchSize:
+                        batches.put(('batch', batch))
+                        batch = []
+                if batch:
+                    batches.put(('batch', batch))
+            except BaseException as e:
+                batches.put(('error', e))
+            finally:
+                batches.put(('done', None))
+
+        readers = []
+        for number, stream in enumerate(streams):
+            reader = threading.Thread(target=read, args=(stream,), name="{0} [{1}]".format(name, number))
+            reader.daemon = True
+            reader.start()
+            readers.append(reader)
+        remaining = len(readers)
+        try:
+            while remaining:
+                kind, batch = batches.get()
+                if kind == 'done':
+                    remaining -= 1
+                elif kind == 'error':
+                    raise batch
+                else:
+                    for record in batch:
+                        yield record
+        finally:
+            stop.set()
+            # unblock readers waiting on a full queue
+            while any(reader.is_alive() for reader in readers):
+                try:
+                    batches.get(timeout=.1)
+                except queue.Empty:
+                    pass
@@ -87,9 +87,10 @@ class Scheduling(object):
                     'createTime': datetime.datetime.utcnow(),
                     'expiry': Deduplication.generate_max_expiry_time(1)
                 })
+                # the backlog is decremented once the detection node detects upon the source
                 jServerCollect.update_one({
                     '_id': ObjectId(server)},
-                    {'$set': {'jobs': int(jobCount) + 1}}
+                    {'$set': {'jobs': int(jobCount) + 1}, '$inc': {'backlog': 1}}
                 )
             else:
                 self.ioc.getLogger().warning(
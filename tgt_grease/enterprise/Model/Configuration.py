@@ -1,10 +1,64 @@
 from tgt_grease.core import GreaseContainer
-import pkg_resources
+import itertools
 import os
 import fnmatch
+import hashlib
 import json
+import pymongo
 
 GREASE_PROTOTYPE_CONFIGURATION = None
+GREASE_PROTOTYPE_VERSION = itertools.count(1)
+GREASE_PROTOTYPE_LOAD_CACHE = {
+    'files': {},  # <-- directory -> {path: (content hash, [valid configs])}
+    'mongo': {'hash': None, 'configs': [], 'documents': {}},  # <-- collection hash & validated documents by _id
+    'snapshot': None  # <-- last snapshot built from pkg, fs & mongo
+}
+
+
+class PrototypeConfigSnapshot(dict):
+    """Read only, versioned view of loaded prototype configuration
+
+    A snapshot is built completely by `PrototypeConfig.load` then swapped in as the global configuration in a single
+    assignment, so readers always see a consistent set of configurations. It is the configuration dict documented on
+    PrototypeConfig, plus an index of configurations by `exe_env` and a version number that increases with every load
+
+    Note:
+        The nested lists & dicts are shared between readers and must be treated as read only
+
+    Attributes:
+        version (int): Load counter of this snapshot; later loads have higher versions
+        exe_env (dict): keys are execution environments, values the list of configs for that environment
+
+    """
+
+    def __init__(self, configuration, raw, sources, source, names, name, exe_env, version):
+        super(PrototypeConfigSnapshot, self).__init__(
+            configuration=configuration,
+            raw=raw,
+            sources=sources,
+            source=source,
+            names=names,
+            name=name
+        )
+        self.exe_env = exe_env
+        self.version = version
+
+    def __reduce__(self):
+        return PrototypeConfigSnapshot, (
+            self['configuration'], self['raw'], self['sources'], self['source'], self['names'], self['name'],
+            self.exe_env, self.version
+        )
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Prototype configuration snapshots are read only; use PrototypeConfig.load to change them")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
 
 
 class PrototypeConfig(object):
@@ -25,6 +79,10 @@ class PrototypeConfig(object):
             'name': {} # <-- all configs via their name so to allow being dialing
         }
 
+    Note:
+        The configuration is held as a PrototypeConfigSnapshot. Lookups by name, source & execution environment are
+        dictionary lookups
+
     Structure of a configuration file::
 
         {
@@ -78,95 +136,101 @@ class PrototypeConfig(object):
         Note:
             Providing a configuration *automatically* reloads the memory structure of prototype configuration
 
+        Note:
+            Reloads are incremental. Only files whose content hash changed are parsed & validated again, and
+            MongoDB is only queried when the collection hash changes. If nothing changed the current snapshot is
+            returned as is, keeping its version
+
         Returns:
             dict: Current Configuration information
 
         """
         global GREASE_PROTOTYPE_CONFIGURATION
         if ConfigurationList:
-            conf = dict()
-            conf['configuration'] = dict()
-            conf['configuration']['ConfigurationList'] = self.validate_config_list(ConfigurationList)
-            conf['raw'] = conf['configuration']['ConfigurationList']
-            # split by configuration sets
-            # the list of configured sources
-            conf['sources'] = list()
-            # the actual configurations for each source
-            conf['source'] = dict()
-            # configurations to get via name
-            conf['names'] = list()
-            # the actual configurations for each config name
-            conf['name'] = dict()
-            for config in conf.get('raw'):  # type: dict
-                if config.get('source') in conf['sources']:
-                    conf['source'][config.get('source')].append(config)
-                else:
-                    conf['sources'].append(config.get('source'))
-                    conf['source'][config.get('source')] = list()
-                    conf['source'][config.get('source')].append(config)
-                if config.get('name') in conf['names']:
-                    self.ioc.getLogger().error(
-                        "Prototype Configuration [{0}] already found! Overwriting".format(config.get('name'))
-                    )
-                    conf['name'][config.get('name')] = config
-                else:
-                    conf['names'].append(config.get('name'))
-                    conf['name'][config.get('name')] = config
+            configuration = dict()
+            configuration['ConfigurationList'] = self.validate_config_list(ConfigurationList)
+            conf = self.build_snapshot(configuration, configuration['ConfigurationList'])
             GREASE_PROTOTYPE_CONFIGURATION = conf
             return conf
+        import pkg_resources
+        global GREASE_PROTOTYPE_LOAD_CACHE
         # fill out raw results
-        conf = dict()
-        conf['configuration'] = dict()
-        conf['raw'] = []
-        pkg = self.validate_config_list(self.load_from_fs(
+        configuration = dict()
+        raw = []
+        pkgChanged, pkg = self.load_changed_from_fs(
             pkg_resources.resource_filename('tgt_grease.enterprise.Model', 'config/')
-        ))
+        )
         for newConfig in pkg:
-            conf['raw'].append(newConfig)
-        conf['configuration']['pkg'] = pkg
+            raw.append(newConfig)
+        configuration['pkg'] = pkg
         del pkg
-        fs = self.validate_config_list(self.load_from_fs(
-            self.ioc.getConfig().get('Configuration', 'dir')
-        ))
+        fsChanged, fs = self.load_changed_from_fs(self.ioc.getConfig().get('Configuration', 'dir'))
         for newConfig in fs:
-            conf['raw'].append(newConfig)
-        conf['configuration']['fs'] = fs
+            raw.append(newConfig)
+        configuration['fs'] = fs
         del fs
-        mongo = self.validate_config_list(self.load_from_mongo())
+        mongoChanged, mongo = self.load_changed_from_mongo()
         for newConfig in mongo:
-            conf['raw'].append(newConfig)
-        conf['configuration']['mongo'] = mongo
+            raw.append(newConfig)
+        configuration['mongo'] = mongo
         del mongo
+        if pkgChanged or fsChanged or mongoChanged or \
+                GREASE_PROTOTYPE_LOAD_CACHE['snapshot'] is None or \
+                GREASE_PROTOTYPE_LOAD_CACHE['snapshot'] is not GREASE_PROTOTYPE_CONFIGURATION:
+            conf = self.build_snapshot(configuration, raw)
+            GREASE_PROTOTYPE_LOAD_CACHE['snapshot'] = conf
+        else:
+            self.ioc.getLogger().trace("Prototype configuration unchanged", trace=True)
+            conf = GREASE_PROTOTYPE_LOAD_CACHE['snapshot']
+        # return block
+        if not reloadConf:
+            return conf
+        else:
+            GREASE_PROTOTYPE_CONFIGURATION = conf
+            return conf
+
+    def build_snapshot(self, configuration, raw):
+        """Indexes a list of validated configurations into a new snapshot
+
+        Args:
+            configuration (dict): Configurations by where they were loaded from
+            raw (list[dict]): All validated configurations in load order
+
+        Returns:
+            PrototypeConfigSnapshot: The new snapshot
+
+        """
         # split by configuration sets
         # the list of configured sources
-        conf['sources'] = list()
+        sources = list()
         # the actual configurations for each source
-        conf['source'] = dict()
+        source = dict()
         # configurations to get via name
-        conf['names'] = list()
+        names = list()
         # the actual configurations for each config name
-        conf['name'] = dict()
-        for config in conf.get('raw'):  # type: dict
-            if config.get('source') in conf['sources']:
-                conf['source'][config.get('source')].append(config)
+        name = dict()
+        # the configurations for each execution environment
+        exe_env = dict()
+        for config in raw:  # type: dict
+            if config.get('source') in source:
+                source[config.get('source')].append(config)
             else:
-                conf['sources'].append(config.get('source'))
-                conf['source'][config.get('source')] = list()
-                conf['source'][config.get('source')].append(config)
-            if config.get('name') in conf['names']:
+                sources.append(config.get('source'))
+                source[config.get('source')] = [config]
+            if config.get('name') in name:
                 self.ioc.getLogger().error(
                     "Prototype Configuration [{0}] already found! Overwriting".format(config.get('name'))
                 )
-                conf['name'][config.get('name')] = config
             else:
-                conf['names'].append(config.get('name'))
-                conf['name'][config.get('name')] = config
-        # return block
-        if not reloadConf:
-            return conf
-        else:
-            GREASE_PROTOTYPE_CONFIGURATION = conf
-            return conf
+                names.append(config.get('name'))
+            name[config.get('name')] = config
+            if config.get('exe_env', 'general') in exe_env:
+                exe_env[config.get('exe_env', 'general')].append(config)
+            else:
+                exe_env[config.get('exe_env', 'general')] = [config]
+        return PrototypeConfigSnapshot(
+            configuration, raw, sources, source, names, name, exe_env, next(GREASE_PROTOTYPE_VERSION)
+        )
 
     def get_sources(self):
         """Returns the list of sources to be scanned
@@ -234,6 +298,39 @@ class PrototypeConfig(object):
             self.ioc.getLogger().error("GREASE Prototype configuration not loaded", notify=False, trace=True)
             return {}
 
+    def get_exe_env(self, env):
+        """Get all configurations for an execution environment
+
+        Args:
+            env (str): Execution environment to get, configurations without one are in `general`
+
+        Returns:
+            list[dict]: Configurations if found else empty list
+
+        """
+        global GREASE_PROTOTYPE_CONFIGURATION
+        if isinstance(GREASE_PROTOTYPE_CONFIGURATION, PrototypeConfigSnapshot):
+            return GREASE_PROTOTYPE_CONFIGURATION.exe_env.get(env, [])
+        else:
+            self.ioc.getLogger().error("GREASE Prototype configuration not loaded", notify=False, trace=True)
+            return []
+
+    def get_version(self):
+        """Get the version of the loaded configuration
+
+        Note:
+            The version increases every time configuration is loaded, so it can be used to invalidate anything built
+            from configuration
+
+        Returns:
+            int: Version of the loaded configuration, 0 if not loaded
+
+        """
+        global GREASE_PROTOTYPE_CONFIGURATION
+        if isinstance(GREASE_PROTOTYPE_CONFIGURATION, PrototypeConfigSnapshot):
+            return GREASE_PROTOTYPE_CONFIGURATION.version
+        return 0
+
     def load_from_fs(self, directory):
         """Loads configurations from provided directory
 
@@ -254,19 +351,124 @@ class PrototypeConfig(object):
             for filename in fnmatch.filter(filenames, '*.config.json'):
                 matches.append(os.path.join(root, filename))
         for doc in matches:
-            self.ioc.getLogger().trace("Attempting to load [{0}]".format(doc), trace=True)
+            intermediate.extend(self.load_from_fs_file(doc))
+        self.ioc.getLogger().trace("total documents returned from fs [{0}]".format(len(intermediate)), trace=True)
+        return intermediate
+
+    def load_changed_from_fs(self, directory):
+        """Loads validated configurations from provided directory, only parsing files that changed since last load
+
+        Note:
+            A file is considered changed when its content hash changes. Files are still read each load, but only
+            changed files are parsed & validated
+
+        Args:
+            directory (str): Directory to load from
+
+        Returns:
+            tuple(bool, list[dict]): If any file was added, changed or removed, and the valid configurations
+
+        """
+        global GREASE_PROTOTYPE_LOAD_CACHE
+        known = GREASE_PROTOTYPE_LOAD_CACHE['files'].get(directory, {})
+        current = {}
+        changed = False
+        final = []
+        for root, dirnames, filenames in os.walk(directory):
+            for filename in fnmatch.filter(filenames, '*.config.json'):
+                doc = os.path.join(root, filename)
+                try:
+                    with open(doc, 'rb') as current_file:
+                        stamp = hashlib.sha1(current_file.read()).hexdigest()
+                except (IOError, OSError):
+                    # removed while walking
+                    continue
+                if doc in known and known[doc][0] == stamp:
+                    current[doc] = known[doc]
+                else:
+                    changed = True
+                    current[doc] = (stamp, self.validate_config_list(self.load_from_fs_file(doc)))
+                final.extend(current[doc][1])
+        if set(known.keys()) - set(current.keys()):
+            changed = True
+        GREASE_PROTOTYPE_LOAD_CACHE['files'][directory] = current
+        return changed, final
+
+    def load_from_fs_file(self, doc):
+        """Loads a configuration file
+
+        Args:
+            doc (str): Path of the file to load
+
+        Returns:
+            list of dict: The configuration in the file, empty if it could not be parsed
+
+        """
+        self.ioc.getLogger().trace("Attempting to load [{0}]".format(doc), trace=True)
+        try:
             with open(doc, 'rb') as current_file:
                 content = current_file.read()
                 if isinstance(content, bytes):
                     content = content.decode()
-            try:
-                intermediate.append(json.loads(content))
-                self.ioc.getLogger().trace("Successfully loaded [{0}]".format(doc), trace=True)
-            except ValueError:
-                self.ioc.getLogger().error("Failed to load [{0}]".format(doc), trace=True, notify=False)
-                continue
-        self.ioc.getLogger().trace("total documents returned from fs [{0}]".format(len(intermediate)), trace=True)
-        return intermediate
+            config = json.loads(content)
+            self.ioc.getLogger().trace("Successfully loaded [{0}]".format(doc), trace=True)
+            return [config]
+        except (IOError, OSError, ValueError):
+            self.ioc.getLogger().error("Failed to load [{0}]".format(doc), trace=True, notify=False)
+            return []
+
+    def load_changed_from_mongo(self):
+        """Loads validated configurations from MongoDB, only querying when the collection changed since last load
+
+        The `dbHash` of the Configuration collection is checked first; when it is unchanged the configurations from
+        the last load are reused. Otherwise the collection is queried and only documents whose content changed are
+        validated again
+
+        Note:
+            If the hash cannot be computed (no permission, sharded cluster) the collection is queried every time
+
+        Returns:
+            tuple(bool, list[dict]): If the configurations changed, and the valid configurations
+
+        """
+        global GREASE_PROTOTYPE_LOAD_CACHE
+        cache = GREASE_PROTOTYPE_LOAD_CACHE['mongo']
+        collectionHash = self.get_mongo_hash()
+        if collectionHash and collectionHash == cache['hash']:
+            self.ioc.getLogger().trace("Configuration collection unchanged", trace=True)
+            return False, cache['configs']
+        documents = {}
+        final = []
+        changed = False
+        for doc in self.load_from_mongo():
+            fingerprint = json.dumps(doc, sort_keys=True, default=str)
+            key = str(doc.get('_id'))
+            if key in cache['documents'] and cache['documents'][key][0] == fingerprint:
+                documents[key] = cache['documents'][key]
+            else:
+                changed = True
+                documents[key] = (fingerprint, doc if self.validate_config(doc) else None)
+            if documents[key][1] is not None:
+                final.append(documents[key][1])
+        if set(cache['documents'].keys()) - set(documents.keys()):
+            changed = True
+        GREASE_PROTOTYPE_LOAD_CACHE['mongo'] = {'hash': collectionHash, 'configs': final, 'documents': documents}
+        return changed, final
+
+    def get_mongo_hash(self):
+        """Gets the hash of the Configuration collection
+
+        Returns:
+            str: md5 of the collection or None if it could not be computed
+
+        """
+        collection = self.ioc.getCollection('Configuration')
+        try:
+            return collection.database.command('dbHash', collections=[collection.name])\
+                .get('collections', {}).get(collection.name)
+        except pymongo.errors.PyMongoError:
+            self.ioc.getLogger().trace("Failed to hash Configuration collection", trace=True)
+            return None
 
     def load_from_mongo(self):
         """Returns all active configurations from the mongo collection Configuration
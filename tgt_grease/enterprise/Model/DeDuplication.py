@@ -1,5 +1,4 @@
 from tgt_grease.core import GreaseContainer
-from psutil import virtual_memory, cpu_percent
 from bson.objectid import ObjectId
 import threading
 import hashlib
@@ -77,6 +76,7 @@ class Deduplication(object):
             list[dict]: Deduplicated data
 
         """
+        from psutil import virtual_memory, cpu_percent
         # ensure we got a list
         if not isinstance(data, list):
             self.ioc.getLogger().error(
@@ -253,15 +253,15 @@ class Deduplication(object):
         if compositeScore < threshold:
             # unique obj
             ioc.getLogger().trace(
-                "Unique object! Composite score was: [{0}] threashold: [{1}]".format(compositeScore, threshold),
+                lambda: "Unique object! Composite score was: [{0}] threashold: [{1}]".format(compositeScore, threshold),
                 verbose=True
             )
             final.append(obj)
             return
         # likely duplicate value
         ioc.getLogger().trace(
-            "Object surpassed threshold, suspected to be duplicate! "
-            "Composite score was: [{0}] threashold: [{1}]".format(compositeScore, threshold),
+            lambda: "Object surpassed threshold, suspected to be duplicate! "
+                    "Composite score was: [{0}] threashold: [{1}]".format(compositeScore, threshold),
             verbose=True
         )
         return
@@ -296,7 +296,7 @@ class Deduplication(object):
         # iterate over the field set
         for field in field_set:
             # ensure key is in the object
-            ioc.getLogger().trace("Starting field [{0}]".format(field), verbose=True)
+            ioc.getLogger().trace(lambda: "Starting field [{0}]".format(field), verbose=True)
             if field in obj:
                 if isinstance(obj.get(field), bytes):
                     value = obj.get(field).decode('utf-8', 'ignore')
@@ -341,7 +341,7 @@ class Deduplication(object):
                     if fieldProbabilityList:
                         # We have at least one result
                         score = float(sum(fieldProbabilityList) / len(fieldProbabilityList))
-                        ioc.getLogger().trace("Field Score [{0}]".format(score), verbose=True)
+                        ioc.getLogger().trace(lambda: "Field Score [{0}]".format(score), verbose=True)
                         field_scores.append(score)
                     else:
                         # It is a globally unique field
@@ -5,7 +5,57 @@ from .CentralScheduling import Scheduling
 from .BaseDetector import Detector
 from bson.objectid import ObjectId
 import pymongo
+from collections import OrderedDict
 import datetime
+import hashlib
+import json
+import multiprocessing
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+# compiled plans handed to detection workers; inherited by workers started with fork
+GREASE_DETECTION_PLANS = None
+
+
+def detection_worker(nodeIdentity, worker, batchSize, cycles, throughput):
+    """Runs detection in a worker process
+
+    Args:
+        nodeIdentity (str): Identity of the node the worker detects for
+        worker (int): Worker number
+        batchSize (int): Maximum sources claimed per cycle
+        cycles (int): Detection cycles to run; None to run until interrupted
+        throughput (multiprocessing.Queue): Receives (worker, sources, seconds) after every cycle
+
+    Returns:
+        None: Void Method to run detection
+
+    """
+    global GREASE_DETECTION_PLANS
+    ioc = GreaseContainer()
+    ioc.getConfig().NodeIdentity = nodeIdentity
+    detect = Detect(ioc)
+    if GREASE_DETECTION_PLANS and GREASE_DETECTION_PLANS[0] == detect.conf.get_version():
+        # share the plans compiled before the worker was forked
+        detect.plansVersion = GREASE_DETECTION_PLANS[0]
+        detect.plans = dict(GREASE_DETECTION_PLANS[1])
+    cycle = 0
+    try:
+        while cycles is None or cycle < cycles:
+            start = time.time()
+            detected = detect.detectBatch(batchSize)
+            throughput.put((worker, detected, time.time() - start))
+            if not detected:
+                # nothing waiting; avoid hammering MongoDB
+                time.sleep(.5)
+            cycle += 1
+    except KeyboardInterrupt:
+        detect.ioc.getLogger().trace("Keyboard interrupt in detection worker [{0}]".format(worker), trace=True)
+    detect.ioc.getLogger().flush()
 
 
 class Detect(object):
@@ -18,9 +68,30 @@ class Detect(object):
         impTool (ImportTool): Import Utility Instance
         conf (PrototypeConfig): Prototype configuration tool
         scheduler (Scheduling): Prototype Scheduling Service Instance
+        plans (dict): Compiled detection plans by configuration name for the current configuration version
+        plansVersion (int): Prototype configuration version the plans were compiled against
+        stats (dict): Detector timing & pass counts by configuration name then detector name
+        reorderInterval (int): Detections of a configuration between reordering its plan
+        workerStats (dict): Sources, seconds & cycles by worker number from the last `runWorkers`
+        memo (dict): Cached detection results by configuration name then source fingerprint
+        memoFields (dict): Fields fingerprinted by configuration name; None if the configuration is not cached
+        memoStats (dict): Detection cache hits & misses by configuration name
+        memoEnabled (bool): If detection results are cached, from `NodeInformation.DetectionCache`
+        memoTTL (float): Seconds a cached detection result is reused, from `NodeInformation.DetectionCacheTTL`
+        memoSize (int): Cached detection results kept per configuration, from `NodeInformation.DetectionCacheSize`
+
+    Note:
+        All logical blocks must pass, so plans are reordered to run cheap & selective detectors first. Each detector is
+        ranked by its average time divided by its rejection rate; detectors not yet measured run first
+        With `NodeInformation.DetectionCache` enabled, results are reused for `DetectionCacheTTL` seconds for sources
+        whose fields named in the configuration's logical blocks are unchanged. Detectors relative to the current time,
+        like DateDelta without a date, may be up to the TTL out of date. Configurations using custom detectors that
+        read fields other than their `field` should not enable the cache
 
     """
 
+    reorderInterval = 100
+
     def __init__(self, ioc=None):
         if ioc and isinstance(ioc, GreaseContainer):
             self.ioc = ioc
@@ -30,6 +101,17 @@ class Detect(object):
         self.ioc.ensureRegistration()
         self.conf = PrototypeConfig(self.ioc)
         self.scheduler = Scheduling(self.ioc)
+        self.plans = {}
+        self.plansVersion = 0
+        self.stats = {}
+        self.evaluations = {}
+        self.workerStats = {}
+        self.memo = {}
+        self.memoFields = {}
+        self.memoStats = {}
+        self.memoEnabled = bool(self.ioc.getConfig().get('NodeInformation', 'DetectionCache', False))
+        self.memoTTL = float(self.ioc.getConfig().get('NodeInformation', 'DetectionCacheTTL', 300))
+        self.memoSize = int(self.ioc.getConfig().get('NodeInformation', 'DetectionCacheSize', 10000))
 
     def detectSource(self):
         """This will perform detection the oldest source from SourceData
@@ -55,33 +137,10 @@ class Detect(object):
                     }
                 )
                 result, resultData = self.detection(sourceData.get('data'), configurationData)
-                if result:
-                    # Put constants in detection results
-                    resultData['constants'] = self.conf.get_config(configurationData.get('name')).get('constants', {})
-                    # Update detection
-                    self.ioc.getCollection('SourceData').update_one(
-                        {'_id': ObjectId(sourceData.get('_id'))},
-                        {
-                            '$set': {
-                                'grease_data.detection.end': datetime.datetime.utcnow(),
-                                'grease_data.detection.detection': resultData
-                            }
-                        }
-                    )
-                    # attempt scheduling
-                    return self.scheduler.scheduleScheduling(sourceData.get('_id'))
-                else:
-                    self.ioc.getCollection('SourceData').update_one(
-                        {'_id': ObjectId(sourceData.get('_id'))},
-                        {
-                            '$set': {
-                                'grease_data.detection.end': datetime.datetime.utcnow(),
-                                'grease_data.detection.detection': {}
-                            }
-                        }
-                    )
-                    self.ioc.getLogger().trace("Detection yielded no detection data", trace=True)
-                    return True
+                try:
+                    return self.completeDetection(sourceData, configurationData, result, resultData)
+                finally:
+                    self.releaseBacklog(1)
             else:
                 self.ioc.getLogger().error(
                     "Failed to load Prototype Config [{0}]".format(sourceData.get('configuration')),
@@ -90,6 +149,249 @@ class Detect(object):
                 return False
         else:
             self.ioc.getLogger().trace("No sources awaiting detection currently", trace=True)
+            self.reconcileBacklog()
+            return True
+
+    def detectBatch(self, batchSize=100):
+        """This will perform detection on a batch of the oldest sources from SourceData
+
+        The batch is claimed before detection so concurrent detection workers on this node never share sources
+
+        Args:
+            batchSize (int): Maximum sources to detect upon
+
+        Returns:
+            int: Number of sources detected upon
+
+        """
+        sources = self.claimSources(batchSize)
+        if not sources:
+            self.reconcileBacklog()
+            return 0
+        # group sources by configuration so each plan runs over a batch
+        groups = {}
+        for sourceData in sources:
+            if isinstance(sourceData.get('configuration'), bytes):
+                conf = sourceData.get('configuration').decode()
+            else:
+                conf = sourceData.get('configuration')
+            groups.setdefault(conf, []).append(sourceData)
+        for conf, group in groups.items():
+            configurationData = self.conf.get_config(conf)
+            if not configurationData:
+                self.ioc.getLogger().error("Failed to load Prototype Config [{0}]".format(conf), notify=False)
+                for sourceData in group:
+                    self.completeDetection(sourceData, {}, False, {})
+                continue
+            results = self.detectionBatch([sourceData.get('data') for sourceData in group], configurationData)
+            for sourceData, (result, resultData) in zip(group, results):
+                if not self.completeDetection(sourceData, configurationData, result, resultData):
+                    self.ioc.getLogger().warning(
+                        "Failed to schedule source [{0}]".format(sourceData.get('_id')),
+                        notify=False
+                    )
+        self.releaseBacklog(len(sources))
+        return len(sources)
+
+    def runWorkers(self, workers, batchSize=100, cycles=None):
+        """Runs detection in worker processes
+
+        Plans for every loaded configuration are compiled first. Workers started with fork share them; others compile
+        their own. Throughput of each worker is logged every minute and kept in `workerStats`
+
+        Args:
+            workers (int): Number of worker processes
+            batchSize (int): Maximum sources claimed per worker cycle
+            cycles (int): Detection cycles per worker; None to run until interrupted
+
+        Returns:
+            bool: If every worker exited successfully
+
+        """
+        global GREASE_DETECTION_PLANS
+        for name in self.conf.get_names():
+            self.get_plan(self.conf.get_config(name))
+        GREASE_DETECTION_PLANS = (self.plansVersion, dict(self.plans))
+        self.workerStats = {}
+        throughput = multiprocessing.Queue()
+        processes = []
+        for worker in range(int(workers)):
+            proc = multiprocessing.Process(
+                target=detection_worker,
+                args=(str(self.ioc.getConfig().NodeIdentity), worker, batchSize, cycles, throughput),
+                name="GREASE DETECTION WORKER {0}".format(worker)
+            )
+            proc.daemon = True
+            proc.start()
+            processes.append(proc)
+        lastReport = time.time()
+        try:
+            while any(proc.is_alive() for proc in processes) or not throughput.empty():
+                try:
+                    worker, detected, elapsed = throughput.get(timeout=1)
+                except queue.Empty:
+                    continue
+                stats = self.workerStats.setdefault(worker, {'sources': 0, 'seconds': 0.0, 'cycles': 0})
+                stats['sources'] += detected
+                stats['seconds'] += elapsed
+                stats['cycles'] += 1
+                if time.time() - lastReport >= 60:
+                    self.reportWorkers()
+                    lastReport = time.time()
+        except KeyboardInterrupt:
+            self.ioc.getLogger().trace("Keyboard interrupt in detection workers", trace=True)
+            for proc in processes:
+                proc.terminate()
+        for proc in processes:
+            proc.join()
+        self.reportWorkers()
+        return all(proc.exitcode == 0 for proc in processes)
+
+    def reportWorkers(self):
+        """Logs the throughput of each detection worker
+
+        Returns:
+            dict: Sources per second by worker number
+
+        """
+        final = {}
+        for worker, stats in sorted(self.workerStats.items()):
+            final[worker] = stats['sources'] / stats['seconds'] if stats['seconds'] else 0.0
+            self.ioc.getLogger().trace(
+                "Detection worker [{0}] detected [{1}] sources in [{2}] cycles; [{3:.2f}] sources/sec".format(
+                    worker, stats['sources'], stats['cycles'], final[worker]
+                ),
+                trace=True
+            )
+        return final
+
+    def claimSources(self, batchSize):
+        """Claims the oldest sources assigned to this node for detection
+
+        Sources claimed more than `NodeInformation.DetectionClaimTimeout` minutes ago without finishing, like by a
+        worker that died, are claimed again
+
+        Args:
+            batchSize (int): Maximum sources to claim
+
+        Returns:
+            list[dict]: Sources claimed
+
+        """
+        now = datetime.datetime.utcnow()
+        expired = now - datetime.timedelta(
+            minutes=float(self.ioc.getConfig().get('NodeInformation', 'DetectionClaimTimeout', 10))
+        )
+        claimable = {
+            '$or': [
+                {'grease_data.detection.start': None},
+                {'grease_data.detection.start': {'$lt': expired}}
+            ]
+        }
+        query = {
+            'grease_data.detection.server': ObjectId(self.ioc.getConfig().NodeIdentity),
+            'grease_data.detection.end': None
+        }
+        query.update(claimable)
+        ids = [
+            sourceData.get('_id') for sourceData in self.ioc.getCollection('SourceData').find(
+                query,
+                projection={'_id': True},
+                sort=[('createTime', pymongo.ASCENDING)],
+                limit=int(batchSize)
+            )
+        ]
+        if not ids:
+            return []
+        # only sources still claimable are claimed so another worker's claim is never overwritten
+        claim = ObjectId()
+        update = {'_id': {'$in': ids}}
+        update.update(claimable)
+        self.ioc.getCollection('SourceData').update_many(
+            update,
+            {
+                '$set': {
+                    'grease_data.detection.start': now,
+                    'grease_data.detection.claim': claim
+                }
+            }
+        )
+        return list(self.ioc.getCollection('SourceData').find({'grease_data.detection.claim': claim}))
+
+    def releaseBacklog(self, count):
+        """Decrements the backlog of this node by sources detected upon
+
+        Args:
+            count (int): Sources detected upon
+
+        Returns:
+            None: Void Method to release the backlog
+
+        """
+        self.ioc.getCollection('JobServer').update_one(
+            {'_id': ObjectId(self.ioc.getConfig().NodeIdentity)},
+            {'$inc': {'backlog': -int(count)}}
+        )
+
+    def reconcileBacklog(self):
+        """Resets the backlog of this node to the sources still awaiting detection
+
+        Called once nothing is left to claim so a backlog drifting from expired or rescheduled sources is corrected
+        while it is cheap to count
+
+        Returns:
+            int: Sources awaiting detection
+
+        """
+        pending = self.ioc.getCollection('SourceData').count_documents({
+            'grease_data.detection.server': ObjectId(self.ioc.getConfig().NodeIdentity),
+            'grease_data.detection.end': None
+        })
+        self.ioc.getCollection('JobServer').update_one(
+            {'_id': ObjectId(self.ioc.getConfig().NodeIdentity)},
+            {'$set': {'backlog': pending}}
+        )
+        return pending
+
+    def completeDetection(self, sourceData, configurationData, result, resultData):
+        """Stores the result of detection on a source and schedules it if detection was successful
+
+        Args:
+            sourceData (dict): Source detected upon
+            configurationData (dict): Prototype configuration of the source
+            result (bool): If detection was successful
+            resultData (dict): Variables from detection
+
+        Returns:
+            bool: If the result was stored and scheduling succeeded when needed
+
+        """
+        if result:
+            # Put constants in detection results
+            resultData['constants'] = configurationData.get('constants', {})
+            # Update detection
+            self.ioc.getCollection('SourceData').update_one(
+                {'_id': ObjectId(sourceData.get('_id'))},
+                {
+                    '$set': {
+                        'grease_data.detection.end': datetime.datetime.utcnow(),
+                        'grease_data.detection.detection': resultData
+                    }
+                }
+            )
+            # attempt scheduling
+            return self.scheduler.scheduleScheduling(sourceData.get('_id'))
+        else:
+            self.ioc.getCollection('SourceData').update_one(
+                {'_id': ObjectId(sourceData.get('_id'))},
+                {
+                    '$set': {
+                        'grease_data.detection.end': datetime.datetime.utcnow(),
+                        'grease_data.detection.detection': {}
+                    }
+                }
+            )
+            self.ioc.getLogger().trace("Detection yielded no detection data", trace=True)
             return True
 
     def getScheduledSource(self):
@@ -130,13 +432,18 @@ class Detect(object):
             self.ioc.getLogger().warning("Detection got non-dict configuration", notify=False)
             finalBool = False
             return finalBool, final
-        # Now loop through logical blocks
-        for detector, logicBlock in configuration.get('logic', {}).items():
-            if not isinstance(logicBlock, list):
-                self.ioc.getLogger().warning("Logical Block was not list", trace=True, notify=False)
-            detect = self.impTool.load(detector)
-            if isinstance(detect, Detector):
-                result, resultData = detect.processObject(source, logicBlock)
+        plan = self.get_plan(configuration)
+        memoKey = self.memoKey(source, configuration)
+        if memoKey:
+            cached = self.memoGet(configuration.get('name'), memoKey)
+            if cached:
+                return cached
+        # Now loop through the compiled logical blocks
+        for detector, detect, compiled in plan:
+            if detect:
+                start = time.time()
+                result, resultData = detect.processCompiled(source, compiled)
+                self.record_stats(configuration.get('name'), detector, 1, 1 if result else 0, time.time() - start)
                 if not result:
                     self.ioc.getLogger().trace("Detection yielded false for [{0}]".format(detector), trace=True)
                     finalBool = False
@@ -150,4 +457,300 @@ class Detect(object):
             else:
                 self.ioc.getLogger().warning("invalid detector [{0}]".format(detector), notify=False)
                 finalBool = False
+        if memoKey:
+            self.memoPut(configuration.get('name'), memoKey, finalBool, final)
         return finalBool, final
+
+    def detectionBatch(self, sources, configuration):
+        """Performs detection on a batch of sources with the provided configuration
+
+        Each detector evaluates all sources that passed the detectors before it in one call to `processCompiledBatch`
+
+        Args:
+            sources (list[dict]): Key->Value pairs from sourcing to detect upon
+            configuration (dict): Prototype configuration provided from sourcing
+
+        Returns:
+            list[tuple]: Detection Results per source; same as `detection`
+
+        """
+        finalBools = [False] * len(sources)
+        finals = [{} for _ in sources]
+        if not isinstance(configuration, dict):
+            self.ioc.getLogger().warning("Detection got non-dict configuration", notify=False)
+            return list(zip(finalBools, finals))
+        # sources still being evaluated
+        remaining = [index for index, source in enumerate(sources) if isinstance(source, dict)]
+        if len(remaining) != len(sources):
+            self.ioc.getLogger().warning("Detection got non-dict source data", notify=False)
+        plan = self.get_plan(configuration)
+        # sources with a cached result skip the plan
+        memoKeys = {}
+        for index in list(remaining):
+            memoKey = self.memoKey(sources[index], configuration)
+            if memoKey:
+                cached = self.memoGet(configuration.get('name'), memoKey)
+                if cached:
+                    finalBools[index], finals[index] = cached
+                    remaining.remove(index)
+                else:
+                    memoKeys[index] = memoKey
+        for detector, detect, compiled in plan:
+            if not remaining:
+                break
+            if not detect:
+                self.ioc.getLogger().warning("invalid detector [{0}]".format(detector), notify=False)
+                for index in remaining:
+                    finalBools[index] = False
+                continue
+            start = time.time()
+            mask, variables = detect.processCompiledBatch([sources[index] for index in remaining], compiled)
+            self.record_stats(configuration.get('name'), detector, len(remaining), sum(mask), time.time() - start)
+            self.ioc.getLogger().trace(
+                "Detection yielded true for [{0}] of [{1}] sources for [{2}]".format(
+                    sum(mask), len(remaining), detector
+                ),
+                trace=True
+            )
+            passed = []
+            for index, result, resultData in zip(remaining, mask, variables):
+                if result:
+                    finals[index].update(resultData)
+                    finalBools[index] = True
+                    passed.append(index)
+                else:
+                    finalBools[index] = False
+            remaining = passed
+        for index, memoKey in memoKeys.items():
+            self.memoPut(configuration.get('name'), memoKey, finalBools[index], finals[index])
+        return list(zip(finalBools, finals))
+
+    def get_plan(self, configuration):
+        """Gets the compiled detection plan for a configuration
+
+        Plans for configurations loaded by PrototypeConfig are cached until the configuration version changes.
+        Configurations provided from elsewhere are compiled on every call
+
+        Args:
+            configuration (dict): Prototype configuration
+
+        Returns:
+            list[tuple]: Detection plan, see `compile_plan`
+
+        """
+        version = self.conf.get_version()
+        if version != self.plansVersion:
+            self.plans = {}
+            self.stats = {}
+            self.evaluations = {}
+            self.memo = {}
+            self.memoFields = {}
+            self.plansVersion = version
+        name = configuration.get('name')
+        cached = self.plans.get(name)
+        if cached and cached[0] is configuration:
+            self.evaluations[name] = self.evaluations.get(name, 0) + 1
+            if self.evaluations[name] % self.reorderInterval == 0:
+                self.plans[name] = (configuration, self.order_plan(name, cached[1]))
+            return self.plans[name][1]
+        plan = self.compile_plan(configuration)
+        if name and self.conf.get_config(name) is configuration:
+            self.plans[name] = (configuration, plan)
+        return plan
+
+    def order_plan(self, name, plan):
+        """Orders a plan to minimize the expected cost of detection
+
+        Note:
+            Plans with invalid detectors keep their order since an invalid detector does not stop detection
+
+        Args:
+            name (str): Configuration name
+            plan (list[tuple]): Detection plan
+
+        Returns:
+            list[tuple]: Ordered detection plan
+
+        """
+        if any(detect is None for _, detect, _ in plan):
+            return plan
+        stats = self.get_stats(name)
+
+        def rank(step):
+            detectorStats = stats.get(step[0])
+            if not detectorStats:
+                return 0.0
+            return detectorStats['average_time'] / max(1.0 - detectorStats['pass_rate'], 1e-6)
+
+        ordered = sorted(plan, key=rank)
+        if [step[0] for step in ordered] != [step[0] for step in plan]:
+            self.ioc.getLogger().trace(
+                "Reordered detection plan for [{0}] to [{1}]".format(name, [step[0] for step in ordered]),
+                trace=True
+            )
+        return ordered
+
+    def record_stats(self, name, detector, calls, passed, elapsed):
+        """Records a detector run
+
+        Args:
+            name (str): Configuration name
+            detector (str): Detector name
+            calls (int): Sources evaluated
+            passed (int): Sources that passed
+            elapsed (float): Seconds spent
+
+        Returns:
+            None: Void Method to record stats
+
+        """
+        stats = self.stats.setdefault(name, {}).setdefault(detector, {'calls': 0, 'passed': 0, 'time': 0.0})
+        stats['calls'] += calls
+        stats['passed'] += passed
+        stats['time'] += elapsed
+
+    def get_stats(self, name):
+        """Gets detector statistics for a configuration
+
+        Structure returned::
+
+            {
+                '<detector>': {
+                    'calls': Int, # <-- sources evaluated
+                    'passed': Int, # <-- sources that passed
+                    'time': Float, # <-- total seconds
+                    'pass_rate': Float,
+                    'average_time': Float # <-- seconds per source
+                }
+            }
+
+        Args:
+            name (str): Configuration name
+
+        Returns:
+            dict: Statistics by detector name; empty if the configuration has not been detected upon
+
+        """
+        final = {}
+        for detector, stats in self.stats.get(name, {}).items():
+            final[detector] = dict(stats)
+            final[detector]['pass_rate'] = float(stats['passed']) / stats['calls'] if stats['calls'] else 0.0
+            final[detector]['average_time'] = stats['time'] / stats['calls'] if stats['calls'] else 0.0
+        return final
+
+    def memoKey(self, source, configuration):
+        """Fingerprints the fields of a source referenced by a configuration's logical blocks
+
+        Args:
+            source (dict): Key->Value pairs from sourcing to detect upon
+            configuration (dict): Prototype configuration
+
+        Returns:
+            str: Fingerprint; None if the detection cache is disabled or the configuration can not be cached
+
+        """
+        if not self.memoEnabled:
+            return None
+        name = configuration.get('name')
+        if name not in self.memoFields:
+            fields = None
+            # only configurations loaded by PrototypeConfig are cached since others may change between calls
+            if name and self.conf.get_config(name) is configuration:
+                fields = set()
+                for logicBlock in configuration.get('logic', {}).values():
+                    if not isinstance(logicBlock, list):
+                        fields = None
+                        break
+                    if not all(isinstance(block, dict) and 'field' in block for block in logicBlock):
+                        fields = None
+                        break
+                    fields.update(block.get('field') for block in logicBlock)
+            self.memoFields[name] = None if fields is None else sorted(fields, key=str)
+        if self.memoFields[name] is None:
+            return None
+        fingerprint = json.dumps(
+            [[field, field in source, source.get(field)] for field in self.memoFields[name]],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+    def memoGet(self, name, memoKey):
+        """Gets a cached detection result
+
+        Args:
+            name (str): Configuration name
+            memoKey (str): Fingerprint from `memoKey`
+
+        Returns:
+            tuple: Detection Results if cached & not expired else None
+
+        """
+        stats = self.memoStats.setdefault(name, {'hits': 0, 'misses': 0})
+        cache = self.memo.get(name, {})
+        entry = cache.get(memoKey)
+        if entry and entry[0] > time.time():
+            stats['hits'] += 1
+            # copied since constants are added to successful results
+            return entry[1], dict(entry[2])
+        if entry:
+            del cache[memoKey]
+        stats['misses'] += 1
+        return None
+
+    def memoPut(self, name, memoKey, result, resultData):
+        """Caches a detection result, evicting the oldest results past `memoSize`
+
+        Args:
+            name (str): Configuration name
+            memoKey (str): Fingerprint from `memoKey`
+            result (bool): If detection was successful
+            resultData (dict): Variables from detection
+
+        Returns:
+            None: Void Method to cache results
+
+        """
+        cache = self.memo.setdefault(name, OrderedDict())
+        cache[memoKey] = (time.time() + self.memoTTL, result, dict(resultData))
+        while len(cache) > self.memoSize:
+            cache.popitem(last=False)
+
+    def get_memo_stats(self, name):
+        """Gets detection cache metrics for a configuration
+
+        Args:
+            name (str): Configuration name
+
+        Returns:
+            dict: hits, misses, hit_rate & entries of the detection cache
+
+        """
+        stats = dict(self.memoStats.get(name, {'hits': 0, 'misses': 0}))
+        total = stats['hits'] + stats['misses']
+        stats['hit_rate'] = float(stats['hits']) / total if total else 0.0
+        stats['entries'] = len(self.memo.get(name, {}))
+        return stats
+
+    def compile_plan(self, configuration):
+        """Compiles the logical blocks of a configuration into a detection plan
+
+        Each detector is loaded once and its logical block compiled by the detector's `compile` method
+
+        Args:
+            configuration (dict): Prototype configuration
+
+        Returns:
+            list[tuple]: (detector name, detector instance or None if invalid, compiled logical block) per detector
+
+        """
+        plan = []
+        for detector, logicBlock in configuration.get('logic', {}).items():
+            if not isinstance(logicBlock, list):
+                self.ioc.getLogger().warning("Logical Block was not list", trace=True, notify=False)
+            detect = self.impTool.load(detector)
+            if isinstance(detect, Detector):
+                plan.append((detector, detect, detect.compile(logicBlock)))
+            else:
+                plan.append((detector, None, None))
+        return plan
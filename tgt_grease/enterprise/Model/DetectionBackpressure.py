@@ -0,0 +1,99 @@
+import threading
+import time
+
+
+class DetectionBackpressure(object):
+    """Signal from the detection backlog telling sources to hold back
+
+    Scheduling data for detection increments the `backlog` of the detection node in the `JobServer` collection and
+    detection decrements it, so the backlog of the cluster is read from the active detection nodes alone. The
+    average backlog per node is compared with `shed` & `pause`:
+
+    * Below `shed` every configuration is sourced
+    * From `shed` configurations with a `priority` of `low` are held back & Kafka consumers slow down
+    * From `pause` only configurations with a `priority` of `high` are sourced & Kafka consumers pause until the
+      backlog drains below `shed`
+
+    Attributes:
+        ioc (GreaseContainer): IOC to access MongoDB with
+        shed (int): Average backlog per detection node low priority configurations are shed from
+        pause (int): Average backlog per detection node sourcing pauses at
+        refresh (float): Seconds the backlog is cached for
+        max_delay (float): Seconds Kafka consumers wait per message just below `pause`
+        paused (bool): If sourcing is paused until the backlog drains below `shed`
+
+    """
+
+    def __init__(self, ioc, shed=5000, pause=20000, refresh=5, max_delay=5):
+        self.ioc = ioc
+        self.shed = int(shed)
+        self.pause = max(int(pause), self.shed)
+        self.refresh = float(refresh)
+        self.max_delay = float(max_delay)
+        self.paused = False
+        self._backlog = 0.0
+        self._refreshed = None
+        self._lock = threading.Lock()
+
+    def backlog(self):
+        """Gets the average number of sources awaiting detection per active detection node
+
+        Returns:
+            float: Average backlog; 0 without active detection nodes
+
+        """
+        with self._lock:
+            if self._refreshed is not None and time.time() - self._refreshed < self.refresh:
+                return self._backlog
+            backlogs = [
+                max(int(server.get('backlog', 0) or 0), 0) for server in self.ioc.getCollection('JobServer').find(
+                    {'active': True, 'prototypes': 'detect'},
+                    projection={'backlog': True}
+                )
+            ]
+            self._backlog = float(sum(backlogs)) / len(backlogs) if backlogs else 0.0
+            self._refreshed = time.time()
+            paused = self.paused
+            if self._backlog >= self.pause:
+                self.paused = True
+            elif self._backlog < self.shed:
+                self.paused = False
+            if paused != self.paused:
+                self.ioc.getLogger().warning(
+                    "Detection backlog of [{0:.0f}] sources per node; sourcing {1}".format(
+                        self._backlog, 'paused' if self.paused else 'resumed'
+                    ),
+                    notify=False
+                )
+            return self._backlog
+
+    def allows(self, configuration):
+        """Checks if a configuration may be sourced now
+
+        Args:
+            configuration (dict): Prototype configuration; `priority` may be `low` or `high`
+
+        Returns:
+            bool: If the configuration may be sourced
+
+        """
+        if configuration.get('priority') == 'high':
+            return True
+        backlog = self.backlog()
+        if self.paused:
+            return False
+        return not (backlog >= self.shed and configuration.get('priority') == 'low')
+
+    def delay(self):
+        """Gets the seconds Kafka consumers wait before scheduling a message
+
+        Returns:
+            float: 0 below `shed` rising to `max_delay` at `pause`
+
+        """
+        backlog = self.backlog()
+        if backlog < self.shed:
+            return 0.0
+        if self.paused or self.pause == self.shed:
+            return self.max_delay
+        return self.max_delay * min((backlog - self.shed) / float(self.pause - self.shed), 1.0)
@@ -2,10 +2,9 @@ import json
 from time import time
 import threading
 from multiprocessing import Pipe
-import kafka
-from kafka import KafkaConsumer
 from tgt_grease.core import GreaseContainer
 from tgt_grease.enterprise.Model.CentralScheduling import Scheduling
+from .DetectionBackpressure import DetectionBackpressure
 from .Configuration import PrototypeConfig
 
 MIN_BACKLOG = 50     # If the Kafka message backlog falls below this number, we will kill a consumer
@@ -35,6 +34,9 @@ class KafkaSource(object):
 
     Note:
         Currently, only json messages can be decoded from kafka topics
+    Note:
+        With `Sourcing.backpressure` enabled consumers slow down while detection nodes are behind and pause until the
+        backlog drains, see `DetectionBackpressure`. Unconsumed messages wait in Kafka
 
     """
     def __init__(self, ioc=None):
@@ -155,17 +157,59 @@ class KafkaSource(object):
 
         """
         consumer = KafkaSource.create_consumer(ioc, config)
+        backpressure = None
+        if ioc.getConfig().get('Sourcing', 'backpressure', True):
+            backpressure = DetectionBackpressure(
+                ioc,
+                shed=ioc.getConfig().get('Sourcing', 'backpressure_shed', 5000),
+                pause=ioc.getConfig().get('Sourcing', 'backpressure_pause', 20000),
+                refresh=ioc.getConfig().get('Sourcing', 'backpressure_refresh', 5),
+                max_delay=ioc.getConfig().get('Sourcing', 'backpressure_delay', 5)
+            )
 
         for msg in consumer:
             if pipe.poll():    # If the parent pipe sends a signal
                 ioc.getLogger().trace("Kill signal received, stopping", trace=True)
                 return False
+            if backpressure and not KafkaSource.throttle(ioc, config, consumer, backpressure, pipe):
+                ioc.getLogger().trace("Kill signal received while paused, stopping", trace=True)
+                return False
             message_dict = KafkaSource.parse_message(ioc, config, msg)
             if message_dict:
                 KafkaSource.send_to_scheduling(ioc, config, message_dict)
 
         return False
 
+    @staticmethod
+    def throttle(ioc, config, consumer, backpressure, pipe):
+        """Holds a consumer back while detection nodes are behind
+
+        While paused the consumer is not polled, which is incompatible with iterating it, so its messages wait in Kafka
+        & are read once the backlog drains
+
+        Args:
+            ioc (GreaseContainer): Used for logging since we can't use self in threads
+            config (dict): Configuration for a Kafka Model
+            consumer (kafka.KafkaConsumer): Consumer to hold back
+            backpressure (DetectionBackpressure): Signal from the detection backlog
+            pipe (multiprocessing.Pipe): Child end of the pipe used to receive signals from parent thread
+
+        Returns:
+            bool: False if kill signal is received while paused
+
+        """
+        if not backpressure.allows(config):
+            ioc.getLogger().info("Detection backlog high, pausing kafka consumer for {0}".format(config.get('name')))
+            while not backpressure.allows(config):
+                # waits up to a second for a kill signal
+                if pipe.poll(1):
+                    return False
+            ioc.getLogger().info("Detection backlog drained, resuming kafka consumer for {0}".format(config.get('name')))
+        delay = backpressure.delay()
+        if delay and config.get('priority') != 'high':
+            KafkaSource.sleep(delay)
+        return True
+
     @staticmethod
     def sleep(sleep_sec):
         """Thread safe sleep function that waits sleep_sec seconds without affecting child threads
@@ -190,10 +234,11 @@ class KafkaSource(object):
             kafka.KafkaConsumer: KafkaConsumer object initialized with params from config
 
         """
+        import kafka
         consumer = None
         while not consumer:
             try:
-                consumer = KafkaConsumer(
+                consumer = kafka.KafkaConsumer(
                     group_id=config.get('name'),
                     *config.get('topics'),
                     **{'bootstrap_servers': ",".join(config.get('servers'))}
@@ -308,6 +353,7 @@ class KafkaSource(object):
             float: the average number of messages accross all partitions in the backlog. -1 if there is an error and excess consumers should be killed
 
         """
+        import kafka
         if not consumer.assignment():
             ioc.getLogger().trace("Assigning consumer to topic", trace=True)
             consumer.poll() # We need to poll the topic to actually get assigned
@@ -0,0 +1,203 @@
+import threading
+import time
+
+
+class ScanEventLoop(object):
+    """Event loop awaiting async sources for scanning
+
+    The loop runs in a single thread started on first use. Each configuration's `parse_source` coroutine is awaited
+    on it with at most `max_tasks` awaiting at a time. Coroutines running past their time budget are cancelled. Once
+    parsed, data is deduplicated & scheduled by a pool of `workers` threads so blocking MongoDB calls never run on the
+    loop
+
+    Attributes:
+        ioc (GreaseContainer): IOC for scanning
+        max_tasks (int): Maximum configurations awaited at a time
+        workers (int): Threads deduplicating & scheduling parsed data
+        time_budget (float): Default seconds a configuration may be awaited before it is cancelled
+        running (dict): Configuration name -> (source, start time)
+        finished (list[str]): Names of configurations finished since the last `reap`
+        loop (asyncio.AbstractEventLoop): Event loop; None until started
+
+    """
+
+    def __init__(self, ioc, max_tasks=1000, workers=4, time_budget=600):
+        self.ioc = ioc
+        self.max_tasks = int(max_tasks)
+        self.workers = int(workers)
+        self.time_budget = float(time_budget)
+        self.running = {}
+        self.finished = []
+        self.loop = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts the event loop thread & worker pool if they are not running
+
+        Returns:
+            None: Void Method to start the loop
+
+        """
+        # requires Python 3.5+
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        with self._lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            thread = threading.Thread(target=self._run, args=(self.loop,), name="GREASE SCAN EVENT LOOP")
+            thread.daemon = True
+            thread.start()
+
+    @staticmethod
+    def _run(loop):
+        """Runs an event loop until `stop`
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Event loop to run
+
+        Returns:
+            None: Meant to be run in a thread
+
+        """
+        import asyncio
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def stop(self):
+        """Stops the event loop thread & worker pool
+
+        Returns:
+            None: Void Method to stop the loop
+
+        """
+        with self._lock:
+            if self.loop is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._pool.shutdown(wait=False)
+            self.loop = None
+            self._pool = None
+
+    def is_running(self, name):
+        """Checks if a configuration is still being awaited, deduplicated or scheduled
+
+        Args:
+            name (str): Configuration name
+
+        Returns:
+            bool: If the configuration is running
+
+        """
+        with self._lock:
+            return name in self.running
+
+    def can_submit(self):
+        """Checks if another configuration can be awaited now
+
+        Returns:
+            bool: If fewer than `max_tasks` configurations are running
+
+        """
+        with self._lock:
+            return len(self.running) < self.max_tasks
+
+    def submit(self, name, source, coroutine, target, args, time_budget=None):
+        """Awaits a configuration's coroutine then passes its result to `target` in a worker thread
+
+        Args:
+            name (str): Configuration name
+            source (str): Source name
+            coroutine (coroutine): Awaitable returned by the source's `parse_source`
+            target (callable): Method called with `args` & the coroutine's result once it completes
+            args (tuple): Arguments for `target`
+            time_budget (float): Seconds the coroutine may run; `time_budget` of the loop if None
+
+        Returns:
+            bool: If the configuration was started
+
+        """
+        import asyncio
+        if self.is_running(name) or not self.can_submit():
+            coroutine.close()
+            return False
+        self.start()
+        budget = self.time_budget if time_budget is None else float(time_budget)
+        with self._lock:
+            self.running[name] = (source, time.time())
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coroutine, budget), self.loop)
+        future.add_done_callback(lambda done: self._pool.submit(self._finish, name, budget, target, args, done))
+        return True
+
+    def _finish(self, name, budget, target, args, future):
+        """Passes a configuration's result to its target then frees its slot
+
+        Args:
+            name (str): Configuration name
+            budget (float): Seconds the configuration was allowed
+            target (callable): Method to call with `args` & the result
+            args (tuple): Arguments for `target`
+            future (concurrent.futures.Future): Completed coroutine
+
+        Returns:
+            None: Meant to be run in a worker thread
+
+        """
+        import asyncio
+        try:
+            try:
+                result = bool(future.result())
+            except asyncio.TimeoutError:
+                self.ioc.getLogger().error(
+                    "Configuration [{0}] exceeded its time budget of [{1}] seconds and was cancelled".format(
+                        name, budget
+                    ),
+                    notify=False
+                )
+                result = False
+            except Exception as e:
+                self.ioc.getLogger().error(
+                    "Configuration [{0}] failed parsing; Error [{1}]".format(name, e),
+                    notify=False
+                )
+                result = False
+            target(*(tuple(args) + (result,)))
+        finally:
+            with self._lock:
+                self.running.pop(name, None)
+                self.finished.append(name)
+
+    def reap(self):
+        """Collects configurations finished since the last call
+
+        Returns:
+            list[str]: Names of configurations that finished
+
+        """
+        with self._lock:
+            finished, self.finished = self.finished, []
+        return finished
+
+    def wait(self, names, interval=.1):
+        """Waits for configurations to finish
+
+        Args:
+            names (list[str]): Configuration names to wait on
+            interval (float): Seconds between polls
+
+        Returns:
+            list[str]: Names of configurations left running; always empty since overdue coroutines are cancelled
+
+        """
+        while True:
+            with self._lock:
+                waiting = [name for name in names if name in self.running]
+            if not waiting:
+                return []
+            self.ioc.getLogger().trace("Total current async configurations [{0}]".format(len(waiting)), trace=True)
+            time.sleep(interval)
@@ -0,0 +1,223 @@
+import threading
+import time
+
+
+class ScanExecutor(object):
+    """Bounded thread executor for scanning prototype configurations
+
+    Each configuration is parsed in its own thread. At most `max_workers` configurations are parsed at a time and at
+    most `source_concurrency` of any one source, overridable per source with `source_limits`. A configuration running
+    longer than its time budget is marked overdue and no longer counts against `max_workers`, so a hung source can
+    only stall its own source. Python threads can not be stopped so overdue configurations keep their source slot and
+    are not started again until they finish
+
+    Attributes:
+        ioc (GreaseContainer): IOC for scanning
+        max_workers (int): Maximum configurations parsed at a time
+        source_concurrency (int): Default maximum configurations of a single source parsed at a time
+        source_limits (dict): Maximum configurations parsed at a time by source name
+        time_budget (float): Default seconds a configuration may run before it is overdue
+        running (dict): Configuration name -> (thread, source, start time, time budget)
+        overdue (set): Names of running configurations that exceeded their time budget
+        finished (list[str]): Names of configurations finished since the last `reap`
+
+    """
+
+    def __init__(self, ioc, max_workers=20, source_concurrency=4, source_limits=None, time_budget=600):
+        self.ioc = ioc
+        self.max_workers = int(max_workers)
+        self.source_concurrency = int(source_concurrency)
+        self.source_limits = dict(source_limits or {})
+        self.time_budget = float(time_budget)
+        self.running = {}
+        self.overdue = set()
+        self.finished = []
+        self._lock = threading.Lock()
+
+    def source_limit(self, source):
+        """Gets the maximum configurations of a source parsed at a time
+
+        Args:
+            source (str): Source name
+
+        Returns:
+            int: Concurrency limit of the source
+
+        """
+        return int(self.source_limits.get(source, self.source_concurrency))
+
+    def active(self):
+        """Counts running configurations within their time budget
+
+        Returns:
+            int: Configurations counted against `max_workers`
+
+        """
+        with self._lock:
+            return len([name for name in self.running if name not in self.overdue])
+
+    def running_source(self, source):
+        """Counts running configurations of a source, overdue or not
+
+        Args:
+            source (str): Source name
+
+        Returns:
+            int: Configurations of the source running
+
+        """
+        with self._lock:
+            return len([name for name, job in self.running.items() if job[1] == source])
+
+    def is_running(self, name):
+        """Checks if a configuration is still being parsed
+
+        Args:
+            name (str): Configuration name
+
+        Returns:
+            bool: If the configuration is running
+
+        """
+        with self._lock:
+            return name in self.running
+
+    def can_submit(self, source):
+        """Checks if a configuration of a source can be started now
+
+        Args:
+            source (str): Source name
+
+        Returns:
+            bool: If both the global & source limits have room
+
+        """
+        return self.active() < self.max_workers and self.running_source(source) < self.source_limit(source)
+
+    def blocked(self, source):
+        """Checks if a source's slots are all held by overdue configurations
+
+        Args:
+            source (str): Source name
+
+        Returns:
+            bool: If no configuration of the source can start until an overdue one finishes
+
+        """
+        with self._lock:
+            held = [name for name, job in self.running.items() if job[1] == source]
+            return len(held) >= self.source_limit(source) and all(name in self.overdue for name in held)
+
+    def submit(self, name, source, target, args, time_budget=None):
+        """Starts parsing a configuration if the limits allow it
+
+        Args:
+            name (str): Configuration name
+            source (str): Source name
+            target (callable): Method to run in the thread
+            args (tuple): Arguments for `target`
+            time_budget (float): Seconds the configuration may run; `time_budget` of the executor if None
+
+        Returns:
+            bool: If the configuration was started
+
+        """
+        if self.is_running(name) or not self.can_submit(source):
+            return False
+        thread = threading.Thread(
+            target=self._run,
+            args=(name, target, args),
+            name="GREASE SOURCING THREAD [{0}]".format(name)
+        )
+        thread.daemon = True
+        with self._lock:
+            self.running[name] = (
+                thread,
+                source,
+                time.time(),
+                self.time_budget if time_budget is None else float(time_budget)
+            )
+        thread.start()
+        return True
+
+    def _run(self, name, target, args):
+        """Runs a configuration then frees its slots
+
+        Args:
+            name (str): Configuration name
+            target (callable): Method to run
+            args (tuple): Arguments for `target`
+
+        Returns:
+            None: Meant to be run in a thread
+
+        """
+        try:
+            target(*args)
+        finally:
+            with self._lock:
+                job = self.running.pop(name, None)
+                self.finished.append(name)
+                if name in self.overdue:
+                    self.overdue.discard(name)
+                    self.ioc.getLogger().warning(
+                        "Overdue configuration [{0}] finished after [{1}] seconds".format(
+                            name, time.time() - job[2] if job else 0
+                        ),
+                        notify=False
+                    )
+
+    def poll(self):
+        """Marks configurations past their time budget as overdue
+
+        Returns:
+            list[str]: Names of configurations that became overdue
+
+        """
+        now = time.time()
+        late = []
+        with self._lock:
+            for name, job in self.running.items():
+                if name not in self.overdue and now - job[2] > job[3]:
+                    self.overdue.add(name)
+                    late.append((name, job))
+        for name, job in late:
+            self.ioc.getLogger().error(
+                "Configuration [{0}] of source [{1}] exceeded its time budget of [{2}] seconds".format(
+                    name, job[1], job[3]
+                ),
+                notify=False
+            )
+        return [name for name, _ in late]
+
+    def reap(self):
+        """Collects configurations finished since the last call & marks those past their time budget as overdue
+
+        Returns:
+            list[str]: Names of configurations that finished
+
+        """
+        self.poll()
+        with self._lock:
+            finished, self.finished = self.finished, []
+        return finished
+
+    def wait(self, names, interval=.1):
+        """Waits for configurations to finish or become overdue
+
+        Args:
+            names (list[str]): Configuration names to wait on
+            interval (float): Seconds between polls
+
+        Returns:
+            list[str]: Names of configurations left running overdue
+
+        """
+        while True:
+            self.poll()
+            with self._lock:
+                waiting = [name for name in names if name in self.running and name not in self.overdue]
+                if not waiting:
+                    return [name for name in names if name in self.running]
+            self.ioc.getLogger().trace("Total current scan threads [{0}]".format(len(waiting)), trace=True)
+            time.sleep(interval)
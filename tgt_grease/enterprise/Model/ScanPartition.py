@@ -0,0 +1,117 @@
+from bisect import bisect
+import hashlib
+import time
+
+
+class ConsistentHashRing(object):
+    """Consistent hash ring mapping keys to nodes
+
+    Each node is placed on the ring `replicas` times so keys spread evenly and adding or removing a node only moves
+    the keys of that node
+
+    Attributes:
+        nodes (tuple): Sorted node names on the ring
+        replicas (int): Points on the ring per node
+
+    """
+
+    def __init__(self, nodes=(), replicas=100):
+        self.nodes = tuple(sorted(set(nodes)))
+        self.replicas = int(replicas)
+        points = sorted(
+            (self.hash("{0}:{1}".format(node, replica)), node)
+            for node in self.nodes
+            for replica in range(self.replicas)
+        )
+        self._keys = [point[0] for point in points]
+        self._nodes = [point[1] for point in points]
+
+    @staticmethod
+    def hash(key):
+        """Hashes a key onto the ring
+
+        Args:
+            key (str): Key to hash
+
+        Returns:
+            int: Position on the ring
+
+        """
+        return int(hashlib.md5(str(key).encode('utf-8')).hexdigest()[:16], 16)
+
+    def get(self, key):
+        """Gets the node owning a key
+
+        Args:
+            key (str): Key to look up
+
+        Returns:
+            str: Owning node; None if the ring is empty
+
+        """
+        if not self._keys:
+            return None
+        return self._nodes[bisect(self._keys, self.hash(key)) % len(self._keys)]
+
+
+class ScanPartition(object):
+    """Partitions prototype configurations across the active scan nodes of the cluster
+
+    Nodes are the active `JobServer` entries with the `scan` prototype. Configurations are assigned by a consistent
+    hash of their name so each is scanned by one node a cycle. Nodes joining, or being deactivated by the monitor,
+    only move the configurations of that node. A node that is not an active scan node itself, like one deactivated by
+    the monitor while still running, owns no configuration unless the cluster has no active scan nodes at all
+
+    Attributes:
+        ioc (GreaseContainer): IOC for scanning
+        replicas (int): Points on the ring per node
+        refresh (float): Seconds active scan nodes are cached for
+        ring (ConsistentHashRing): Ring of the active scan nodes
+
+    """
+
+    def __init__(self, ioc, replicas=100, refresh=10):
+        self.ioc = ioc
+        self.replicas = int(replicas)
+        self.refresh = float(refresh)
+        self.ring = ConsistentHashRing(replicas=self.replicas)
+        self._refreshed = None
+
+    def members(self):
+        """Gets the active scan nodes, rebuilding the ring when they change
+
+        Returns:
+            tuple: Sorted MongoDB Object IDs of active scan nodes
+
+        """
+        if self._refreshed is not None and time.time() - self._refreshed < self.refresh:
+            return self.ring.nodes
+        nodes = tuple(sorted(
+            str(server.get('_id')) for server in self.ioc.getCollection('JobServer').find(
+                {'active': True, 'prototypes': 'scan'},
+                projection={'_id': True}
+            )
+        ))
+        self._refreshed = time.time()
+        if nodes != self.ring.nodes:
+            self.ioc.getLogger().info(
+                "Scan partition rebalanced across [{0}] nodes".format(len(nodes)),
+                additional={'nodes': list(nodes)}
+            )
+            self.ring = ConsistentHashRing(nodes, self.replicas)
+        return self.ring.nodes
+
+    def owns(self, configuration):
+        """Checks if this node scans a configuration
+
+        Args:
+            configuration (dict): Prototype configuration
+
+        Returns:
+            bool: If this node owns the configuration
+
+        """
+        if not self.members():
+            # no active scan nodes to partition across
+            return True
+        return self.ring.get(configuration.get('name')) == str(self.ioc.getConfig().NodeIdentity)
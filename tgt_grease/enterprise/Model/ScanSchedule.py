@@ -0,0 +1,237 @@
+import datetime
+import heapq
+
+# (lowest, highest) value of each cron field: minute, hour, day of month, month, day of week
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# bounds the search for the next due time; specs like `0 0 30 2 *` never match
+CRON_SEARCH_STEPS = 10000
+
+
+def parse_cron(spec):
+    """Parses a cron spec of five fields: minute hour day-of-month month day-of-week
+
+    Each field may be `*`, a number, a range `a-b`, a list `a,b` or any of those with a step `*/n`. Day of week is 0-7
+    with both 0 & 7 being Sunday. As in cron, when both day of month & day of week are restricted either may match
+
+    Args:
+        spec (str): Cron spec
+
+    Returns:
+        tuple: Sets of allowed minutes, hours, days, months & weekdays then if days & weekdays were restricted
+
+    Raises:
+        ValueError: If the spec is invalid
+
+    """
+    fields = str(spec).split()
+    if len(fields) != 5:
+        raise ValueError("Cron spec [{0}] must have five fields".format(spec))
+    parsed = []
+    for field, (low, high) in zip(fields, CRON_FIELDS):
+        allowed = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step = part.split('/', 1)
+                step = int(step)
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = [int(value) for value in part.split('-', 1)]
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError("Cron field [{0}] of spec [{1}] is out of range".format(field, spec))
+            allowed.update(range(start, end + 1, step))
+        parsed.append(allowed)
+    # Sunday is both 0 & 7
+    if 7 in parsed[4]:
+        parsed[4].add(0)
+    return tuple(parsed) + (fields[2] != '*', fields[4] != '*')
+
+
+def next_due(cron, after):
+    """Gets the first minute after a time matching a parsed cron spec
+
+    Args:
+        cron (tuple): Parsed cron spec from `parse_cron`
+        after (datetime.datetime): Time to search after
+
+    Returns:
+        datetime.datetime: Next due time; None if the spec never matches
+
+    """
+    minutes, hours, days, months, weekdays, daysRestricted, weekdaysRestricted = cron
+    due = after.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+    for _ in range(CRON_SEARCH_STEPS):
+        if due.month not in months:
+            # first day of the next month
+            due = (due.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+            continue
+        dayMatch = due.day in days
+        # datetime weeks start on Monday; cron weeks on Sunday
+        weekdayMatch = (due.weekday() + 1) % 7 in weekdays
+        if daysRestricted and weekdaysRestricted:
+            dayMatch = dayMatch or weekdayMatch
+        else:
+            dayMatch = dayMatch and weekdayMatch
+        if not dayMatch:
+            due = due.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            continue
+        if due.hour not in hours:
+            due = due.replace(minute=0) + datetime.timedelta(hours=1)
+            continue
+        if due.minute not in minutes:
+            due += datetime.timedelta(minutes=1)
+            continue
+        return due
+    return None
+
+
+def configuration_spec(configuration):
+    """Gets the cron spec of a prototype configuration
+
+    Configurations may set a `schedule` cron spec. Otherwise the `hour` & `minute` keys checked by the sources are
+    converted, where a missing minute means every minute of the hour
+
+    Args:
+        configuration (dict): Prototype configuration
+
+    Returns:
+        str: Cron spec; None if the configuration is scanned every cycle
+
+    """
+    if configuration.get('schedule'):
+        return configuration.get('schedule')
+    # falsy values are ignored the same as the sources do
+    if configuration.get('hour') or configuration.get('minute'):
+        return "{0} {1} * * *".format(configuration.get('minute') or '*', configuration.get('hour') or '*')
+    return None
+
+
+class ScanSchedule(object):
+    """Tracks when prototype configurations are next due to be scanned
+
+    Due times are kept in a heap ordered by time so finding the due configurations & the time until the next one is
+    due only looks at the head of the heap. Times are in UTC at minute resolution like cron. A due configuration stays
+    due until `started` is called for it, so configurations held back by the scanner are retried instead of missing
+    their run
+
+    Attributes:
+        ioc (GreaseContainer): IOC for scanning
+        entries (dict): Configuration name -> (cron spec, next due time)
+        continuous (list[str]): Names of configurations without a schedule, due every cycle
+        waiting (dict): Configuration name -> due time of configurations due but not started yet
+
+    """
+
+    def __init__(self, ioc):
+        self.ioc = ioc
+        self.entries = {}
+        self.continuous = []
+        self.waiting = {}
+        self._heap = []
+
+    def load(self, configurations, now=None):
+        """Loads configurations, keeping due times of configurations whose spec is unchanged
+
+        Args:
+            configurations (list[dict]): Prototype configurations to schedule
+            now (datetime.datetime): Current UTC time
+
+        Returns:
+            None: Void Method to load configurations
+
+        """
+        now = now or datetime.datetime.utcnow()
+        entries = {}
+        waiting = {}
+        self.continuous = []
+        for configuration in configurations:
+            name = configuration.get('name')
+            spec = configuration_spec(configuration)
+            if spec is None:
+                self.continuous.append(name)
+                continue
+            if name in self.entries and self.entries[name][0] == spec:
+                entries[name] = self.entries[name]
+                if name in self.waiting:
+                    waiting[name] = self.waiting[name]
+                continue
+            try:
+                # the current minute counts as due
+                entries[name] = (spec, next_due(parse_cron(spec), now - datetime.timedelta(minutes=1)))
+            except ValueError as e:
+                self.ioc.getLogger().error(
+                    "Invalid schedule for configuration [{0}]: {1}".format(name, e),
+                    notify=False
+                )
+                continue
+            if entries[name][1] is None:
+                self.ioc.getLogger().error(
+                    "Schedule [{0}] of configuration [{1}] never comes due".format(spec, name),
+                    notify=False
+                )
+        self.entries = entries
+        self.waiting = waiting
+        self._heap = [
+            (due, name) for name, (_, due) in self.entries.items() if due is not None and name not in self.waiting
+        ]
+        heapq.heapify(self._heap)
+
+    def due(self, now=None):
+        """Gets the configurations due to be scanned
+
+        Args:
+            now (datetime.datetime): Current UTC time
+
+        Returns:
+            list[str]: Names of due configurations oldest first, including those scanned every cycle
+
+        """
+        now = now or datetime.datetime.utcnow()
+        while self._heap and self._heap[0][0] <= now:
+            dueTime, name = heapq.heappop(self._heap)
+            self.waiting[name] = dueTime
+        return list(self.continuous) + sorted(self.waiting, key=lambda name: (self.waiting[name], name))
+
+    def started(self, name, now=None):
+        """Schedules the next run of a due configuration once the scanner started it
+
+        Args:
+            name (str): Configuration name
+            now (datetime.datetime): Current UTC time
+
+        Returns:
+            datetime.datetime: Next due time; None if the configuration was not waiting or never comes due again
+
+        """
+        if name not in self.waiting:
+            return None
+        now = now or datetime.datetime.utcnow()
+        dueTime = self.waiting.pop(name)
+        spec = self.entries[name][0]
+        nextTime = next_due(parse_cron(spec), max(dueTime, now))
+        self.entries[name] = (spec, nextTime)
+        if nextTime is not None:
+            heapq.heappush(self._heap, (nextTime, name))
+        return nextTime
+
+    def sleep_time(self, now=None):
+        """Gets the seconds until the next configuration is due
+
+        Args:
+            now (datetime.datetime): Current UTC time
+
+        Returns:
+            float: Seconds to sleep; 0 if configurations are scanned every cycle or waiting to be started, None if
+            nothing is scheduled
+
+        """
+        now = now or datetime.datetime.utcnow()
+        if self.continuous or self.waiting:
+            return 0.0
+        if not self._heap:
+            return None
+        return max((self._heap[0][0] - now).total_seconds(), 0.0)
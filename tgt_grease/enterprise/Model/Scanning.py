@@ -2,10 +2,15 @@ from tgt_grease.core import GreaseContainer
 from tgt_grease.core import ImportTool
 from .Configuration import PrototypeConfig
 from .BaseSource import BaseSourceClass
+from .AsyncSource import AsyncSourceClass
 from .DeDuplication import Deduplication
 from .CentralScheduling import Scheduling
-import threading
-from psutil import cpu_percent, virtual_memory
+from .ScanExecutor import ScanExecutor
+from .ScanEventLoop import ScanEventLoop
+from .ScanSchedule import ScanSchedule
+from .ScanPartition import ScanPartition
+from .DetectionBackpressure import DetectionBackpressure
+import time
 from uuid import uuid4
 
 
@@ -19,9 +24,23 @@ class Scan(object):
         conf (PrototypeConfig): Prototype configuration instance
         impTool (ImportTool): Import Utility Instance
         dedup (Deduplication): Deduplication instance to be used
+        scheduler (Scheduling): Central Scheduling instance
+        executor (ScanExecutor): Bounded executor configurations are parsed in
+        eventLoop (ScanEventLoop): Event loop configurations of async sources are awaited on
+        asyncSources (set): Names of sources found to be async
+        schedule (ScanSchedule): Next due times of scheduled configurations
+        scheduleKey (tuple): Configuration version, source, config & scan nodes the schedule was loaded for
+        partition (ScanPartition): Assignment of configurations to the cluster's scan nodes
+        backpressure (DetectionBackpressure): Signal from the detection backlog to hold configurations back
+        held (dict): Configuration name -> reason it was last held back from starting
+        maxSleep (float): Maximum seconds `ParseScheduled` sleeps so configuration changes are picked up
+        tick (float): Minimum seconds `ParseScheduled` sleeps between scans while configurations are due
 
     """
 
+    maxSleep = 60
+    tick = 1
+
     def __init__(self, ioc=None):
         if ioc and isinstance(ioc, GreaseContainer):
             self.ioc = ioc
@@ -31,8 +50,37 @@ class Scan(object):
         self.impTool = ImportTool(self.ioc.getLogger())
         self.dedup = Deduplication(self.ioc)
         self.scheduler = Scheduling(self.ioc)
+        self.executor = ScanExecutor(
+            self.ioc,
+            max_workers=self.ioc.getConfig().get('Sourcing', 'max_workers', 20),
+            source_concurrency=self.ioc.getConfig().get('Sourcing', 'source_concurrency', 4),
+            source_limits=self.ioc.getConfig().get('Sourcing', 'source_limits', {}),
+            time_budget=self.ioc.getConfig().get('Sourcing', 'time_budget', 600)
+        )
+        self.eventLoop = ScanEventLoop(
+            self.ioc,
+            max_tasks=self.ioc.getConfig().get('Sourcing', 'async_max_tasks', 1000),
+            workers=self.ioc.getConfig().get('Sourcing', 'async_workers', 4),
+            time_budget=self.ioc.getConfig().get('Sourcing', 'time_budget', 600)
+        )
+        self.asyncSources = set()
+        self.schedule = ScanSchedule(self.ioc)
+        self.scheduleKey = None
+        self.partition = ScanPartition(
+            self.ioc,
+            replicas=self.ioc.getConfig().get('Sourcing', 'partition_replicas', 100),
+            refresh=self.ioc.getConfig().get('Sourcing', 'partition_refresh', 10)
+        )
+        self.backpressure = DetectionBackpressure(
+            self.ioc,
+            shed=self.ioc.getConfig().get('Sourcing', 'backpressure_shed', 5000),
+            pause=self.ioc.getConfig().get('Sourcing', 'backpressure_pause', 20000),
+            refresh=self.ioc.getConfig().get('Sourcing', 'backpressure_refresh', 5),
+            max_delay=self.ioc.getConfig().get('Sourcing', 'backpressure_delay', 5)
+        )
+        self.held = {}
 
-    def Parse(self, source=None, config=None):
+    def Parse(self, source=None, config=None, due=None, wait=False):
         """This will read all configurations and attempt to scan the environment
 
         This is the primary business logic for scanning in GREASE. This method will use configurations to parse
@@ -46,82 +94,282 @@ class Scan(object):
         Note:
             **If mocking is enabled**: Deduplication *will not occur*
 
+        Note:
+            Configurations are parsed by `executor` within the `Sourcing` limits `max_workers`, `source_concurrency` &
+            `source_limits`. Parse returns once the configurations there is room for were started; the rest wait for
+            the next call. Configurations finished since the last call are reaped first, while those still running
+            are skipped until they finish. A configuration running past its time budget, the `time_budget` key of the
+            configuration or `Sourcing.time_budget`, is marked overdue and no longer counts against `max_workers`
+
+        Note:
+            Configurations are only marked started on `schedule` once the executor accepts them. Those held back, like
+            by an offline execution environment or an invalid source, stay due and are retried by later calls. Why a
+            configuration is held back is only logged when the reason changes
+
+        Note:
+            With `wait` Parse waits for room to start every configuration, then for each to finish or run past its
+            time budget. This is how scans with `--loop` parse every configuration once per loop
+
+        Note:
+            Configurations of async sources are awaited on `eventLoop` instead, up to `Sourcing.async_max_tasks` at a
+            time. They are cancelled once past their time budget
+
+        Note:
+            With `Sourcing.partition` enabled only configurations this node owns among the cluster's active scan nodes
+            are parsed, see `ScanPartition`
+
+        Note:
+            With `Sourcing.backpressure` enabled configurations are held back while detection nodes are behind, see
+            `DetectionBackpressure`. Held configurations stay due and are parsed once the backlog drains
+
         Args:
             source (str): If set will only parse for the source listed
             config (str): If set will only parse the specified config
+            due (list[str]): If set will only parse the configurations named, which the scan schedule found due
+            wait (bool): If True wait for every configuration to be started & finish
 
         Returns:
             bool: True unless error
 
         """
+        from psutil import cpu_percent, virtual_memory
+        mock = self.ioc.getConfig().get('Sourcing', 'mock')
         self.ioc.getLogger().trace("Starting Parse of Environment", trace=True)
-        Configuration = self.generate_config_set(source=source, config=config)
-        ScanPool = []
-        lenConfigs = len(Configuration)
-        i = 0
-        while i < lenConfigs:
+        self.reap()
+        pending = list(self.generate_config_set(source=source, config=config))
+        if due is not None:
+            pending = [conf for conf in pending if conf.get('name') in due]
+        if self.ioc.getConfig().get('Sourcing', 'partition', True):
+            pending = [conf for conf in pending if self.partition.owns(conf)]
+        if self.ioc.getConfig().get('Sourcing', 'backpressure', True):
+            allowed = []
+            held = 0
+            for conf in pending:
+                if self.backpressure.allows(conf):
+                    allowed.append(conf)
+                elif self.hold(conf.get('name'), 'backpressure'):
+                    held += 1
+            if held:
+                self.ioc.getLogger().warning(
+                    "Detection backlog of [{0:.0f}] sources per node; [{1}] more configurations held back".format(
+                        self.backpressure.backlog(), held
+                    ),
+                    notify=False
+                )
+            pending = allowed
+        cycle = []
+        asyncCycle = []
+        # awaiting another coroutine costs no thread so resources are only checked before starting threads
+        awaited = False
+        while pending:
+            self.executor.poll()
             # ensure we don't swamp the system resources
-            cpu = cpu_percent(interval=.1)
-            mem = virtual_memory().percent
-            if \
-                    cpu >= int(self.ioc.getConfig().get('NodeInformation', 'ResourceMax')) or \
-                    mem >= int(self.ioc.getConfig().get('NodeInformation', 'ResourceMax')):
-                self.ioc.getLogger().trace("Scan sleeping; System resource maximum reached", verbose=True)
-                # remove variables
-                del cpu
-                del mem
-                continue
-            conf = Configuration[i]
-            i += 1
-            # ensure no kafka prototypes come into sourcing
-            if conf.get('source') == 'kafka':
+            if not awaited:
+                cpu = cpu_percent(interval=.1)
+                mem = virtual_memory().percent
+                if \
+                        cpu >= int(self.ioc.getConfig().get('NodeInformation', 'ResourceMax')) or \
+                        mem >= int(self.ioc.getConfig().get('NodeInformation', 'ResourceMax')):
+                    self.ioc.getLogger().trace("Scan sleeping; System resource maximum reached", verbose=True)
+                    # remove variables
+                    del cpu
+                    del mem
+                    if not wait:
+                        # the rest are started once resources free up
+                        break
+                    continue
+            awaited = False
+            # start the first configuration the executor has room for
+            conf = None
+            for candidate in list(pending):
+                name = candidate.get('name')
+                # ensure no kafka prototypes come into sourcing
+                if candidate.get('source') == 'kafka':
+                    pending.remove(candidate)
+                elif self.executor.is_running(name) or self.eventLoop.is_running(name):
+                    # still running from an earlier cycle
+                    self.ioc.getLogger().trace(
+                        "Configuration [{0}] still running; skipped this cycle".format(name),
+                        trace=True
+                    )
+                    pending.remove(candidate)
+                elif candidate.get('source') in self.asyncSources and not mock:
+                    if self.eventLoop.can_submit():
+                        conf = candidate
+                        pending.remove(candidate)
+                        break
+                elif self.executor.blocked(candidate.get('source')):
+                    if self.hold(name, 'blocked'):
+                        self.ioc.getLogger().warning(
+                            "Configuration [{0}] skipped -- source [{1}] is held by overdue configurations".format(
+                                name, candidate.get('source')
+                            ),
+                            notify=False
+                        )
+                    pending.remove(candidate)
+                elif self.executor.can_submit(candidate.get('source')):
+                    conf = candidate
+                    pending.remove(candidate)
+                    break
+            if not conf:
+                if pending and not wait:
+                    self.ioc.getLogger().trace(
+                        "Executor limits reached; [{0}] configurations wait for the next scan".format(len(pending)),
+                        trace=True
+                    )
+                    break
+                if pending:
+                    self.ioc.getLogger().trace("Scan waiting; executor limits reached", trace=True)
+                    time.sleep(.1)
                 continue
             # ensure there is an execution environment
             server, _ = self.scheduler.determineExecutionServer(conf.get('exe_env', 'general'))
             if not server:
-                self.ioc.getLogger().warning(
-                    'configuration skipped -- execution environment offline',
-                    additional={
-                        'execution_environment': conf.get('exe_env', 'general'),
-                        'configuration': conf.get('name')
-                    },
-                    notify=True
-                )
+                if self.hold(conf.get('name'), 'offline'):
+                    self.ioc.getLogger().warning(
+                        'configuration skipped -- execution environment offline',
+                        additional={
+                            'execution_environment': conf.get('exe_env', 'general'),
+                            'configuration': conf.get('name')
+                        },
+                        notify=True
+                    )
                 continue
             inst = self.impTool.load(conf.get('source', str(uuid4())))
             if not isinstance(inst, BaseSourceClass):
-                self.ioc.getLogger().error("Invalid Source [{0}]".format(conf.get('source')), notify=False)
+                if self.hold(conf.get('name'), 'invalid'):
+                    self.ioc.getLogger().error("Invalid Source [{0}]".format(conf.get('source')), notify=False)
                 del inst
                 continue
-            else:
-                t = threading.Thread(
-                    target=self.ParseSource,
-                    args=(
+            if due is not None:
+                # the schedule found the configuration due; sources must not check its hour & minute again if late
+                inst.scheduled = True
+            name = conf.get('name', str(uuid4()))
+            if isinstance(inst, AsyncSourceClass) and not mock:
+                self.asyncSources.add(conf.get('source'))
+                if self.eventLoop.submit(
+                        name,
+                        conf.get('source'),
+                        inst.parse_source(conf),
+                        self.ParseSource,
+                        (
+                            self.ioc,
+                            inst,
+                            conf,
+                            self.dedup,
+                            self.scheduler,
+                        ),
+                        conf.get('time_budget')
+                ):
+                    asyncCycle.append(name)
+                    awaited = True
+                    self.held.pop(name, None)
+                    self.schedule.started(name)
+                else:
+                    pending.append(conf)
+            elif self.executor.submit(
+                    name,
+                    conf.get('source'),
+                    self.ParseSource,
+                    (
                         self.ioc,
                         inst,
                         conf,
                         self.dedup,
                         self.scheduler,
                     ),
-                    name="GREASE SOURCING THREAD [{0}]".format(conf.get('name'))
-                )
-                t.daemon = True
-                t.start()
-                ScanPool.append(t)
-        # wait for threads to finish out
-        while len(ScanPool) > 0:
-            self.ioc.getLogger().trace("Total current scan threads [{0}]".format(len(ScanPool)), trace=True)
-            threads_final = []
-            for thread in ScanPool:
-                if thread.isAlive():
-                    threads_final.append(thread)
-            ScanPool = threads_final
-            self.ioc.getLogger().trace("Total current scan threads [{0}]".format(len(ScanPool)), trace=True)
-        self.ioc.getLogger().trace("Scanning Complete".format(len(ScanPool)), trace=True)
+                    conf.get('time_budget')
+            ):
+                cycle.append(name)
+                self.held.pop(name, None)
+                self.schedule.started(name)
+            else:
+                pending.append(conf)
+        if not wait:
+            # running configurations are reaped by the next call
+            self.ioc.getLogger().trace(
+                "Scanning Complete; [{0}] configurations started".format(len(cycle) + len(asyncCycle)),
+                trace=True
+            )
+            return True
+        # wait for this cycle's configurations to finish or run out of time
+        overdue = self.executor.wait(cycle) + self.eventLoop.wait(asyncCycle)
+        self.reap()
+        if overdue:
+            self.ioc.getLogger().trace(
+                "Scanning Complete; [{0}] configurations still running overdue".format(len(overdue)),
+                trace=True
+            )
+        else:
+            self.ioc.getLogger().trace("Scanning Complete", trace=True)
         return True
 
+    def hold(self, name, reason):
+        """Records why a configuration was held back from starting
+
+        Args:
+            name (str): Configuration name
+            reason (str): Why the configuration was held back
+
+        Returns:
+            bool: If the reason changed and should be logged
+
+        """
+        changed = self.held.get(name) != reason
+        self.held[name] = reason
+        return changed
+
+    def reap(self):
+        """Collects configurations finished since the last scan & marks those past their time budget as overdue
+
+        Returns:
+            list[str]: Names of configurations that finished
+
+        """
+        finished = self.executor.reap() + self.eventLoop.reap()
+        if finished:
+            self.ioc.getLogger().trace(
+                "[{0}] configurations finished since the last scan".format(len(finished)),
+                trace=True
+            )
+        return finished
+
+    def ParseScheduled(self, source=None, config=None):
+        """Parses only the configurations that are due, sleeping until the next one is due otherwise
+
+        Configurations are due per the cron spec in their `schedule` key, or their `hour` & `minute` keys. Those
+        without either are due every cycle. Sources are only loaded for due configurations. Parsing does not wait for
+        configurations to finish, so while any are due scans are at least `tick` seconds apart
+
+        Args:
+            source (str): If set will only parse for the source listed
+            config (str): If set will only parse the specified config
+
+        Returns:
+            bool: True unless error
+
+        """
+        partition = self.ioc.getConfig().get('Sourcing', 'partition', True)
+        scheduleKey = (self.conf.get_version(), source, config, self.partition.members() if partition else None)
+        if scheduleKey != self.scheduleKey:
+            # only configurations owned by this node are scheduled
+            self.schedule.load([
+                conf for conf in self.generate_config_set(source=source, config=config)
+                if not partition or self.partition.owns(conf)
+            ])
+            self.scheduleKey = scheduleKey
+        due = self.schedule.due()
+        result = True
+        if due:
+            result = self.Parse(source=source, config=config, due=due)
+        wait = self.schedule.sleep_time()
+        wait = self.maxSleep if wait is None else min(max(wait, self.tick), self.maxSleep)
+        self.ioc.getLogger().trace("Scan sleeping [{0}] seconds".format(wait), trace=True)
+        time.sleep(wait)
+        return result
+
     @staticmethod
-    def ParseSource(ioc, source, configuration, deduplication, scheduler):
+    def ParseSource(ioc, source, configuration, deduplication, scheduler, result=None):
         """Parses an individual source and attempts to schedule it
 
         Args:
@@ -130,18 +378,25 @@ class Scan(object):
             configuration (dict): Prototype configuration to use
             deduplication (Deduplication): Dedup engine instance
             scheduler (Scheduling): Central Scheduling instance
+            result (bool): Result of `parse_source` already awaited by the event loop for async sources
 
         Returns:
             None: Meant to be run in a thread
 
         """
         try:
+            parsed = False
             # If mock mode enabled
             if ioc.getConfig().get('Sourcing', 'mock'):
                 data = source.mock_data(configuration)
+            elif source.streams(configuration):
+                Scan.ParseStream(ioc, source, configuration, deduplication, scheduler)
+                del source
+                return
             # else actually do sourcing
             else:
-                if source.parse_source(configuration):
+                if source.parse_source(configuration) if result is None else result:
+                    parsed = True
                     # deduplicate data
                     data = deduplication.Deduplicate(
                         data=source.get_data(),
@@ -165,12 +420,17 @@ class Scan(object):
                         "Data scheduled for detection from source [{0}]".format(configuration.get('source')),
                         trace=True
                     )
+                    # the watermark only moves past data once it is scheduled
+                    source.commit_checkpoint(ioc, configuration)
                     del source
                 else:
                     ioc.getLogger().error("Scheduling failed for source document!", notify=False)
                     del source
             else:
                 ioc.getLogger().trace("Length of data was empty; was not scheduled", trace=True)
+                if parsed and isinstance(source.get_data(), list):
+                    # everything read was a duplicate; data of any other shape was never scheduled
+                    source.commit_checkpoint(ioc, configuration)
                 del source
         except BaseException as e:
             ioc.getLogger().error(
@@ -178,6 +438,53 @@ class Scan(object):
             )
             del source
 
+    @staticmethod
+    def ParseStream(ioc, source, configuration, deduplication, scheduler):
+        """Deduplicates & schedules the data of a source a chunk at a time as it is read
+
+        Only a chunk of `chunk_size` records of the configuration is held at a time. The source's watermark is only
+        committed once every chunk was scheduled
+
+        Args:
+            ioc (GreaseContainer): IoC Instance
+            source (BaseSourceClass): Source to stream
+            configuration (dict): Prototype configuration to use
+            deduplication (Deduplication): Dedup engine instance
+            scheduler (Scheduling): Central Scheduling instance
+
+        Returns:
+            bool: If every chunk was scheduled
+
+        """
+        scheduled = 0
+        for chunk in source.iter_data(configuration, int(configuration.get('chunk_size', 1000))):
+            data = deduplication.Deduplicate(
+                data=chunk,
+                source=configuration.get('source'),
+                configuration=configuration.get('name', str(uuid4())),
+                threshold=source.deduplication_strength,
+                expiry_hours=source.deduplication_expiry,
+                expiry_max=source.deduplication_expiry_max,
+                collection='Dedup_Sourcing',
+                field_set=source.field_set
+            )
+            if not data:
+                continue
+            if not scheduler.scheduleDetection(configuration.get('source'), configuration.get('name'), data):
+                ioc.getLogger().error("Scheduling failed for source document!", notify=False)
+                return False
+            scheduled += len(data)
+        if scheduled:
+            ioc.getLogger().info(
+                "[{0}] records scheduled for detection from source [{1}]".format(scheduled, configuration.get('source')),
+                trace=True
+            )
+        else:
+            ioc.getLogger().trace("Length of data was empty; was not scheduled", trace=True)
+        # the watermark only moves past data once it is scheduled
+        source.commit_checkpoint(ioc, configuration)
+        return True
+
     def generate_config_set(self, source=None, config=None):
         """Examines configuration and returns list of configs to parse
 
@@ -206,9 +513,8 @@ class Scan(object):
                     notify=False
                 )
         elif source and not config:
-            if source in self.conf.get_sources():
-                for configuration in self.conf.get_source(source):
-                    ConfigList.append(configuration)
+            if self.conf.get_source(source):
+                ConfigList.extend(self.conf.get_source(source))
                 return ConfigList
             else:
                 self.ioc.getLogger().warning(
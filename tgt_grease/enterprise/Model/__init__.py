@@ -1,7 +1,13 @@
 from .BaseSource import BaseSourceClass
+from .AsyncSource import AsyncSourceClass
 from .BaseDetector import Detector
 from .DeDuplication import Deduplication
 from .CentralScheduling import Scheduling
+from .ScanExecutor import ScanExecutor
+from .ScanEventLoop import ScanEventLoop
+from .ScanSchedule import ScanSchedule
+from .ScanPartition import ScanPartition, ConsistentHashRing
+from .DetectionBackpressure import DetectionBackpressure
 from .Scanning import Scan
 from .Detection import Detect
 from .Scheduler import Scheduler
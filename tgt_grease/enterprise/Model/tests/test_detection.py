@@ -539,3 +539,289 @@ class TestDetect(TestCase):
         self.assertFalse(item['grease_data']['scheduling']['schedulingServer'])
         d.ioc.getCollection('JobServer').delete_one({'_id': ObjectId(scheduleServer)})
         d.ioc.getCollection('SourceData').delete_one({'_id': ObjectId(sourceId)})
+
+    def test_detection_plan_cached(self):
+        d = Detect()
+        p = PrototypeConfig(d.ioc)
+        p.load(ConfigurationList=[
+            {
+                'name': 'plan config',
+                'job': 'otherThing',
+                'exe_env': 'general',
+                'source': 'Google',
+                'logic': {
+                    'Regex': [
+                        {
+                            'field': 'key',
+                            'pattern': '.*',
+                            'variable': True,
+                            'variable_name': 'field'
+                        }
+                    ],
+                    'Range': [
+                        {
+                            'field': 'count',
+                            'min': 1
+                        }
+                    ]
+                }
+            }
+        ])
+        configuration = p.get_config('plan config')
+        plan = d.get_plan(configuration)
+        self.assertIs(d.get_plan(configuration), plan)
+        self.assertTrue(d.detection({'key': 'var', 'count': 5}, configuration)[0])
+        self.assertFalse(d.detection({'key': 'var', 'count': 0}, configuration)[0])
+        # a new configuration version invalidates the plan
+        p.load(ConfigurationList=[configuration])
+        self.assertIsNot(d.get_plan(p.get_config('plan config')), plan)
+        p.load(reloadConf=True)
+
+    def test_detection_batch(self):
+        d = Detect()
+        configuration = {
+            'name': 'demo config',
+            'job': 'otherThing',
+            'exe_env': 'general',
+            'source': 'Google',
+            'logic': {
+                'Exists': [
+                    {
+                        'field': 'key',
+                        'variable': True,
+                        'variable_name': 'field'
+                    }
+                ],
+                'Range': [
+                    {
+                        'field': 'count',
+                        'min': 1
+                    }
+                ]
+            }
+        }
+        sources = [{'key': 'var', 'count': 5}, {'key': 'var', 'count': 0}, {'count': 5}, []]
+        self.assertEqual(
+            d.detectionBatch(sources, configuration),
+            [d.detection(source, configuration) for source in sources]
+        )
+
+    def test_detection_plan_ordering(self):
+        d = Detect()
+        p = PrototypeConfig(d.ioc)
+        p.load(ConfigurationList=[
+            {
+                'name': 'order config',
+                'job': 'otherThing',
+                'exe_env': 'general',
+                'source': 'Google',
+                'logic': {
+                    'Regex': [
+                        {
+                            'field': 'key',
+                            'pattern': '.*var.*'
+                        }
+                    ],
+                    'Exists': [
+                        {
+                            'field': 'count'
+                        }
+                    ]
+                }
+            }
+        ])
+        configuration = p.get_config('order config')
+        for _ in range(d.reorderInterval):
+            self.assertFalse(d.detection({'key': 'var'}, configuration)[0])
+        stats = d.get_stats('order config')
+        self.assertEqual(stats['Exists']['pass_rate'], 0.0)
+        # exists rejects every source so it runs first
+        self.assertEqual([step[0] for step in d.get_plan(configuration)], ['Exists', 'Regex'])
+        self.assertTrue(d.detection({'key': 'var', 'count': 1}, configuration)[0])
+        p.load(reloadConf=True)
+
+    def test_detect_batch_claims_sources(self):
+        d = Detect()
+        p = PrototypeConfig(d.ioc)
+        p.load(ConfigurationList=[
+            {
+                'name': 'batch config',
+                'job': 'otherThing',
+                'exe_env': 'general',
+                'source': 'Google',
+                'logic': {
+                    'Range': [
+                        {
+                            'field': 'count',
+                            'min': 1
+                        }
+                    ]
+                }
+            }
+        ])
+        for count in range(3):
+            d.ioc.getCollection('SourceData').insert_one({
+                'grease_data': {
+                    'detection': {
+                        'server': ObjectId(d.ioc.getConfig().NodeIdentity),
+                        'start': None,
+                        'end': None,
+                        'detection': {}
+                    }
+                },
+                'source': 'Google',
+                'configuration': 'batch config',
+                'data': {'count': count},
+                'createTime': datetime.datetime.utcnow()
+            })
+        self.assertEqual(d.detectBatch(2), 2)
+        self.assertEqual(d.detectBatch(2), 1)
+        self.assertEqual(d.detectBatch(2), 0)
+        self.assertIsNone(d.ioc.getCollection('SourceData').find_one({'grease_data.detection.end': None}))
+        d.ioc.getCollection('SourceData').drop()
+        p.load(reloadConf=True)
+
+    def test_detect_source_reconciles_backlog(self):
+        d = Detect()
+        node = ObjectId(d.ioc.getConfig().NodeIdentity)
+        # the registered node's backlog drifted above the sources it has awaiting detection
+        d.ioc.getCollection('SourceData').drop()
+        d.ioc.getCollection('JobServer').update_one({'_id': node}, {'$set': {'backlog': 1000000}}, upsert=True)
+        self.assertTrue(d.detectSource())
+        self.assertEqual(d.ioc.getCollection('JobServer').find_one({'_id': node}).get('backlog'), 0)
+
+    def test_claim_sources(self):
+        d = Detect()
+        now = datetime.datetime.utcnow()
+        sources = {}
+        for name, age, start in [
+            ('old', 2, None),
+            ('new', 1, None),
+            ('stale claim', 3, now - datetime.timedelta(hours=1)),
+            ('live claim', 4, now)
+        ]:
+            sources[name] = d.ioc.getCollection('SourceData').insert_one({
+                'grease_data': {
+                    'detection': {
+                        'server': ObjectId(d.ioc.getConfig().NodeIdentity),
+                        'start': start,
+                        'end': None,
+                        'detection': {}
+                    }
+                },
+                'source': 'Google',
+                'configuration': 'claim config',
+                'data': {},
+                'createTime': now - datetime.timedelta(seconds=age)
+            }).inserted_id
+        # oldest first; claims of dead workers expire while live ones are kept
+        self.assertEqual(
+            sorted(source['_id'] for source in d.claimSources(2)),
+            sorted([sources['stale claim'], sources['old']])
+        )
+        self.assertEqual([source['_id'] for source in d.claimSources(5)], [sources['new']])
+        self.assertEqual(d.claimSources(5), [])
+        d.ioc.getCollection('SourceData').drop()
+
+    def test_run_workers(self):
+        d = Detect()
+        p = PrototypeConfig(d.ioc)
+        p.load(ConfigurationList=[
+            {
+                'name': 'worker config',
+                'job': 'otherThing',
+                'exe_env': 'general',
+                'source': 'Google',
+                'logic': {
+                    'Range': [
+                        {
+                            'field': 'count',
+                            'min': 1
+                        }
+                    ]
+                }
+            }
+        ])
+        for count in range(20):
+            d.ioc.getCollection('SourceData').insert_one({
+                'grease_data': {
+                    'detection': {
+                        'server': ObjectId(d.ioc.getConfig().NodeIdentity),
+                        'start': None,
+                        'end': None,
+                        'detection': {}
+                    }
+                },
+                'source': 'Google',
+                'configuration': 'worker config',
+                'data': {'count': count},
+                'createTime': datetime.datetime.utcnow()
+            })
+        self.assertTrue(d.runWorkers(2, batchSize=3, cycles=10))
+        # every source detected exactly once across both workers
+        self.assertEqual(sorted(d.workerStats.keys()), [0, 1])
+        self.assertEqual(sum(stats['sources'] for stats in d.workerStats.values()), 20)
+        self.assertEqual(sum(stats['cycles'] for stats in d.workerStats.values()), 20)
+        self.assertIsNone(d.ioc.getCollection('SourceData').find_one({'grease_data.detection.end': None}))
+        self.assertEqual(
+            d.ioc.getCollection('SourceData').count_documents({'grease_data.detection.end': {'$ne': None}}),
+            20
+        )
+        report = d.reportWorkers()
+        self.assertEqual(sorted(report.keys()), [0, 1])
+        self.assertTrue(all(rate >= 0 for rate in report.values()))
+        d.ioc.getCollection('SourceData').drop()
+        p.load(reloadConf=True)
+
+    def test_detection_cache(self):
+        d = Detect()
+        p = PrototypeConfig(d.ioc)
+        p.load(ConfigurationList=[
+            {
+                'name': 'cache config',
+                'job': 'otherThing',
+                'exe_env': 'general',
+                'source': 'Google',
+                'logic': {
+                    'Regex': [
+                        {
+                            'field': 'character',
+                            'pattern': '.*Skywalker.*',
+                            'variable': True,
+                            'variable_name': 'name'
+                        }
+                    ],
+                    'Exists': [
+                        {
+                            'field': 'planet'
+                        }
+                    ]
+                }
+            }
+        ])
+        configuration = p.get_config('cache config')
+        source = {'character': 'Luke Skywalker', 'planet': 'Tatooine', 'ignored': 1}
+        d.memoEnabled = True
+        expected = d.detection(source, configuration)
+        self.assertTrue(expected[0])
+        # fields outside of the logical blocks do not change the fingerprint
+        self.assertEqual(d.detection(dict(source, ignored=2), configuration), expected)
+        self.assertEqual(d.get_memo_stats('cache config')['hits'], 1)
+        missing = d.detection(dict(source, planet=None), configuration)
+        self.assertFalse(missing[0])
+        self.assertEqual(
+            d.detectionBatch([source, dict(source, planet=None), {'character': 'Han Solo'}], configuration),
+            [expected, missing, (False, {})]
+        )
+        stats = d.get_memo_stats('cache config')
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['hit_rate'], .5)
+        self.assertEqual(stats['entries'], 3)
+        # expired results are detected again
+        d.memoTTL = -1
+        d.memo = {}
+        d.detection(source, configuration)
+        self.assertEqual(d.detection(source, configuration), expected)
+        self.assertEqual(d.get_memo_stats('cache config')['hits'], 3)
+        p.load(reloadConf=True)
@@ -0,0 +1,78 @@
+from unittest import TestCase
+from tgt_grease.core import GreaseContainer
+from tgt_grease.enterprise.Model import DetectionBackpressure
+
+
+class TestDetectionBackpressure(TestCase):
+
+    def setUp(self):
+        self.ioc = GreaseContainer()
+        # other detection nodes count towards the average so their backlog is set too & restored after
+        self.others = dict(
+            (server['_id'], server.get('backlog')) for server in self.ioc.getCollection('JobServer').find(
+                {'active': True, 'prototypes': 'detect'},
+                projection={'backlog': True}
+            )
+        )
+        self.servers = [
+            self.ioc.getCollection('JobServer').insert_one({
+                'active': True,
+                'prototypes': ['detect'],
+                'jobs': 0,
+                'backlog': 0
+            }).inserted_id
+            for _ in range(2)
+        ]
+        self.backpressure = DetectionBackpressure(self.ioc, shed=100, pause=200, refresh=0, max_delay=2)
+
+    def tearDown(self):
+        self.ioc.getCollection('JobServer').delete_many({'_id': {'$in': self.servers}})
+        for server, backlog in self.others.items():
+            self.ioc.getCollection('JobServer').update_one(
+                {'_id': server},
+                {'$unset': {'backlog': ''}} if backlog is None else {'$set': {'backlog': backlog}}
+            )
+
+    def set_backlog(self, backlog, servers=None):
+        self.ioc.getCollection('JobServer').update_many(
+            {'_id': {'$in': self.servers + list(self.others) if servers is None else servers}},
+            {'$set': {'backlog': backlog}}
+        )
+
+    def test_backlog(self):
+        self.set_backlog(50)
+        self.assertEqual(self.backpressure.backlog(), 50)
+        # cached until refreshed
+        self.backpressure.refresh = 60
+        self.set_backlog(150)
+        self.assertEqual(self.backpressure.backlog(), 50)
+        self.backpressure.refresh = 0
+        self.assertEqual(self.backpressure.backlog(), 150)
+
+    def test_shed_and_pause(self):
+        low, normal, high = {'name': 'low', 'priority': 'low'}, {'name': 'normal'}, {'name': 'high', 'priority': 'high'}
+        self.set_backlog(50)
+        self.assertTrue(all(self.backpressure.allows(conf) for conf in (low, normal, high)))
+        self.assertEqual(self.backpressure.delay(), 0)
+        self.set_backlog(150)
+        self.assertFalse(self.backpressure.allows(low))
+        self.assertTrue(self.backpressure.allows(normal))
+        self.assertTrue(self.backpressure.allows(high))
+        self.assertAlmostEqual(self.backpressure.delay(), 1)
+        self.set_backlog(250)
+        self.assertFalse(self.backpressure.allows(normal))
+        self.assertTrue(self.backpressure.allows(high))
+        self.assertTrue(self.backpressure.paused)
+        self.assertEqual(self.backpressure.delay(), 2)
+        # stays paused until the backlog drains below shed
+        self.set_backlog(150)
+        self.assertFalse(self.backpressure.allows(normal))
+        self.set_backlog(99)
+        self.assertTrue(self.backpressure.allows(normal))
+        self.assertFalse(self.backpressure.paused)
+
+    def test_inactive_servers_ignored(self):
+        self.set_backlog(500)
+        self.ioc.getCollection('JobServer').update_many({'_id': {'$in': self.servers}}, {'$set': {'active': False}})
+        self.set_backlog(0, list(self.others))
+        self.assertEqual(self.backpressure.backlog(), 0)
@@ -98,6 +98,34 @@ class TestKafka(TestCase):
         self.assertFalse(self.ks.consume(self.ioc, self.good_config, pipe2))
         mock_parse.assert_not_called()
 
+    @patch('tgt_grease.enterprise.Model.KafkaSource.sleep')
+    def test_throttle(self, mock_sleep):
+        consumer = MagicMock()
+        backpressure = MagicMock()
+        pipe1, pipe2 = mp.Pipe()
+        # not held back
+        backpressure.allows.return_value = True
+        backpressure.delay.return_value = 0
+        self.assertTrue(self.ks.throttle(self.ioc, self.good_config, consumer, backpressure, pipe2))
+        consumer.pause.assert_not_called()
+        mock_sleep.assert_not_called()
+        # slowed down
+        backpressure.delay.return_value = 2
+        self.assertTrue(self.ks.throttle(self.ioc, self.good_config, consumer, backpressure, pipe2))
+        mock_sleep.assert_called_once_with(2)
+        # paused until the backlog drains
+        backpressure.delay.return_value = 0
+        backpressure.allows.side_effect = [False, False, True]
+        self.assertTrue(self.ks.throttle(self.ioc, self.good_config, consumer, backpressure, pipe2))
+        # the iterated consumer is never polled, which would drop the records it returns
+        consumer.poll.assert_not_called()
+        # killed while paused
+        backpressure.allows.side_effect = None
+        backpressure.allows.return_value = False
+        pipe1.send("STOP")
+        self.assertFalse(self.ks.throttle(self.ioc, self.good_config, consumer, backpressure, pipe2))
+        consumer.poll.assert_not_called()
+
     def test_sleep(self):
         sleep_time = 1.
         now = time.time()
@@ -1306,3 +1306,91 @@ class TestPrototypeConfig(TestCase):
                 self.assertIsNone(os.remove(os.path.join(root, filename)))
         # clear the config
         conf.load(reloadConf=True)
+
+    def test_snapshot_read_only(self):
+        conf = PrototypeConfig()
+        snapshot = conf.load(ConfigurationList=[
+            {
+                "name": "test1",
+                "job": "fakeJob",
+                "exe_env": "windows",
+                "source": "swapi",
+                "logic": {"Regex": [{"field": "character", "pattern": ".*skywalker.*"}]}
+            }
+        ])
+        version = conf.get_version()
+        self.assertEqual(snapshot.version, version)
+        self.assertEqual(conf.get_exe_env('windows'), [conf.get_config('test1')])
+        self.assertEqual(conf.get_exe_env('general'), [])
+        with self.assertRaises(TypeError):
+            snapshot['raw'] = []
+        conf.load(reloadConf=True)
+        self.assertGreater(conf.get_version(), version)
+
+    def test_load_lookup_benchmark_10k(self):
+        conf = PrototypeConfig()
+        configList = []
+        for i in range(10000):
+            configList.append({
+                "name": "benchmark{0}".format(i),
+                "job": "fakeJob",
+                "exe_env": "env{0}".format(i % 10),
+                "source": "source{0}".format(i % 100),
+                "logic": {"Regex": [{"field": "character", "pattern": ".*skywalker.*"}]}
+            })
+        start = time.time()
+        conf.load(ConfigurationList=configList)
+        load_time = time.time() - start
+        start = time.time()
+        for i in range(10000):
+            self.assertTrue(conf.get_config("benchmark{0}".format(i)))
+            self.assertEqual(len(conf.get_source("source{0}".format(i % 100))), 100)
+            self.assertEqual(len(conf.get_exe_env("env{0}".format(i % 10))), 1000)
+        lookup_time = time.time() - start
+        self.assertEqual(len(conf.get_names()), 10000)
+        self.assertEqual(len(conf.get_sources()), 100)
+        # generous bounds; list membership indexing took minutes at this size
+        self.assertLess(load_time, 30)
+        self.assertLess(lookup_time, 5)
+        conf.load(reloadConf=True)
+
+    def test_incremental_reload(self):
+        ioc = GreaseContainer()
+        conf = PrototypeConfig(ioc)
+        path = os.path.join(ioc.getConfig().get('Configuration', 'dir'), 'incremental.config.json')
+        config = {
+            "name": "incremental",
+            "job": "fakeJob",
+            "source": "swapi",
+            "logic": {"Regex": [{"field": "character", "pattern": ".*skywalker.*"}]}
+        }
+        with open(path, 'w') as fil:
+            fil.write(json.dumps(config))
+        conf.load(reloadConf=True)
+        version = conf.get_version()
+        self.assertTrue(conf.get_config('incremental'))
+        # nothing changed so the snapshot is kept
+        conf.load(reloadConf=True)
+        self.assertEqual(conf.get_version(), version)
+        config['job'] = "otherFakeJob"
+        with open(path, 'w') as fil:
+            fil.write(json.dumps(config))
+        conf.load(reloadConf=True)
+        self.assertGreater(conf.get_version(), version)
+        self.assertEqual(conf.get_config('incremental').get('job'), "otherFakeJob")
+        # a rewrite of the same size keeping the modification time is still picked up
+        version = conf.get_version()
+        stat = os.stat(path)
+        config['job'] = "otherFakeBob"
+        with open(path, 'w') as fil:
+            fil.write(json.dumps(config))
+        os.utime(path, (stat.st_atime, stat.st_mtime))
+        self.assertEqual(os.stat(path).st_size, stat.st_size)
+        conf.load(reloadConf=True)
+        self.assertGreater(conf.get_version(), version)
+        self.assertEqual(conf.get_config('incremental').get('job'), "otherFakeBob")
+        version = conf.get_version()
+        os.remove(path)
+        conf.load(reloadConf=True)
+        self.assertGreater(conf.get_version(), version)
+        self.assertFalse(conf.get_config('incremental'))
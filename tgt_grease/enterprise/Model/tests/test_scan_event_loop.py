@@ -0,0 +1,78 @@
+from unittest import TestCase, skipIf
+from tgt_grease.core import GreaseContainer
+from tgt_grease.enterprise.Model import ScanEventLoop, AsyncSourceClass
+import sys
+import threading
+import time
+
+
+class SleepySource(AsyncSourceClass):
+    """Async source waiting `delay` seconds"""
+
+    def parse_source(self, configuration):
+        import asyncio
+        self._data = [{'name': configuration.get('name')}]
+        return asyncio.sleep(configuration.get('delay', .5), result=configuration.get('result', True))
+
+    def mock_data(self, configuration):
+        return []
+
+
+@skipIf(sys.version_info < (3, 5), "async sources require Python 3.5+")
+class TestScanEventLoop(TestCase):
+
+    def setUp(self):
+        self.loop = ScanEventLoop(GreaseContainer(), max_tasks=500, workers=2)
+        self.results = {}
+
+    def tearDown(self):
+        self.loop.stop()
+
+    def record(self, name, result):
+        self.results[name] = result
+
+    def submit(self, name, configuration, time_budget=None):
+        return self.loop.submit(
+            name,
+            'sleepy',
+            SleepySource().parse_source(dict(configuration, name=name)),
+            self.record,
+            (name,),
+            time_budget
+        )
+
+    def test_concurrent_configurations(self):
+        threads = threading.active_count()
+        start = time.time()
+        names = ['config{0}'.format(i) for i in range(400)]
+        for name in names:
+            self.assertTrue(self.submit(name, {'delay': .5}))
+        # the loop & its workers are the only threads added
+        self.assertLessEqual(threading.active_count(), threads + 3)
+        self.assertEqual(self.loop.wait(names), [])
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(len(self.results), 400)
+        self.assertTrue(all(self.results.values()))
+        self.assertEqual(self.loop.running, {})
+
+    def test_limits(self):
+        self.loop.max_tasks = 2
+        self.assertTrue(self.submit('first', {'delay': .3}))
+        # already running
+        self.assertFalse(self.submit('first', {'delay': .3}))
+        self.assertTrue(self.submit('second', {'delay': .3, 'result': False}))
+        self.assertFalse(self.loop.can_submit())
+        self.assertFalse(self.submit('third', {'delay': .3}))
+        self.loop.wait(['first', 'second'])
+        self.assertEqual(self.results, {'first': True, 'second': False})
+        self.assertEqual(sorted(self.loop.reap()), ['first', 'second'])
+        self.assertEqual(self.loop.reap(), [])
+        self.assertTrue(self.loop.can_submit())
+
+    def test_time_budget(self):
+        start = time.time()
+        self.assertTrue(self.submit('slow', {'delay': 30}, time_budget=.2))
+        self.assertEqual(self.loop.wait(['slow']), [])
+        # cancelled configurations are reported as failed parses
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(self.results, {'slow': False})
@@ -0,0 +1,57 @@
+from unittest import TestCase
+from tgt_grease.core import GreaseContainer
+from tgt_grease.enterprise.Model import ScanExecutor
+import threading
+import time
+
+
+class TestScanExecutor(TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def block(self):
+        self.release.wait(10)
+
+    def test_limits(self):
+        executor = ScanExecutor(GreaseContainer(), max_workers=3, source_concurrency=2, source_limits={'sql': 1})
+        self.assertTrue(executor.submit('es1', 'elastic', self.block, ()))
+        self.assertTrue(executor.submit('es2', 'elastic', self.block, ()))
+        # source limit reached
+        self.assertFalse(executor.submit('es3', 'elastic', self.block, ()))
+        self.assertTrue(executor.submit('sql1', 'sql', self.block, ()))
+        # global limit reached
+        self.assertFalse(executor.can_submit('url'))
+        self.assertFalse(executor.submit('sql1', 'sql', self.block, ()))
+        self.assertEqual(executor.active(), 3)
+        self.release.set()
+        self.assertEqual(executor.wait(['es1', 'es2', 'sql1']), [])
+        self.assertEqual(executor.running, {})
+        self.assertEqual(sorted(executor.reap()), ['es1', 'es2', 'sql1'])
+        self.assertEqual(executor.reap(), [])
+        self.assertTrue(executor.can_submit('url'))
+
+    def test_overdue_configuration_frees_worker(self):
+        executor = ScanExecutor(GreaseContainer(), max_workers=1, source_concurrency=1, time_budget=.2)
+        self.assertTrue(executor.submit('slow', 'sql', self.block, ()))
+        self.assertFalse(executor.can_submit('elastic'))
+        start = time.time()
+        # the cycle stops waiting once the budget runs out
+        self.assertEqual(executor.wait(['slow']), ['slow'])
+        self.assertLess(time.time() - start, 5)
+        self.assertIn('slow', executor.overdue)
+        # other sources get the worker while the overdue configuration keeps its source slot
+        self.assertTrue(executor.can_submit('elastic'))
+        self.assertFalse(executor.can_submit('sql'))
+        self.assertTrue(executor.blocked('sql'))
+        self.assertTrue(executor.submit('fast', 'elastic', lambda: None, (), time_budget=5))
+        self.assertEqual(executor.wait(['fast']), [])
+        self.release.set()
+        deadline = time.time() + 5
+        while executor.is_running('slow') and time.time() < deadline:
+            time.sleep(.05)
+        self.assertFalse(executor.is_running('slow'))
+        self.assertEqual(executor.overdue, set())
@@ -0,0 +1,66 @@
+from unittest import TestCase
+from tgt_grease.core import GreaseContainer
+from tgt_grease.enterprise.Model import ScanPartition, ConsistentHashRing
+from bson.objectid import ObjectId
+
+
+class TestScanPartition(TestCase):
+
+    def test_ring_spreads_and_moves_few_keys(self):
+        keys = ["config{0}".format(i) for i in range(1000)]
+        ring = ConsistentHashRing(['a', 'b', 'c'])
+        owners = dict((key, ring.get(key)) for key in keys)
+        for node in ['a', 'b', 'c']:
+            self.assertGreater(list(owners.values()).count(node), 200)
+        # only keys of the removed node move
+        smaller = ConsistentHashRing(['a', 'b'])
+        for key in keys:
+            if owners[key] != 'c':
+                self.assertEqual(smaller.get(key), owners[key])
+        # a joining node only takes keys
+        larger = ConsistentHashRing(['a', 'b', 'c', 'd'])
+        moved = [key for key in keys if larger.get(key) != owners[key]]
+        self.assertTrue(all(larger.get(key) == 'd' for key in moved))
+        self.assertLess(len(moved), 400)
+        self.assertIsNone(ConsistentHashRing().get('config0'))
+
+    def test_partition_owns(self):
+        ioc = GreaseContainer()
+        partition = ScanPartition(ioc, refresh=0)
+        identity = ioc.getConfig().NodeIdentity
+        servers = ioc.getCollection('JobServer')
+        names = ["config{0}".format(i) for i in range(100)]
+        registration = servers.find_one({'_id': ObjectId(identity)})
+        servers.update_one(
+            {'_id': ObjectId(identity)},
+            {'$set': {'active': True, 'jobs': 0}, '$addToSet': {'prototypes': 'scan'}},
+            upsert=True
+        )
+        others = [
+            servers.insert_one({'active': True, 'prototypes': ['scan'], 'jobs': 0}).inserted_id
+            for _ in range(3)
+        ]
+        try:
+            members = partition.members()
+            self.assertIn(identity, members)
+            self.assertEqual(len(members), len(set(members)))
+            owned = [name for name in names if partition.owns({'name': name})]
+            self.assertGreater(len(owned), 0)
+            self.assertLess(len(owned), 100)
+            # a node deactivated by the monitor but still running scans nothing
+            servers.update_one({'_id': ObjectId(identity)}, {'$set': {'active': False}})
+            self.assertFalse(any(partition.owns({'name': name}) for name in names))
+            # deactivated nodes hand their configurations back
+            servers.update_one({'_id': ObjectId(identity)}, {'$set': {'active': True}})
+            servers.update_many({'_id': {'$in': others}}, {'$set': {'active': False}})
+            self.assertTrue(all(partition.owns({'name': name}) for name in names))
+            # without active scan nodes every configuration is owned
+            servers.update_one({'_id': ObjectId(identity)}, {'$set': {'active': False}})
+            self.assertEqual(partition.members(), ())
+            self.assertTrue(all(partition.owns({'name': name}) for name in names))
+        finally:
+            servers.delete_many({'_id': {'$in': others}})
+            if registration:
+                servers.replace_one({'_id': ObjectId(identity)}, registration)
+            else:
+                servers.delete_one({'_id': ObjectId(identity)})
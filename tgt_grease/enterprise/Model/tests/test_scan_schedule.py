@@ -0,0 +1,85 @@
+from unittest import TestCase
+from tgt_grease.core import GreaseContainer
+from tgt_grease.enterprise.Model import ScanSchedule
+from tgt_grease.enterprise.Model.ScanSchedule import parse_cron, next_due, configuration_spec
+import datetime
+
+
+class TestScanSchedule(TestCase):
+
+    def test_parse_cron(self):
+        minutes, hours, days, months, weekdays, daysRestricted, weekdaysRestricted = parse_cron('*/15 9-17 * 1,6 7')
+        self.assertEqual(minutes, {0, 15, 30, 45})
+        self.assertEqual(hours, set(range(9, 18)))
+        self.assertEqual(days, set(range(1, 32)))
+        self.assertEqual(months, {1, 6})
+        self.assertEqual(weekdays, {0, 7})
+        self.assertFalse(daysRestricted)
+        self.assertTrue(weekdaysRestricted)
+        self.assertRaises(ValueError, parse_cron, '* * * *')
+        self.assertRaises(ValueError, parse_cron, '60 * * * *')
+        self.assertRaises(ValueError, parse_cron, 'a * * * *')
+
+    def test_next_due(self):
+        start = datetime.datetime(2018, 1, 31, 23, 59, 30)
+        self.assertEqual(next_due(parse_cron('* * * * *'), start), datetime.datetime(2018, 2, 1, 0, 0))
+        self.assertEqual(next_due(parse_cron('30 16 * * *'), start), datetime.datetime(2018, 2, 1, 16, 30))
+        # 2018-02-04 was a Sunday
+        self.assertEqual(next_due(parse_cron('0 0 * * 0'), start), datetime.datetime(2018, 2, 4, 0, 0))
+        # either day of month or day of week
+        self.assertEqual(next_due(parse_cron('0 0 15 * 0'), start), datetime.datetime(2018, 2, 4, 0, 0))
+        self.assertEqual(next_due(parse_cron('0 0 29 2 *'), start), datetime.datetime(2020, 2, 29, 0, 0))
+        self.assertIsNone(next_due(parse_cron('0 0 30 2 *'), start))
+
+    def test_configuration_spec(self):
+        self.assertEqual(configuration_spec({'schedule': '*/5 * * * *', 'minute': 30}), '*/5 * * * *')
+        self.assertEqual(configuration_spec({'hour': 16, 'minute': 30}), '30 16 * * *')
+        self.assertEqual(configuration_spec({'minute': 30}), '30 * * * *')
+        self.assertEqual(configuration_spec({'hour': 16}), '* 16 * * *')
+        self.assertIsNone(configuration_spec({'name': 'always'}))
+
+    def test_due_and_sleep(self):
+        schedule = ScanSchedule(GreaseContainer())
+        now = datetime.datetime(2018, 1, 1, 16, 29, 10)
+        schedule.load([
+            {'name': 'hourly', 'minute': 30},
+            {'name': 'daily', 'hour': 16, 'minute': 29},
+            {'name': 'broken', 'schedule': 'every day'}
+        ], now)
+        self.assertNotIn('broken', schedule.entries)
+        self.assertEqual(schedule.due(now), ['daily'])
+        # due until started
+        self.assertEqual(schedule.sleep_time(now), 0)
+        self.assertEqual(schedule.due(now), ['daily'])
+        self.assertEqual(schedule.started('daily', now), datetime.datetime(2018, 1, 2, 16, 29))
+        self.assertIsNone(schedule.started('daily', now))
+        self.assertEqual(schedule.sleep_time(now), 50)
+        self.assertEqual(schedule.due(now), [])
+        now += datetime.timedelta(minutes=1)
+        self.assertEqual(schedule.due(now), ['hourly'])
+        schedule.started('hourly', now)
+        self.assertEqual(schedule.entries['hourly'][1], datetime.datetime(2018, 1, 1, 17, 30))
+        # unchanged specs keep their due time on reload
+        schedule.load([{'name': 'hourly', 'minute': 30}, {'name': 'always'}], now)
+        self.assertEqual(schedule.entries['hourly'][1], datetime.datetime(2018, 1, 1, 17, 30))
+        self.assertEqual(schedule.due(now), ['always'])
+        self.assertEqual(schedule.sleep_time(now), 0)
+
+    def test_held_configuration_stays_due(self):
+        schedule = ScanSchedule(GreaseContainer())
+        now = datetime.datetime(2018, 1, 1, 16, 29, 10)
+        schedule.load([{'name': 'hourly', 'minute': 29}, {'name': 'daily', 'hour': 16, 'minute': 29}], now)
+        self.assertEqual(schedule.due(now), ['daily', 'hourly'])
+        schedule.started('daily', now)
+        # hourly was held back; it is still due long after its slot, once
+        now += datetime.timedelta(minutes=45)
+        self.assertEqual(schedule.due(now), ['hourly'])
+        schedule.load([{'name': 'hourly', 'minute': 29}, {'name': 'daily', 'hour': 16, 'minute': 29}], now)
+        self.assertEqual(schedule.due(now), ['hourly'])
+        self.assertEqual(schedule.started('hourly', now), datetime.datetime(2018, 1, 1, 17, 29))
+        self.assertEqual(schedule.due(now), [])
+        # a changed spec drops the missed run
+        now += datetime.timedelta(hours=1)
+        self.assertEqual(schedule.due(now), ['hourly'])
+        schedule.load([{'name': 'hourly', 'minute': 59}], now)
+        self.assertEqual(schedule.due(now), [])
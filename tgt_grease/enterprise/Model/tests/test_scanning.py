@@ -1,10 +1,11 @@
 from unittest import TestCase
 from tgt_grease.core import GreaseContainer, Configuration
 from tgt_grease.enterprise.Model import Scan, PrototypeConfig, BaseSourceClass
-from datetime import datetime
+from datetime import datetime, timedelta
 from bson.objectid import ObjectId
 import json
 import platform
+import threading
 import time
 import uuid
 
@@ -196,6 +197,124 @@ class TestSource(BaseSourceClass):
         ]
 
 
+class CheckpointSource(BaseSourceClass):
+    """Source reading only rows above its checkpoint"""
+
+    rows = [{'id': str(i), 'name': str(uuid.uuid4())} for i in range(1, 6)]
+
+    def parse_source(self, configuration):
+        checkpoint = self.get_checkpoint(GreaseContainer(), configuration) or ''
+        self._data = [row for row in self.rows if row['id'] > checkpoint]
+        for row in self._data:
+            self.track_checkpoint(row['id'])
+        return True
+
+    def mock_data(self, configuration):
+        return []
+
+
+class ResponseCheckpointSource(CheckpointSource):
+    """Source tracking its checkpoint but returning data the scan engine can not schedule"""
+
+    def parse_source(self, configuration):
+        super(ResponseCheckpointSource, self).parse_source(configuration)
+        self._data = {'hits': self._data}
+        return True
+
+
+class StreamingSource(CheckpointSource):
+    """Source yielding its rows in chunks"""
+
+    def streams(self, configuration):
+        return True
+
+    def iter_data(self, configuration, chunk_size=1000):
+        checkpoint = self.get_checkpoint(GreaseContainer(), configuration) or ''
+        rows = [row for row in self.rows if row['id'] > checkpoint]
+        for start in range(0, len(rows), chunk_size):
+            for row in rows[start:start + chunk_size]:
+                self.track_checkpoint(row['id'])
+            yield rows[start:start + chunk_size]
+
+
+class FailingScheduling(object):
+
+    def scheduleDetection(self, source, configName, data):
+        return False
+
+
+class CountingScheduling(object):
+
+    def __init__(self, failAfter=None):
+        self.chunks = []
+        self.failAfter = failAfter
+
+    def scheduleDetection(self, source, configName, data):
+        self.chunks.append(len(data))
+        return self.failAfter is None or len(self.chunks) <= self.failAfter
+
+
+class BlockingSource(BaseSourceClass):
+    """Source recording its parses; configurations with `block` parse until released"""
+
+    parsed = []
+    release = threading.Event()
+
+    def parse_source(self, configuration):
+        self.parsed.append(configuration.get('name'))
+        if configuration.get('block'):
+            self.release.wait(10)
+        return False
+
+    def mock_data(self, configuration):
+        return []
+
+
+class GateSource(BaseSourceClass):
+    """Source recording if its configurations were due when parsed"""
+
+    parsed = []
+
+    def parse_source(self, configuration):
+        self.parsed.append((configuration.get('name'), self.is_due(configuration)))
+        return False
+
+    def mock_data(self, configuration):
+        return []
+
+
+class GateSourceLoader(object):
+
+    def load(self, className):
+        return GateSource()
+
+
+class SwitchedBackpressure(object):
+    """Backpressure shedding every configuration while `behind`"""
+
+    behind = False
+
+    def allows(self, configuration):
+        return not self.behind
+
+    def backlog(self):
+        return 10000 if self.behind else 0
+
+
+class BlockingSourceLoader(object):
+
+    def load(self, className):
+        return BlockingSource()
+
+
+class ServerScheduling(CountingScheduling):
+
+    online = True
+
+    def determineExecutionServer(self, role):
+        return ("server", 0) if self.online else (None, 0)
+
+
 class TestScan(TestCase):
 
     def test_scan(self):
@@ -252,7 +371,7 @@ class TestScan(TestCase):
         conf.load(reloadConf=True, ConfigurationList=configList)
         scanner = Scan(ioc)
         # Scan Environment
-        self.assertTrue(scanner.Parse())
+        self.assertTrue(scanner.Parse(wait=True))
         # Begin ensuring environment is how we expect
         # we assert less or equal because sometimes uuid's are close :p
         self.assertLessEqual(ioc.getCollection('SourceData').find({
@@ -290,6 +409,225 @@ class TestScan(TestCase):
         ioc.getConfig().set('verbose', False, 'Logging')
         Configuration.ReloadConfig()
 
+    def test_parse_does_not_block(self):
+        ioc = GreaseContainer()
+        conf = PrototypeConfig(ioc)
+        conf.load(reloadConf=True, ConfigurationList=[
+            {
+                "name": name,
+                "job": "fakeJob",
+                "exe_env": "general",
+                "source": "BlockingSource",
+                "block": name == 'straggler',
+                "logic": {"Exists": [{"field": "character"}]}
+            } for name in ('straggler', 'quick')
+        ])
+        scanner = Scan(ioc)
+        scanner.impTool = BlockingSourceLoader()
+        scanner.scheduler = ServerScheduling()
+        del BlockingSource.parsed[:]
+        BlockingSource.release.clear()
+        try:
+            start = time.time()
+            self.assertTrue(scanner.Parse())
+            self.assertLess(time.time() - start, 5)
+            self.assertTrue(scanner.executor.is_running('straggler'))
+            deadline = time.time() + 5
+            while scanner.executor.is_running('quick') and time.time() < deadline:
+                time.sleep(.05)
+            # the finished configuration is reaped & parsed again while the straggler keeps running
+            self.assertTrue(scanner.Parse())
+            deadline = time.time() + 5
+            while BlockingSource.parsed.count('quick') < 2 and time.time() < deadline:
+                time.sleep(.05)
+            self.assertEqual(BlockingSource.parsed.count('quick'), 2)
+            self.assertEqual(BlockingSource.parsed.count('straggler'), 1)
+        finally:
+            BlockingSource.release.set()
+        deadline = time.time() + 5
+        while scanner.executor.is_running('straggler') and time.time() < deadline:
+            time.sleep(.05)
+        self.assertTrue(scanner.Parse(wait=True))
+        self.assertEqual(scanner.executor.running, {})
+        self.assertEqual(BlockingSource.parsed.count('straggler'), 2)
+        conf.load(reloadConf=True)
+
+    def test_held_scheduled_configuration_runs_next_scan(self):
+        ioc = GreaseContainer()
+        conf = PrototypeConfig(ioc)
+        conf.load(reloadConf=True, ConfigurationList=[{
+            "name": "every minute",
+            "job": "fakeJob",
+            "exe_env": "general",
+            "source": "BlockingSource",
+            "schedule": "* * * * *",
+            "logic": {"Exists": [{"field": "character"}]}
+        }])
+        scanner = Scan(ioc)
+        scanner.impTool = BlockingSourceLoader()
+        scanner.scheduler = ServerScheduling()
+        scanner.tick = 0
+        scanner.maxSleep = 0
+        del BlockingSource.parsed[:]
+        # execution environment offline so the configuration is held back & stays due
+        scanner.scheduler.online = False
+        self.assertTrue(scanner.ParseScheduled())
+        self.assertEqual(scanner.held, {'every minute': 'offline'})
+        self.assertIn('every minute', scanner.schedule.waiting)
+        scanner.scheduler.online = True
+        self.assertTrue(scanner.ParseScheduled())
+        self.assertEqual(scanner.held, {})
+        self.assertNotIn('every minute', scanner.schedule.waiting)
+        deadline = time.time() + 5
+        while not BlockingSource.parsed and time.time() < deadline:
+            time.sleep(.05)
+        self.assertEqual(BlockingSource.parsed, ['every minute'])
+        conf.load(reloadConf=True)
+
+    def test_held_minute_configuration_runs_in_later_minute(self):
+        ioc = GreaseContainer()
+        conf = PrototypeConfig(ioc)
+        earlier = datetime.utcnow() - timedelta(minutes=1)
+        if not earlier.minute:
+            # a minute of 0 is ignored like any falsy minute
+            earlier -= timedelta(minutes=1)
+        configuration = {
+            "name": "late minute",
+            "job": "fakeJob",
+            "exe_env": "general",
+            "source": "GateSource",
+            "minute": earlier.minute,
+            "logic": {"Exists": [{"field": "character"}]}
+        }
+        conf.load(reloadConf=True, ConfigurationList=[configuration])
+        scanner = Scan(ioc)
+        scanner.impTool = GateSourceLoader()
+        scanner.scheduler = ServerScheduling()
+        scanner.tick = 0
+        scanner.maxSleep = 0
+        del GateSource.parsed[:]
+        # the configuration came due last minute & was held back since
+        scanner.schedule.load([configuration], now=earlier)
+        partition = ioc.getConfig().get('Sourcing', 'partition', True)
+        scanner.scheduleKey = (scanner.conf.get_version(), None, None, scanner.partition.members() if partition else None)
+        scanner.scheduler.online = False
+        self.assertTrue(scanner.ParseScheduled())
+        self.assertEqual(scanner.held, {'late minute': 'offline'})
+        scanner.scheduler.online = True
+        self.assertTrue(scanner.ParseScheduled())
+        deadline = time.time() + 5
+        while not GateSource.parsed and time.time() < deadline:
+            time.sleep(.05)
+        # started a minute late, the source still parses it
+        self.assertEqual(GateSource.parsed, [('late minute', True)])
+        self.assertNotIn('late minute', scanner.schedule.waiting)
+        # outside the schedule the source checks the minute itself
+        self.assertFalse(GateSource().is_due(configuration))
+        conf.load(reloadConf=True)
+
+    def test_shed_scheduled_configuration_runs_once_detection_catches_up(self):
+        ioc = GreaseContainer()
+        conf = PrototypeConfig(ioc)
+        conf.load(reloadConf=True, ConfigurationList=[{
+            "name": "shed every minute",
+            "job": "fakeJob",
+            "exe_env": "general",
+            "source": "BlockingSource",
+            "schedule": "* * * * *",
+            "priority": "low",
+            "logic": {"Exists": [{"field": "character"}]}
+        }])
+        scanner = Scan(ioc)
+        scanner.impTool = BlockingSourceLoader()
+        scanner.scheduler = ServerScheduling()
+        scanner.backpressure = SwitchedBackpressure()
+        scanner.tick = 0
+        scanner.maxSleep = 0
+        del BlockingSource.parsed[:]
+        scanner.backpressure.behind = True
+        for _ in range(3):
+            self.assertTrue(scanner.ParseScheduled())
+        self.assertEqual(scanner.held, {'shed every minute': 'backpressure'})
+        self.assertIn('shed every minute', scanner.schedule.waiting)
+        self.assertEqual(BlockingSource.parsed, [])
+        scanner.backpressure.behind = False
+        self.assertTrue(scanner.ParseScheduled())
+        self.assertNotIn('shed every minute', scanner.schedule.waiting)
+        deadline = time.time() + 5
+        while not BlockingSource.parsed and time.time() < deadline:
+            time.sleep(.05)
+        self.assertEqual(BlockingSource.parsed, ['shed every minute'])
+        conf.load(reloadConf=True)
+
+    def test_checkpoint_after_scheduling(self):
+        ioc = GreaseContainer()
+        scanner = Scan(ioc)
+        configuration = {'name': 'checkpoint test', 'source': 'checkpoint_source', 'checkpoint': 'id'}
+        checkpoints = ioc.getCollection('SourceCheckpoints')
+        # scheduling failed so the watermark does not move
+        Scan.ParseSource(ioc, CheckpointSource(), configuration, scanner.dedup, FailingScheduling())
+        self.assertIsNone(checkpoints.find_one({'configuration': 'checkpoint test'}))
+        Scan.ParseSource(ioc, CheckpointSource(), configuration, scanner.dedup, scanner.scheduler)
+        self.assertEqual(checkpoints.find_one({'configuration': 'checkpoint test'}).get('value'), '5')
+        source = CheckpointSource()
+        self.assertTrue(source.parse_source(configuration))
+        self.assertEqual(source.get_data(), [])
+        checkpoints.delete_many({'configuration': 'checkpoint test'})
+        ioc.getCollection('SourceData').delete_many({'configuration': 'checkpoint test'})
+        ioc.getCollection('Dedup_Sourcing').drop()
+
+    def test_checkpoint_unscheduled_data(self):
+        ioc = GreaseContainer()
+        scanner = Scan(ioc)
+        configuration = {'name': 'checkpoint response test', 'source': 'checkpoint_source', 'checkpoint': 'id'}
+        scheduling = CountingScheduling()
+        # data that is not a list is never scheduled so the watermark does not move
+        Scan.ParseSource(ioc, ResponseCheckpointSource(), configuration, scanner.dedup, scheduling)
+        self.assertEqual(scheduling.chunks, [])
+        self.assertIsNone(ioc.getCollection('SourceCheckpoints').find_one({'configuration': 'checkpoint response test'}))
+
+    def test_stream_scheduling(self):
+        ioc = GreaseContainer()
+        scanner = Scan(ioc)
+        checkpoints = ioc.getCollection('SourceCheckpoints')
+        configuration = {'name': 'stream test', 'source': 'streaming_source', 'checkpoint': 'id', 'chunk_size': 2}
+        # the second chunk failed to schedule so the watermark does not move
+        scheduling = CountingScheduling(failAfter=1)
+        Scan.ParseSource(ioc, StreamingSource(), configuration, scanner.dedup, scheduling)
+        self.assertEqual(scheduling.chunks, [2, 2])
+        self.assertIsNone(checkpoints.find_one({'configuration': 'stream test'}))
+        configuration['name'] = 'stream test complete'
+        scheduling = CountingScheduling()
+        Scan.ParseSource(ioc, StreamingSource(), configuration, scanner.dedup, scheduling)
+        self.assertEqual(scheduling.chunks, [2, 2, 1])
+        self.assertEqual(checkpoints.find_one({'configuration': 'stream test complete'}).get('value'), '5')
+        # legacy sources stream through parse_source
+        source = CheckpointSource()
+        self.assertFalse(source.streams(configuration))
+        self.assertEqual([len(chunk) for chunk in source.iter_data({'name': 'stream test legacy'}, 2)], [2, 2, 1])
+        checkpoints.delete_many({'configuration': {'$in': ['stream test', 'stream test complete']}})
+        ioc.getCollection('Dedup_Sourcing').drop()
+
+    def test_merge_streams(self):
+        merged = BaseSourceClass.merge_streams(
+            [lambda: range(0, 500), lambda: range(500, 1000), lambda: iter([])],
+            batchSize=30,
+            buffer=1
+        )
+        self.assertEqual(sorted(merged), list(range(1000)))
+
+        def failing():
+            yield 1
+            raise ValueError("stream failed")
+
+        with self.assertRaises(ValueError):
+            list(BaseSourceClass.merge_streams([lambda: range(100), failing], batchSize=1))
+        # closing early stops the readers
+        merged = BaseSourceClass.merge_streams([lambda: range(100000)] * 3, batchSize=10, buffer=1)
+        next(merged)
+        merged.close()
+        self.assertFalse([thread for thread in threading.enumerate() if thread.name.startswith("GREASE SOURCE STREAM")])
+
     def test_config_load_empty(self):
         scan = Scan()
         confs = scan.generate_config_set()
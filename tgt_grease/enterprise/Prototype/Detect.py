@@ -40,6 +40,17 @@ class Detection(Command):
             # set foreground if in context
             self.ioc.getLogger().foreground = True
         Detector = Detect(self.ioc)
+        workers = int(self.ioc.getConfig().get('NodeInformation', 'DetectionWorkers', 1))
+        if workers > 1:
+            # detect in worker processes
+            result = Detector.runWorkers(
+                workers,
+                int(self.ioc.getConfig().get('NodeInformation', 'DetectionBatchSize', 100)),
+                int(context.get('loop')) if 'loop' in context else None
+            )
+            if context.get('foreground'):
+                self.ioc.getLogger().foreground = False
+            return result
         if 'loop' in context:
             # scan only a certain amount of times
             scan_count = 0
@@ -57,12 +57,14 @@ class Scanner(Command):
             # scan only a certain amount of times
             scan_count = 0
             while scan_count < int(context.get('loop')):
-                scanner.Parse(**args)
+                # every configuration is parsed once per loop
+                scanner.Parse(wait=True, **args)
                 scan_count += 1
         else:
             try:
                 while True:
-                    scanner.Parse(**args)
+                    # only due configurations are parsed; sleeps until the next is due
+                    scanner.ParseScheduled(**args)
             except KeyboardInterrupt:
                 # graceful close for scanning
                 self.ioc.getLogger().trace("Keyboard interrupt in scanner detected", trace=True)
@@ -1,10 +1,15 @@
 from tgt_grease.enterprise.Model import BaseSourceClass
-from tgt_grease.core import Configuration
-import elasticsearch
+from tgt_grease.core import Configuration, GreaseContainer
 import os
 import fnmatch
-import datetime
+from functools import partial
 import json
+import threading
+import time
+
+# server -> [client, last used, users]; clients are shared by every ElasticSource in the process
+GREASE_ELASTIC_CLIENTS = {}
+GREASE_ELASTIC_CLIENTS_LOCK = threading.Lock()
 
 
 class ElasticSource(BaseSourceClass):
@@ -20,10 +25,16 @@ class ElasticSource(BaseSourceClass):
             'source': 'elastic_source', # <-- This source
             'server': 'http://localhost:9200', # <-- String for ES Connection to occur
             'index': 'my_fake_index', # <-- Index to query within ES
-            'doc_type': 'myData' # <-- Document type to query for in ES
             'query': {}, # <-- Dict of ElasticSearch Query
             'hour': 16, # <-- **OPTIONAL** 24hr time hour to poll SQL
             'minute': 30, # <-- **OPTIONAL** Minute to poll SQL
+            'stream': 'search_after', # <-- **OPTIONAL** Page through every hit with `search_after` or `scroll`
+            'page_size': 1000, # <-- **OPTIONAL** Hits per page when streaming
+            'sort': [{'@timestamp': 'asc'}], # <-- **OPTIONAL** Sort for `search_after`; must end in a unique field
+            'slices': 4, # <-- **OPTIONAL** Sliced scrolls read in parallel when streaming with `scroll`
+            'max_hits': 10000, # <-- **OPTIONAL** Maximum hits kept when streaming
+            'chunk_size': 1000, # <-- **OPTIONAL** Hits deduplicated & scheduled at a time when streaming
+            'checkpoint': '@timestamp', # <-- **OPTIONAL** Field; only hits from its value at the last scan on are read
             'logic': {} # <-- Whatever logic your heart desires
         }
 
@@ -33,9 +44,23 @@ class ElasticSource(BaseSourceClass):
         **Hour and minute parameters are in UTC time**
     Note:
         To only poll once an hour only set the **minute** field
+    Note:
+        Without `stream` the `_source` of the hits of a single search is the source data, limited to the query's
+        page size. With `stream` the `_source` of every hit is the source data, read a page at a time. The scan
+        engine deduplicates & schedules streamed hits `chunk_size` at a time; `max_hits` limits the hits read, or kept
+        by `parse_source`
+    Note:
+        Requires the ElasticSearch 8 client or newer. Mapping types were removed from ElasticSearch so the
+        `doc_type` of older configurations is ignored
+    Note:
+        With `checkpoint` & `max_hits` stream with `search_after`, which sorts by the checkpoint field by default, so
+        hits past `max_hits` are read by the next scan, even those sharing the last hit's checkpoint value
 
     """
 
+    # pages buffered between sliced scroll threads & the consumer
+    scroll_buffer = 4
+
     def parse_source(self, configuration):
         """This will make a ElasticSearch connection & query to the configured server
 
@@ -46,45 +71,344 @@ class ElasticSource(BaseSourceClass):
             bool: If True data will be scheduled for ingestion after deduplication. If False the engine will bail out
 
         """
-        if configuration.get('hour'):
-            if datetime.datetime.utcnow().hour != int(configuration.get('hour')):
-                # it is not the correct hour
-                return True
-        if configuration.get('minute'):
-            if datetime.datetime.utcnow().minute != int(configuration.get('minute')):
-                # it is not the correct hour
-                return True
+        if not self.is_due(configuration):
+            # it is not the correct hour or minute
+            return True
         if configuration.get('server') \
                 and configuration.get('query') \
-                and configuration.get('index') \
-                and configuration.get('doc_type'):
+                and configuration.get('index'):
+            import elasticsearch
+            server = "".join(configuration.get('server'))
             try:
-                es = elasticsearch.Elasticsearch(
-                    "".join(configuration.get('server')),
-                    timeout=30,
-                    max_retries=2,
-                    retry_on_timeout=True
-                )
-            except BaseException:
+                es = self.get_client(server)
+            except BaseException as e:
                 # Failed to connect to ES
-                return False
-            try:
-                self._data = es.search(
-                    index=''.join(configuration.get('index')),
-                    doc_type=''.join(configuration.get('doc_type')),
-                    body=configuration.get('query')
+                GreaseContainer().getLogger().error(
+                    "Failed to create ElasticSearch client for [{0}]: [{1}]".format(server, e),
+                    notify=False
                 )
-            except elasticsearch.ImproperlyConfigured:
-                # Improperly configured request
                 return False
-            except elasticsearch.ElasticsearchException:
-                # generic exception
+            try:
+                field = configuration.get('checkpoint')
+                if field:
+                    checkpoint = self.load_checkpoint(GreaseContainer(), configuration)
+                    configuration = dict(configuration, query=self.checkpoint_query(configuration, checkpoint))
+                if configuration.get('stream'):
+                    self._data = []
+                    maxHits = int(configuration.get('max_hits', 10000))
+                    for hit in self.iter_hits(es, configuration):
+                        if len(self._data) >= maxHits:
+                            break
+                        if field and not self.track_checkpoint(hit.get(field), hit):
+                            # read by the last scan
+                            continue
+                        self._data.append(hit)
+                else:
+                    response = self._body(es.search(
+                        index=''.join(configuration.get('index')),
+                        body=configuration.get('query')
+                    ))
+                    self._data = [hit.get('_source', {}) for hit in response.get('hits', {}).get('hits', [])]
+                    if field:
+                        self._data = [hit for hit in self._data if self.track_checkpoint(hit.get(field), hit)]
+            except (elasticsearch.ApiError, elasticsearch.TransportError):
+                # failed request or connection
                 return False
-            del es
+            finally:
+                self.release_client(server)
+            return True
         else:
             # Invalid parameters
             return False
 
+    def streams(self, configuration):
+        """Streamed configurations are scheduled by the scan engine a chunk of hits at a time
+
+        Args:
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+
+        Returns:
+            bool: If the configuration is streamed
+
+        """
+        return bool(configuration.get('stream'))
+
+    def iter_data(self, configuration, chunk_size=1000):
+        """Streams the `_source` of every hit in chunks, tracking the checkpoint field as they are read
+
+        Only `max_hits` hits are read if set; otherwise every hit is since only a chunk is held at a time
+
+        Args:
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+            chunk_size (int): Maximum hits per chunk
+
+        Returns:
+            generator: Chunks of hits as list[dict]
+
+        Raises:
+            ValueError: If the configuration is missing its server, query or index
+
+        """
+        if not self.is_due(configuration):
+            # it is not the correct hour or minute
+            return
+        if not configuration.get('server') \
+                or not configuration.get('query') \
+                or not configuration.get('index'):
+            raise ValueError("Configuration [{0}] is missing its server, query or index".format(
+                configuration.get('name')
+            ))
+        server = "".join(configuration.get('server'))
+        es = self.get_client(server)
+        try:
+            field = configuration.get('checkpoint')
+            if field:
+                configuration = dict(
+                    configuration,
+                    query=self.checkpoint_query(configuration, self.load_checkpoint(GreaseContainer(), configuration))
+                )
+            maxHits = int(configuration.get('max_hits') or 0)
+            read = 0
+            chunk = []
+            for hit in self.iter_hits(es, configuration):
+                if maxHits and read >= maxHits:
+                    break
+                if field and not self.track_checkpoint(hit.get(field), hit):
+                    # read by the last scan
+                    continue
+                chunk.append(hit)
+                read += 1
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            self.release_client(server)
+
+    @staticmethod
+    def get_client(server):
+        """Gets the shared client of a server, creating it if needed
+
+        Clients are kept per server string with a connection pool of `Sourcing.elastic_pool_size`. Clients unused for
+        `Sourcing.elastic_idle` seconds are closed. Every call must be followed by `release_client`
+
+        Args:
+            server (str): ElasticSearch server connection string
+
+        Returns:
+            elasticsearch.Elasticsearch: Client for the server
+
+        """
+        global GREASE_ELASTIC_CLIENTS
+        import elasticsearch
+        now = time.time()
+        idle = float(Configuration.get('Sourcing', 'elastic_idle', 300))
+        with GREASE_ELASTIC_CLIENTS_LOCK:
+            for key, (client, used, users) in list(GREASE_ELASTIC_CLIENTS.items()):
+                if key != server and not users and now - used > idle:
+                    del GREASE_ELASTIC_CLIENTS[key]
+                    try:
+                        client.transport.close()
+                    except BaseException:
+                        # connections are dropped with the client
+                        pass
+            entry = GREASE_ELASTIC_CLIENTS.get(server)
+            if not entry:
+                entry = [
+                    elasticsearch.Elasticsearch(
+                        server,
+                        request_timeout=30,
+                        max_retries=2,
+                        retry_on_timeout=True,
+                        connections_per_node=int(Configuration.get('Sourcing', 'elastic_pool_size', 10))
+                    ),
+                    now,
+                    0
+                ]
+                GREASE_ELASTIC_CLIENTS[server] = entry
+            entry[1] = now
+            entry[2] += 1
+            return entry[0]
+
+    @staticmethod
+    def release_client(server):
+        """Releases a client from `get_client` so it can be evicted once idle
+
+        Args:
+            server (str): ElasticSearch server connection string
+
+        Returns:
+            None: Void Method to release the client
+
+        """
+        global GREASE_ELASTIC_CLIENTS
+        with GREASE_ELASTIC_CLIENTS_LOCK:
+            entry = GREASE_ELASTIC_CLIENTS.get(server)
+            if entry:
+                entry[1] = time.time()
+                entry[2] = max(entry[2] - 1, 0)
+
+    @staticmethod
+    def checkpoint_query(configuration, checkpoint):
+        """Limits a configuration's query to hits at or above its watermark
+
+        Hits at the watermark are read again so a run of equal values cut by `max_hits` is finished; the ones the last
+        scan read are skipped by `track_checkpoint`
+
+        Args:
+            configuration (dict): Configuration of Source
+            checkpoint (object): Committed watermark; None to read every hit
+
+        Returns:
+            dict: Query body
+
+        """
+        body = dict(configuration.get('query') or {})
+        field = configuration.get('checkpoint')
+        if not configuration.get('sort') and 'sort' not in body:
+            body['sort'] = [{field: 'asc'}, {'_doc': 'asc'}]
+        if checkpoint is not None:
+            body['query'] = {
+                'bool': {
+                    'must': [body.get('query') or {'match_all': {}}],
+                    'filter': [{'range': {field: {'gte': checkpoint}}}]
+                }
+            }
+        return body
+
+    def iter_hits(self, es, configuration):
+        """Streams the `_source` of every hit of a configuration's query a page at a time
+
+        Args:
+            es (elasticsearch.Elasticsearch): Client to query with
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+
+        Returns:
+            generator: `_source` of each hit
+
+        """
+        if configuration.get('stream') == 'scroll':
+            slices = int(configuration.get('slices', 1))
+            if slices > 1:
+                return self._iter_sliced_scroll(es, configuration, slices)
+            return self._iter_scroll(es, configuration)
+        return self._iter_search_after(es, configuration)
+
+    @staticmethod
+    def _search_args(configuration, body):
+        """Builds search arguments for a page of a configuration's query
+
+        Args:
+            configuration (dict): Configuration of Source
+            body (dict): Keys to set on the query
+
+        Returns:
+            dict: Keyword arguments for `Elasticsearch.search`
+
+        """
+        query = dict(configuration.get('query') or {})
+        query.update(body)
+        return {
+            'index': ''.join(configuration.get('index')),
+            'body': query
+        }
+
+    @staticmethod
+    def _body(response):
+        """Gets the body of a response of the client
+
+        Args:
+            response (elastic_transport.ObjectApiResponse): Response of a search or scroll
+
+        Returns:
+            dict: Decoded response body
+
+        """
+        return getattr(response, 'body', response)
+
+    def _iter_search_after(self, es, configuration):
+        """Pages through a query with `search_after`
+
+        Args:
+            es (elasticsearch.Elasticsearch): Client to query with
+            configuration (dict): Configuration of Source
+
+        Returns:
+            generator: `_source` of each hit
+
+        """
+        body = {
+            'size': int(configuration.get('page_size', 1000)),
+            'sort': configuration.get('sort') or (configuration.get('query') or {}).get('sort') or ['_doc']
+        }
+        while True:
+            hits = self._body(es.search(**self._search_args(configuration, body))).get('hits', {}).get('hits', [])
+            for hit in hits:
+                yield hit.get('_source', {})
+            if len(hits) < body['size'] or not hits[-1].get('sort'):
+                return
+            body['search_after'] = hits[-1].get('sort')
+
+    def _iter_scroll(self, es, configuration, sliceId=None, slices=None):
+        """Pages through a query with a scroll, clearing it once done
+
+        Args:
+            es (elasticsearch.Elasticsearch): Client to query with
+            configuration (dict): Configuration of Source
+            sliceId (int): Slice of a sliced scroll to read
+            slices (int): Total slices of a sliced scroll
+
+        Returns:
+            generator: `_source` of each hit
+
+        """
+        keepAlive = configuration.get('scroll', '1m')
+        body = {'size': int(configuration.get('page_size', 1000))}
+        if slices:
+            body['slice'] = {'id': sliceId, 'max': slices}
+        args = self._search_args(configuration, body)
+        args['scroll'] = keepAlive
+        response = self._body(es.search(**args))
+        scrollId = response.get('_scroll_id')
+        try:
+            while True:
+                hits = response.get('hits', {}).get('hits', [])
+                if not hits:
+                    return
+                for hit in hits:
+                    yield hit.get('_source', {})
+                response = self._body(es.scroll(scroll_id=scrollId, scroll=keepAlive))
+                scrollId = response.get('_scroll_id', scrollId)
+        finally:
+            if scrollId:
+                try:
+                    es.clear_scroll(scroll_id=scrollId)
+                except BaseException:
+                    # the scroll expires on its own
+                    pass
+
+    def _iter_sliced_scroll(self, es, configuration, slices):
+        """Reads the slices of a sliced scroll in parallel threads
+
+        At most `scroll_buffer` pages per slice are held in memory, see `merge_streams`
+
+        Args:
+            es (elasticsearch.Elasticsearch): Client to query with
+            configuration (dict): Configuration of Source
+            slices (int): Slices to read
+
+        Returns:
+            generator: `_source` of each hit
+
+        """
+        return self.merge_streams(
+            [partial(self._iter_scroll, es, configuration, sliceId, slices) for sliceId in range(slices)],
+            int(configuration.get('page_size', 1000)),
+            self.scroll_buffer,
+            "GREASE ES SLICE"
+        )
+
     def mock_data(self, configuration):
         """Data from this source is mocked utilizing the GREASE Filesystem
 
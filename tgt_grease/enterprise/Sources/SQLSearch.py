@@ -1,11 +1,15 @@
 from tgt_grease.enterprise.Model import BaseSourceClass
 from tgt_grease.core import Configuration, GreaseContainer
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import datetime
+from functools import partial
 import fnmatch
 import json
 import os
+import threading
+from uuid import uuid4
+
+# DSN -> (psycopg2.pool.ThreadedConnectionPool, semaphore of free connections) shared by every SQLSource
+GREASE_SQL_POOLS = {}
+GREASE_SQL_POOLS_LOCK = threading.Lock()
 
 
 class SQLSource(BaseSourceClass):
@@ -24,6 +28,14 @@ class SQLSource(BaseSourceClass):
             'query': 'select count(*) as order_total from orders where oDate::DATE = current_data', # <-- SQL Query to execute on server
             'hour': 16, # <-- **OPTIONAL** 24hr time hour to poll SQL
             'minute': 30, # <-- **OPTIONAL** Minute to poll SQL
+            'pool': True, # <-- **OPTIONAL** Borrow the connection from a pool shared by configurations of the DSN
+            'stream': True, # <-- **OPTIONAL** Read rows through a server side cursor & schedule them as they are read
+            'chunk_size': 1000, # <-- **OPTIONAL** Rows deduplicated & scheduled at a time when streaming
+            'batch_size': 1000, # <-- **OPTIONAL** Rows fetched from the server at a time
+            'checkpoint': 'updated_at', # <-- **OPTIONAL** Column; only rows from its value at the last scan on are read
+            'partitions': 4, # <-- **OPTIONAL** Split the query into this many partitions read concurrently
+            'partition_column': 'id', # <-- **OPTIONAL** Numeric column the query is partitioned on; defaults to id
+            'partition_mode': 'range', # <-- **OPTIONAL** `range` of the column's values or `modulo` of the column
             'logic': {} # <-- Whatever logic your heart desires
         }
 
@@ -37,9 +49,17 @@ class SQLSource(BaseSourceClass):
         **Hour and minute parameters are in UTC time**
     Note:
         To only poll once an hour only set the **minute** field
+    Note:
+        Pools hold up to `Sourcing.sql_pool_size` connections per DSN
+    Note:
+        Partitions are read over pooled connections so at most `Sourcing.sql_pool_size` run at once. Rows arrive in
+        no particular order & rows with a NULL partition column are not read
 
     """
 
+    # batches of rows queued per partition while waiting to be read
+    partition_buffer = 4
+
     def parse_source(self, configuration):
         """This will Query the SQL Server to find data
 
@@ -51,41 +71,305 @@ class SQLSource(BaseSourceClass):
 
         """
         ioc = GreaseContainer()
-        if configuration.get('hour'):
-            if datetime.datetime.utcnow().hour != int(configuration.get('hour')):
-                # it is not the correct hour
-                return True
-        if configuration.get('minute'):
-            if datetime.datetime.utcnow().minute != int(configuration.get('minute')):
-                # it is not the correct hour
-                return True
-        if configuration.get('type') != 'postgresql':
-            ioc.getLogger().error("Unsupported SQL Server Type; Currently Only supporting PostgreSQL", notify=False)
+        try:
+            for chunk in self.iter_data(configuration, int(configuration.get('batch_size', 1000))):
+                self._data.extend(chunk)
+        except Exception as e:
+            # Naked except to prevent issues around connections
+            ioc.getLogger().error("Error processing configuration; Error [{0}]".format(e), notify=False)
             return False
+        return True
+
+    def streams(self, configuration):
+        """Configurations reading rows through a server side cursor are streamed by the scan engine
+
+        Args:
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+
+        Returns:
+            bool: If the configuration is streamed
+
+        """
+        return bool(configuration.get('stream'))
+
+    def iter_data(self, configuration, chunk_size=1000):
+        """Streams the rows of the SQL Server in chunks, tracking the checkpoint column as they are read
+
+        Args:
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+            chunk_size (int): Maximum rows per chunk
+
+        Returns:
+            generator: Chunks of rows as list[dict]
+
+        Raises:
+            ValueError: If the server type is unsupported or the DSN variable or query are missing
+
+        """
+        if not self.is_due(configuration):
+            # it is not the correct hour or minute
+            return
+        if configuration.get('type') != 'postgresql':
+            raise ValueError("Unsupported SQL Server Type; Currently Only supporting PostgreSQL")
+        # ensure the DSN is setup and the query is present
+        DSN = os.environ.get(configuration.get('dsn'))
+        if not DSN or not configuration.get('query'):
+            raise ValueError("Failed to locate the DSN variable")
+        checkpoint = None
+        if configuration.get('checkpoint'):
+            checkpoint = self.load_checkpoint(GreaseContainer(), configuration)
+        if int(configuration.get('partitions', 1)) > 1:
+            rows = self.iter_partitioned_rows(DSN, configuration, checkpoint)
         else:
-            # Attempt to get the DSN for the connection
-            if os.environ.get(configuration.get('dsn')) and configuration.get('query'):
-                # ensure the DSN is setup and the query is present
-                try:
-                    DSN = os.environ.get(configuration.get('dsn'))
-                    with psycopg2.connect(DSN) as conn:
-                        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                            cursor.execute(configuration.get('query'))
-                            data = cursor.fetchall()
-                            for row in data:
-                                self._data.append(row)
-                            del ioc
-                    return True
-                except Exception as e:
-                    # Naked except to prevent issues around connections
-                    ioc.getLogger().error("Error processing configuration; Error [{0}]".format(e.message), notify=False)
-                    del ioc
-                    return False
+            rows = self.iter_rows(DSN, configuration, checkpoint)
+        column = configuration.get('checkpoint')
+        chunk = []
+        for row in rows:
+            if column and not self.track_checkpoint(row.get(column), row):
+                # read by the last scan
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def get_connection(DSN):
+        """Borrows a connection from the pool of a DSN, creating the pool if needed
+
+        Waits for a connection once all `Sourcing.sql_pool_size` connections are borrowed
+
+        Args:
+            DSN (str): Connection string
+
+        Returns:
+            psycopg2.extensions.connection: Connection to return with `put_connection`
+
+        """
+        global GREASE_SQL_POOLS
+        from psycopg2.pool import ThreadedConnectionPool
+        with GREASE_SQL_POOLS_LOCK:
+            if DSN not in GREASE_SQL_POOLS:
+                size = int(Configuration.get('Sourcing', 'sql_pool_size', 5))
+                GREASE_SQL_POOLS[DSN] = (ThreadedConnectionPool(1, size, DSN), threading.BoundedSemaphore(size))
+            pool, free = GREASE_SQL_POOLS[DSN]
+        free.acquire()
+        try:
+            return pool.getconn()
+        except BaseException:
+            free.release()
+            raise
+
+    @staticmethod
+    def put_connection(DSN, conn, close=False):
+        """Returns a connection from `get_connection` to its pool
+
+        Args:
+            DSN (str): Connection string
+            conn (psycopg2.extensions.connection): Connection borrowed
+            close (bool): Close the connection instead of reusing it
+
+        Returns:
+            None: Void Method to return the connection
+
+        """
+        pool, free = GREASE_SQL_POOLS[DSN]
+        try:
+            pool.putconn(conn, close=close)
+        finally:
+            free.release()
+
+    @staticmethod
+    def checkpoint_query(configuration, checkpoint):
+        """Limits a configuration's query to rows at or above its watermark
+
+        Rows at the watermark are read again so rows committed with the same value after the last scan are not missed;
+        the ones the last scan read are skipped by `track_checkpoint`
+
+        Args:
+            configuration (dict): Configuration of Source
+            checkpoint (object): Committed watermark; None to read every row
+
+        Returns:
+            tuple: Query & its parameters
+
+        """
+        query = configuration.get('query')
+        if not configuration.get('checkpoint') or checkpoint is None:
+            return query, None
+        column = '"{0}"'.format(str(configuration.get('checkpoint')).replace('"', '""'))
+        # percent signs in the configured query are literal once parameters are passed
+        return "SELECT * FROM ({0}) AS grease_checkpoint WHERE {1} >= %(checkpoint)s".format(
+            query.strip().rstrip(';').replace('%', '%%'),
+            column
+        ), {'checkpoint': checkpoint}
+
+    @staticmethod
+    def partition_query(configuration, checkpoint, condition, params):
+        """Limits a configuration's query, after its checkpoint, to the rows of a partition
+
+        Args:
+            configuration (dict): Configuration of Source
+            checkpoint (object): Committed watermark; None to read every row
+            condition (str): SQL condition selecting the partition's rows
+            params (dict): Parameters of the condition
+
+        Returns:
+            tuple: Query & its parameters
+
+        """
+        query, queryParams = SQLSource.checkpoint_query(configuration, checkpoint)
+        if queryParams is None:
+            # percent signs in the configured query are literal once parameters are passed
+            query, queryParams = query.strip().rstrip(';').replace('%', '%%'), {}
+        merged = dict(queryParams)
+        merged.update(params)
+        return "SELECT * FROM ({0}) AS grease_partition WHERE {1}".format(query, condition), merged
+
+    def partition_queries(self, DSN, configuration, checkpoint=None):
+        """Splits a configuration's query into `partitions` queries on `partition_column`
+
+        In `modulo` mode each partition reads the rows whose column modulo `partitions` is its number. In `range` mode
+        the column's minimum & maximum are read first then split into equal ranges, which suits keys that are spread
+        evenly like serial ids
+
+        Args:
+            DSN (str): Connection string
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+            checkpoint (object): Only rows at or above this value of the `checkpoint` column are read if set
+
+        Returns:
+            list[tuple]: Query & its parameters of each partition; empty if there are no rows to read
+
+        """
+        partitions = int(configuration.get('partitions', 1))
+        column = '"{0}"'.format(str(configuration.get('partition_column', 'id')).replace('"', '""'))
+        if configuration.get('partition_mode', 'range') == 'modulo':
+            return [
+                self.partition_query(
+                    configuration,
+                    checkpoint,
+                    "abs(mod({0}, %(grease_partitions)s)) = %(grease_partition)s".format(column),
+                    {'grease_partitions': partitions, 'grease_partition': number}
+                )
+                for number in range(partitions)
+            ]
+        query, params = self.partition_query(configuration, checkpoint, 'TRUE', {})
+        conn = self.get_connection(DSN)
+        broken = False
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT min({0}), max({0}) FROM ({1}) AS grease_bounds".format(column, query),
+                    params
+                )
+                low, high = cursor.fetchone()
+            finally:
+                cursor.close()
+            conn.commit()
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            self.put_connection(DSN, conn, broken)
+        if low is None:
+            return []
+        bounds = [low + (high - low) * number // partitions for number in range(partitions)] + [high]
+        queries = []
+        for number in range(partitions):
+            if number < partitions - 1 and bounds[number] == bounds[number + 1]:
+                # fewer distinct values than partitions
+                continue
+            queries.append(self.partition_query(
+                configuration,
+                checkpoint,
+                "{0} >= %(grease_low)s AND {0} {1} %(grease_high)s".format(
+                    column,
+                    '<=' if number == partitions - 1 else '<'
+                ),
+                {'grease_low': bounds[number], 'grease_high': bounds[number + 1]}
+            ))
+        return queries
+
+    def iter_partitioned_rows(self, DSN, configuration, checkpoint=None):
+        """Streams the rows of a configuration's query, reading its partitions concurrently
+
+        Each partition is read by its own thread over a pooled connection & rows are returned as they arrive
+
+        Args:
+            DSN (str): Connection string
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+            checkpoint (object): Only rows at or above this value of the `checkpoint` column are read if set
+
+        Returns:
+            generator: Each row as a dict
+
+        """
+        pooled = dict(configuration, pool=True)
+        return self.merge_streams(
+            [
+                partial(self.iter_rows, DSN, pooled, checkpoint, query)
+                for query in self.partition_queries(DSN, configuration, checkpoint)
+            ],
+            int(configuration.get('batch_size', 1000)),
+            self.partition_buffer,
+            "GREASE SQL PARTITION [{0}]".format(configuration.get('name'))
+        )
+
+    def iter_rows(self, DSN, configuration, checkpoint=None, query=None):
+        """Streams the rows of a configuration's query
+
+        Rows are fetched `batch_size` at a time. With `stream` a named server side cursor is used so only a batch of
+        rows is held in memory; otherwise the driver reads the whole result before the first row is returned
+
+        Args:
+            DSN (str): Connection string
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+            checkpoint (object): Only rows at or above this value of the `checkpoint` column are read if set
+            query (tuple): Query & its parameters to run instead of the configuration's, like a partition's
+
+        Returns:
+            generator: Each row as a dict
+
+        """
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+        batchSize = int(configuration.get('batch_size', 1000))
+        pooled = bool(configuration.get('pool'))
+        conn = self.get_connection(DSN) if pooled else psycopg2.connect(DSN)
+        broken = False
+        try:
+            if configuration.get('stream'):
+                cursor = conn.cursor(name="grease_{0}".format(uuid4().hex), cursor_factory=RealDictCursor)
+                cursor.itersize = batchSize
+            else:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+            try:
+                cursor.execute(*(query or self.checkpoint_query(configuration, checkpoint)))
+                while True:
+                    rows = cursor.fetchmany(batchSize)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+            finally:
+                cursor.close()
+            conn.commit()
+        except GeneratorExit:
+            # stopped early; the connection is still good
+            conn.rollback()
+            raise
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            if pooled:
+                self.put_connection(DSN, conn, broken)
             else:
-                # could not get the DSN
-                ioc.getLogger().error("Failed to locate the DSN variable", notify=False)
-                del ioc
-                return False
+                conn.close()
 
     def mock_data(self, configuration):
         """Data from this source is mocked utilizing the GREASE Filesystem
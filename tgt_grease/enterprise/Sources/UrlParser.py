@@ -1,10 +1,23 @@
 from tgt_grease.enterprise.Model import BaseSourceClass
-from tgt_grease.core import Configuration
+from tgt_grease.core import Configuration, GreaseContainer
 import json
 import fnmatch
 import os
-import requests
-import datetime
+from collections import OrderedDict
+import hashlib
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+# keep-alive session shared by every URLParser; created on first use
+GREASE_URL_SESSION = None
+GREASE_URL_SESSION_LOCK = threading.Lock()
+# (configuration name, URL) -> validators of the response last scheduled; least recently used first
+GREASE_URL_VALIDATORS = OrderedDict()
+GREASE_URL_VALIDATORS_LOCK = threading.Lock()
 
 
 class URLParser(BaseSourceClass):
@@ -21,13 +34,25 @@ class URLParser(BaseSourceClass):
             'url': ['google.com', 'http://bing.com', '8.8.8.8'], # <-- List of URL's to parse
             'hour': 16, # <-- **OPTIONAL** 24hr time hour to poll URLs
             'minute': 30, # <-- **OPTIONAL** Minute to poll URLs
+            'concurrency': 10, # <-- **OPTIONAL** URLs fetched at a time
+            'connect_timeout': 5, # <-- **OPTIONAL** Seconds to wait for a connection
+            'read_timeout': 30, # <-- **OPTIONAL** Seconds to wait between bytes of a response
+            'cache': True, # <-- **OPTIONAL** Skip responses unchanged since they were last scheduled
             'logic': {} # <-- Whatever logic your heart desires
         }
 
     Note:
         This configuration is an example
     Note:
-        If a URL in the `url` parameter is not prefixed with `http://` then the class will do so for you
+        If a URL in the `url` parameter is not prefixed with `http://` or `https://` then the class will prefix
+        `http://` for you
+    Note:
+        Connections are kept alive in a pool of `Sourcing.url_pool_size` connections per host shared by every
+        configuration. Timeouts default to `Sourcing.url_connect_timeout` & `Sourcing.url_read_timeout`
+    Note:
+        With `cache` URLs are fetched with `If-None-Match` & `If-Modified-Since` from the ETag & Last-Modified of the
+        response last scheduled. Responses that are not modified, or whose body hashes the same, are skipped before
+        deduplication. Validators of the last `Sourcing.url_cache_size` URLs are kept by the node in memory
     Note:
         without `minute` parameter the engine will poll for the entire hour
     Note:
@@ -37,6 +62,11 @@ class URLParser(BaseSourceClass):
 
     """
 
+    def __init__(self):
+        super(URLParser, self).__init__()
+        # (configuration name, URL) -> validators of responses read; committed once the data is scheduled
+        self.validators = {}
+
     def parse_source(self, configuration):
         """This will make a GET request to all URL's in the list provided by your configuration
 
@@ -48,36 +78,160 @@ class URLParser(BaseSourceClass):
 
         """
         scannable = len(configuration.get('url', []))
-        if scannable is 0:
+        if scannable == 0:
             return False
         scanned = 0
-        if configuration.get('hour'):
-            if datetime.datetime.utcnow().hour != int(configuration.get('hour')):
-                # it is not the correct hour
-                return True
-        if configuration.get('minute'):
-            if datetime.datetime.utcnow().minute != int(configuration.get('minute')):
-                # it is not the correct hour
-                return True
-        for URL in configuration.get('url', []):  # type: str
-            if not URL.startswith("http://"):
-                URL = "http://" + URL
-            try:
-                response = requests.get(URL)
-                self._data.append({
-                    'url': response.url.encode('utf-8', 'ignore'),
-                    'status_code': int(response.status_code),
-                    'headers': str(response.headers),
-                    'body': response.text.encode('utf-8', 'ignore')
-                })
-                scanned += 1
-            except requests.HTTPError:
+        if not self.is_due(configuration):
+            # it is not the correct hour or minute
+            return True
+        for response in self.fetch(GreaseContainer(), configuration.get('url', []), configuration):
+            if response is None:
                 continue
+            if response is not False:
+                self._data.append(response)
+            scanned += 1
         if scanned < (scannable / 2):
             return False
         else:
             return True
 
+    @staticmethod
+    def get_session():
+        """Gets the keep-alive session shared by every URLParser, creating it if needed
+
+        Returns:
+            requests.Session: Shared session
+
+        """
+        global GREASE_URL_SESSION
+        import requests
+        from requests.adapters import HTTPAdapter
+        with GREASE_URL_SESSION_LOCK:
+            if GREASE_URL_SESSION is None:
+                size = int(Configuration.get('Sourcing', 'url_pool_size', 20))
+                session = requests.Session()
+                session.mount('http://', HTTPAdapter(pool_maxsize=size))
+                session.mount('https://', HTTPAdapter(pool_maxsize=size))
+                GREASE_URL_SESSION = session
+            return GREASE_URL_SESSION
+
+    def fetch(self, ioc, URLs, configuration):
+        """GETs URLs concurrently over the shared session
+
+        At most `concurrency` URLs are fetched at a time. A URL that fails to connect or respond within its timeouts
+        is logged & skipped so a dead host only costs its own timeout
+
+        Args:
+            ioc (GreaseContainer): IOC to log failures with
+            URLs (list[str]): URLs to GET
+            configuration (dict): Configuration of Source. See Class Documentation above for more info
+
+        Returns:
+            list[dict]: Response of each URL in order; None for URLs that failed, False for cached URLs unchanged
+
+        """
+        import requests
+        session = self.get_session()
+        timeout = (
+            float(configuration.get('connect_timeout', Configuration.get('Sourcing', 'url_connect_timeout', 5))),
+            float(configuration.get('read_timeout', Configuration.get('Sourcing', 'url_read_timeout', 30)))
+        )
+        pending = queue.Queue()
+        for index, URL in enumerate(URLs):
+            pending.put((index, URL))
+
+        def worker():
+            while True:
+                try:
+                    index, URL = pending.get_nowait()
+                except queue.Empty:
+                    return
+                if not URL.startswith(("http://", "https://")):
+                    URL = "http://" + URL
+                key = (configuration.get('name'), URL)
+                cached = self.get_validators(key) if configuration.get('cache') else None
+                headers = {}
+                if cached and cached.get('etag'):
+                    headers['If-None-Match'] = cached.get('etag')
+                if cached and cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached.get('last_modified')
+                try:
+                    response = session.get(URL, timeout=timeout, headers=headers)
+                    if configuration.get('cache'):
+                        if cached and response.status_code == 304:
+                            yield index, False
+                            continue
+                        digest = hashlib.sha1(response.content).hexdigest()
+                        if cached and cached.get('hash') == digest:
+                            yield index, False
+                            continue
+                        self.validators[key] = {
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified'),
+                            'hash': digest
+                        }
+                    yield index, {
+                        'url': response.url.encode('utf-8', 'ignore'),
+                        'status_code': int(response.status_code),
+                        'headers': str(response.headers),
+                        'body': response.text.encode('utf-8', 'ignore')
+                    }
+                except requests.RequestException as e:
+                    ioc.getLogger().warning(
+                        "Failed to fetch URL [{0}] of configuration [{1}]: {2}".format(
+                            URL, configuration.get('name'), e
+                        ),
+                        notify=False
+                    )
+
+        responses = [None] * len(URLs)
+        for index, response in self.merge_streams(
+                [worker] * max(min(int(configuration.get('concurrency', 10)), len(URLs)), 1),
+                batchSize=1,
+                name="GREASE URL FETCH [{0}]".format(configuration.get('name'))
+        ):
+            responses[index] = response
+        return responses
+
+    @staticmethod
+    def get_validators(key):
+        """Gets the validators of the response of a URL last scheduled
+
+        Args:
+            key (tuple): Configuration name & URL
+
+        Returns:
+            dict: ETag, Last-Modified & body hash of the response; None if it was not cached
+
+        """
+        with GREASE_URL_VALIDATORS_LOCK:
+            if key not in GREASE_URL_VALIDATORS:
+                return None
+            validators = GREASE_URL_VALIDATORS.pop(key)
+            GREASE_URL_VALIDATORS[key] = validators
+            return validators
+
+    def commit_checkpoint(self, ioc, configuration):
+        """Commits the validators of the responses read once the data was scheduled
+
+        Args:
+            ioc (GreaseContainer): IOC to access MongoDB with
+            configuration (dict): Configuration the data was sourced with
+
+        Returns:
+            bool: If a watermark was committed
+
+        """
+        size = int(Configuration.get('Sourcing', 'url_cache_size', 10000))
+        with GREASE_URL_VALIDATORS_LOCK:
+            for key, validators in self.validators.items():
+                GREASE_URL_VALIDATORS.pop(key, None)
+                GREASE_URL_VALIDATORS[key] = validators
+            while len(GREASE_URL_VALIDATORS) > size:
+                GREASE_URL_VALIDATORS.popitem(last=False)
+        self.validators = {}
+        return super(URLParser, self).commit_checkpoint(ioc, configuration)
+
     def mock_data(self, configuration):
         """Data from this source is mocked utilizing the GREASE Filesystem
 
@@ -0,0 +1,235 @@
+from unittest import TestCase
+from tgt_grease.enterprise.Sources import elastic_source
+from tgt_grease.enterprise.Sources import ElasticSearch
+from tgt_grease.core import GreaseContainer
+from tgt_grease.enterprise.Model import Scan
+import time
+import uuid
+
+
+class FakeElasticsearch(object):
+    """Serves documents like ElasticSearch's search, scroll & search_after APIs"""
+
+    def __init__(self, total):
+        self.docs = [{'_source': {'count': i}, 'sort': [i]} for i in range(total)]
+        self.scrolls = {}
+        self.cleared = []
+        self.requests = 0
+
+    def search(self, index, body, scroll=None):
+        self.requests += 1
+        docs = self.docs
+        if 'slice' in body:
+            docs = [doc for doc in docs if doc['sort'][0] % body['slice']['max'] == body['slice']['id']]
+        if 'search_after' in body:
+            docs = [doc for doc in docs if doc['sort'] > body['search_after']]
+        # ElasticSearch returns 10 hits unless asked otherwise
+        size = body.get('size', 10)
+        if scroll:
+            scrollId = str(len(self.scrolls))
+            self.scrolls[scrollId] = (docs, size)
+            return {'_scroll_id': scrollId, 'hits': {'hits': docs[:size]}}
+        return {'hits': {'hits': docs[:size]}}
+
+    def scroll(self, scroll_id, scroll):
+        self.requests += 1
+        docs, size = self.scrolls[scroll_id]
+        docs = docs[size:]
+        self.scrolls[scroll_id] = (docs, size)
+        return {'_scroll_id': scroll_id, 'hits': {'hits': docs[:size]}}
+
+    def clear_scroll(self, scroll_id):
+        self.cleared.append(scroll_id)
+
+
+class FakeCheckpointElasticsearch(FakeElasticsearch):
+    """Serves documents sorted by an `updated` field, applying a checkpoint's range filter"""
+
+    def __init__(self, updated):
+        super(FakeCheckpointElasticsearch, self).__init__(0)
+        self.docs = [
+            {'_source': {'count': i, 'updated': value}, 'sort': [value, i]} for i, value in enumerate(updated)
+        ]
+
+    def search(self, index, body, scroll=None):
+        docs = self.docs
+        for condition in body.get('query', {}).get('bool', {}).get('filter', []):
+            self.docs = [doc for doc in docs if doc['_source']['updated'] >= condition['range']['updated']['gte']]
+        try:
+            return super(FakeCheckpointElasticsearch, self).search(index, body, scroll)
+        finally:
+            self.docs = docs
+
+
+class RecordingScheduling(object):
+
+    def __init__(self):
+        self.scheduled = []
+
+    def scheduleDetection(self, source, configName, data):
+        self.scheduled.extend(data)
+        return True
+
+
+class FakeTransport(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestElasticSource(TestCase):
+
+    def setUp(self):
+        self.configuration = {
+            'name': 'es test',
+            'source': 'elastic_source',
+            'server': 'http://localhost:9200',
+            'index': 'test',
+            'query': {'query': {'match_all': {}}},
+            'page_size': 10
+        }
+
+    def test_search_after(self):
+        es = FakeElasticsearch(95)
+        conf = dict(self.configuration, stream='search_after', sort=[{'count': 'asc'}])
+        hits = list(elastic_source().iter_hits(es, conf))
+        self.assertEqual([hit['count'] for hit in hits], list(range(95)))
+        self.assertEqual(es.requests, 10)
+
+    def test_scroll(self):
+        es = FakeElasticsearch(25)
+        hits = list(elastic_source().iter_hits(es, dict(self.configuration, stream='scroll')))
+        self.assertEqual([hit['count'] for hit in hits], list(range(25)))
+        self.assertEqual(es.cleared, ['0'])
+
+    def test_sliced_scroll(self):
+        es = FakeElasticsearch(1000)
+        hits = list(elastic_source().iter_hits(es, dict(self.configuration, stream='scroll', slices=4)))
+        self.assertEqual(sorted(hit['count'] for hit in hits), list(range(1000)))
+        self.assertEqual(sorted(es.cleared), ['0', '1', '2', '3'])
+
+    def test_stop_early(self):
+        es = FakeElasticsearch(1000)
+        source = elastic_source()
+        hits = source.iter_hits(es, dict(self.configuration, stream='scroll', slices=4))
+        self.assertEqual(len([hit for _, hit in zip(range(15), hits)]), 15)
+        hits.close()
+        self.assertLess(es.requests, 100)
+
+    def test_client_registry(self):
+        idle = FakeElasticsearch(0)
+        idle.transport = FakeTransport()
+        busy = FakeElasticsearch(0)
+        busy.transport = FakeTransport()
+        shared = FakeElasticsearch(0)
+        old = time.time() - 3600
+        ElasticSearch.GREASE_ELASTIC_CLIENTS.update({
+            'http://idle:9200': [idle, old, 0],
+            'http://busy:9200': [busy, old, 1],
+            'http://shared:9200': [shared, old, 0]
+        })
+        try:
+            self.assertIs(elastic_source.get_client('http://shared:9200'), shared)
+            self.assertIs(elastic_source.get_client('http://shared:9200'), shared)
+            self.assertEqual(ElasticSearch.GREASE_ELASTIC_CLIENTS['http://shared:9200'][2], 2)
+            # idle clients are closed; clients in use are kept
+            self.assertTrue(idle.transport.closed)
+            self.assertNotIn('http://idle:9200', ElasticSearch.GREASE_ELASTIC_CLIENTS)
+            self.assertFalse(busy.transport.closed)
+            elastic_source.release_client('http://shared:9200')
+            elastic_source.release_client('http://shared:9200')
+            self.assertEqual(ElasticSearch.GREASE_ELASTIC_CLIENTS['http://shared:9200'][2], 0)
+        finally:
+            ElasticSearch.GREASE_ELASTIC_CLIENTS.clear()
+
+    def test_client_real(self):
+        import elasticsearch
+        import elastic_transport
+        try:
+            client = elastic_source.get_client('http://localhost:9200')
+            self.assertIsInstance(client, elasticsearch.Elasticsearch)
+            self.assertIs(elastic_source.get_client('http://localhost:9200'), client)
+            # responses of the client are read through their body
+            response = elastic_transport.ObjectApiResponse(body={'hits': {'hits': []}}, meta=None)
+            self.assertEqual(elastic_source._body(response), {'hits': {'hits': []}})
+            elastic_source.release_client('http://localhost:9200')
+            elastic_source.release_client('http://localhost:9200')
+        finally:
+            ElasticSearch.GREASE_ELASTIC_CLIENTS.clear()
+
+    def test_iter_data(self):
+        es = FakeElasticsearch(25)
+        source = elastic_source()
+        conf = dict(self.configuration, stream='scroll')
+        self.assertTrue(source.streams(conf))
+        self.assertFalse(source.streams(self.configuration))
+        ElasticSearch.GREASE_ELASTIC_CLIENTS['http://localhost:9200'] = [es, time.time(), 0]
+        try:
+            chunks = list(source.iter_data(conf, chunk_size=10))
+            self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+            self.assertEqual(chunks[2][4], {'count': 24})
+            chunks = list(source.iter_data(dict(conf, max_hits=12), chunk_size=10))
+            self.assertEqual([len(chunk) for chunk in chunks], [10, 2])
+            self.assertEqual(ElasticSearch.GREASE_ELASTIC_CLIENTS['http://localhost:9200'][2], 0)
+            with self.assertRaises(ValueError):
+                list(source.iter_data(dict(conf, index=None)))
+        finally:
+            ElasticSearch.GREASE_ELASTIC_CLIENTS.clear()
+
+    def test_checkpoint_query(self):
+        conf = dict(self.configuration, checkpoint='updated')
+        body = elastic_source.checkpoint_query(conf, None)
+        self.assertEqual(body['query'], {'match_all': {}})
+        self.assertEqual(body['sort'], [{'updated': 'asc'}, {'_doc': 'asc'}])
+        body = elastic_source.checkpoint_query(conf, 10)
+        self.assertEqual(body['query']['bool']['must'], [{'match_all': {}}])
+        self.assertEqual(body['query']['bool']['filter'], [{'range': {'updated': {'gte': 10}}}])
+        # the configured query is left alone
+        self.assertEqual(conf['query'], {'query': {'match_all': {}}})
+        source = elastic_source()
+        for value in [3, None, 12, 7]:
+            source.track_checkpoint(value)
+        self.assertEqual(source.checkpoint, 12)
+
+    def test_checkpoint_duplicates(self):
+        ioc = GreaseContainer()
+        es = FakeCheckpointElasticsearch([1, 1, 2, 2, 2, 2, 3, 3])
+        conf = dict(
+            self.configuration, name='es checkpoint test', stream='search_after', checkpoint='updated', max_hits=4
+        )
+        ElasticSearch.GREASE_ELASTIC_CLIENTS['http://localhost:9200'] = [es, time.time(), 0]
+        try:
+            counts = []
+            for _ in range(3):
+                source = elastic_source()
+                counts.append([hit['count'] for chunk in source.iter_data(conf) for hit in chunk])
+                source.commit_checkpoint(ioc, conf)
+            # the run of 2s cut by max_hits is finished by the next scan without reading its start again
+            self.assertEqual(counts, [[0, 1, 2, 3], [4, 5, 6, 7], []])
+        finally:
+            ElasticSearch.GREASE_ELASTIC_CLIENTS.clear()
+            ioc.getCollection('SourceCheckpoints').delete_many({'configuration': 'es checkpoint test'})
+
+    def test_parse_source_schedules_hits(self):
+        ioc = GreaseContainer()
+        es = FakeElasticsearch(0)
+        es.docs = [{'_source': {'name': str(uuid.uuid4())}, 'sort': [i]} for i in range(15)]
+        conf = dict(self.configuration, name='es parse test')
+        ElasticSearch.GREASE_ELASTIC_CLIENTS['http://localhost:9200'] = [es, time.time(), 0]
+        try:
+            source = elastic_source()
+            self.assertFalse(source.streams(conf))
+            self.assertTrue(source.parse_source(conf))
+            self.assertEqual(source.get_data(), [doc['_source'] for doc in es.docs[:10]])
+            scheduling = RecordingScheduling()
+            Scan.ParseSource(ioc, elastic_source(), conf, Scan(ioc).dedup, scheduling)
+            # hits are documents the scan engine deduplicates & schedules
+            self.assertTrue(scheduling.scheduled)
+            names = [doc['_source']['name'] for doc in es.docs[:10]]
+            self.assertTrue(all(doc['name'] in names for doc in scheduling.scheduled))
+        finally:
+            ElasticSearch.GREASE_ELASTIC_CLIENTS.clear()
+            ioc.getCollection('Dedup_Sourcing').drop()
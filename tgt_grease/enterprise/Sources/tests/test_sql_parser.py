@@ -1,10 +1,11 @@
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 from tgt_grease.enterprise.Sources import sql_source
-from tgt_grease.core import Configuration
+from tgt_grease.core import Configuration, GreaseContainer
 import json
 import os
 import psycopg2
 import datetime
+import time
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
 
@@ -130,6 +131,204 @@ class TestSQLSource(TestCase):
                 """)
         self.__cleanup_schema()
 
+    def test_sql_parser_stream_pooled(self):
+        self.__ensure_schema()
+        with psycopg2.connect(os.environ['GREASE_TEST_DSN']) as conn:
+            with conn.cursor() as cursor:
+                source = sql_source()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS 
+                      test_data
+                    (
+                        id SERIAL PRIMARY KEY NOT NULL,
+                        name_fs VARCHAR,
+                        name_ls VARCHAR
+                    );
+                """)
+                conn.commit()
+                cursor.execute("""
+                    INSERT INTO
+                      test_data
+                    (name_fs, name_ls)
+                    SELECT 'sally', 'sue' FROM generate_series(1, 250);
+                """)
+                conn.commit()
+                configuration = {
+                    'name': 'example_source',
+                    'job': 'example_job',
+                    'exe_env': 'general',
+                    'source': 'sql_source',
+                    'type': 'postgresql',
+                    'dsn': 'GREASE_TEST_DSN',
+                    'query': 'select * from test_data order by id;',
+                    'pool': True,
+                    'stream': True,
+                    'batch_size': 100,
+                    'logic': {}
+                }
+                self.assertTrue(source.parse_source(configuration))
+                data = source.get_data()
+                self.assertEqual(len(data), 250)
+                self.assertEqual(data[249].get('id'), 250)
+                # stopping early returns the connection to the pool
+                rows = source.iter_rows(os.environ['GREASE_TEST_DSN'], configuration)
+                self.assertEqual(next(rows).get('id'), 1)
+                rows.close()
+                self.assertTrue(sql_source().parse_source(configuration))
+                cursor.execute("""
+                    DROP TABLE public.test_data
+                """)
+        self.__cleanup_schema()
+
+    def test_sql_checkpoint_query(self):
+        conf = {'query': "select * from test_data where name_fs like 'sal%';", 'checkpoint': 'id'}
+        self.assertEqual(sql_source.checkpoint_query(conf, None), (conf['query'], None))
+        query, params = sql_source.checkpoint_query(conf, 5)
+        self.assertEqual(
+            query,
+            "SELECT * FROM (select * from test_data where name_fs like 'sal%%') AS grease_checkpoint WHERE \"id\" >= %(checkpoint)s"
+        )
+        self.assertEqual(params, {'checkpoint': 5})
+
+    def test_sql_checkpoint_duplicates(self):
+        self.__ensure_schema()
+        ioc = GreaseContainer()
+        with psycopg2.connect(os.environ['GREASE_TEST_DSN']) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS 
+                      test_data
+                    (
+                        id SERIAL PRIMARY KEY NOT NULL,
+                        updated INTEGER
+                    );
+                """)
+                cursor.execute("INSERT INTO test_data (updated) VALUES (1), (2)")
+                conn.commit()
+                configuration = {
+                    'name': 'sql checkpoint test',
+                    'source': 'sql_source',
+                    'type': 'postgresql',
+                    'dsn': 'GREASE_TEST_DSN',
+                    'query': "select * from test_data;",
+                    'checkpoint': 'updated'
+                }
+                source = sql_source()
+                self.assertTrue(source.parse_source(configuration))
+                self.assertEqual(sorted(row['id'] for row in source.get_data()), [1, 2])
+                self.assertTrue(source.commit_checkpoint(ioc, configuration))
+                # a row sharing the watermark lands after the scan
+                cursor.execute("INSERT INTO test_data (updated) VALUES (2), (3)")
+                conn.commit()
+                source = sql_source()
+                self.assertTrue(source.parse_source(configuration))
+                self.assertEqual(sorted(row['id'] for row in source.get_data()), [3, 4])
+                self.assertTrue(source.commit_checkpoint(ioc, configuration))
+                source = sql_source()
+                self.assertTrue(source.parse_source(configuration))
+                self.assertEqual(source.get_data(), [])
+                ioc.getCollection('SourceCheckpoints').delete_many({'configuration': 'sql checkpoint test'})
+                cursor.execute("""
+                    DROP TABLE public.test_data
+                """)
+        self.__cleanup_schema()
+
+    def test_sql_partition_query(self):
+        conf = {'query': "select * from test_data where name_fs like 'sal%';", 'checkpoint': 'id'}
+        query, params = sql_source.partition_query(conf, None, '"id" >= %(grease_low)s', {'grease_low': 3})
+        self.assertEqual(
+            query,
+            "SELECT * FROM (select * from test_data where name_fs like 'sal%%') AS grease_partition WHERE \"id\" >= %(grease_low)s"
+        )
+        self.assertEqual(params, {'grease_low': 3})
+        query, params = sql_source.partition_query(conf, 5, 'TRUE', {})
+        self.assertTrue(query.startswith("SELECT * FROM (SELECT * FROM (select"))
+        self.assertEqual(params, {'checkpoint': 5})
+        queries = sql_source().partition_queries(None, dict(conf, partitions=3, partition_mode='modulo'), None)
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(queries[2][1], {'grease_partitions': 3, 'grease_partition': 2})
+
+    def __load_partition_data(self, conn, cursor):
+        # Helper function; fills test_data with 50,000 rows and returns a streamed configuration reading them
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS 
+              test_data
+            (
+                id SERIAL PRIMARY KEY NOT NULL,
+                name_fs VARCHAR,
+                name_ls VARCHAR
+            );
+        """)
+        conn.commit()
+        cursor.execute("""
+            INSERT INTO
+              test_data
+            (name_fs, name_ls)
+            SELECT 'sally', md5(g::text) FROM generate_series(1, 50000) g;
+        """)
+        conn.commit()
+        return {
+            'name': 'example_source',
+            'job': 'example_job',
+            'exe_env': 'general',
+            'source': 'sql_source',
+            'type': 'postgresql',
+            'dsn': 'GREASE_TEST_DSN',
+            'query': "select id, md5(repeat(name_ls, 100)) as digest from test_data where name_fs like 'sal%';",
+            'stream': True,
+            'batch_size': 1000,
+            'logic': {}
+        }
+
+    def test_sql_parser_partitioned(self):
+        self.__ensure_schema()
+        with psycopg2.connect(os.environ['GREASE_TEST_DSN']) as conn:
+            with conn.cursor() as cursor:
+                configuration = self.__load_partition_data(conn, cursor)
+                for extra in (
+                        {},
+                        {'partitions': 4},
+                        {'partitions': 4, 'partition_mode': 'modulo'}
+                ):
+                    source = sql_source()
+                    self.assertTrue(source.parse_source(dict(configuration, **extra)))
+                    ids = sorted(row.get('id') for row in source.get_data())
+                    self.assertEqual(ids, list(range(1, 50001)))
+                cursor.execute("""
+                    DROP TABLE public.test_data
+                """)
+        self.__cleanup_schema()
+
+    @skipUnless(os.environ.get('GREASE_BENCHMARK'), "set GREASE_BENCHMARK to run benchmarks")
+    def test_sql_parser_partitioned_benchmark_50k(self):
+        self.__ensure_schema()
+        with psycopg2.connect(os.environ['GREASE_TEST_DSN']) as conn:
+            with conn.cursor() as cursor:
+                configuration = self.__load_partition_data(conn, cursor)
+                timings = {}
+                for mode, extra in (
+                        ('single', {}),
+                        ('range', {'partitions': 4}),
+                        ('modulo', {'partitions': 4, 'partition_mode': 'modulo'})
+                ):
+                    source = sql_source()
+                    start = time.time()
+                    self.assertTrue(source.parse_source(dict(configuration, **extra)))
+                    timings[mode] = time.time() - start
+                # speed up depends on the cores of the server; partitioning must at least not cost much
+                for mode in ('range', 'modulo'):
+                    self.assertLess(
+                        timings[mode],
+                        timings['single'] * 3,
+                        "{0} partitions took {1:.3f}s vs {2:.3f}s unpartitioned".format(
+                            mode, timings[mode], timings['single']
+                        )
+                    )
+                cursor.execute("""
+                    DROP TABLE public.test_data
+                """)
+        self.__cleanup_schema()
+
     def test_sql_parser_bad_type(self):
         source = sql_source()
         self.assertFalse(source.parse_source({
@@ -4,10 +4,118 @@ from tgt_grease.enterprise.Sources import url_source
 import json
 import os
 import datetime
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Responds after sleeping the seconds in the path; `/etag` responds with an ETag"""
+
+    def do_GET(self):
+        if self.path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+        elif self.path != '/static':
+            time.sleep(float(self.path.strip('/')))
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        if self.path == '/etag':
+            self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SlowServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
 
 
 class TestUrlParser(TestCase):
 
+    def setUp(self):
+        self.server = SlowServer(('127.0.0.1', 0), SlowHandler)
+        self.base = "127.0.0.1:{0}".format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_url_parser_concurrent(self):
+        source = url_source()
+        start = time.time()
+        self.assertTrue(source.parse_source({
+            'name': 'example_source',
+            'job': 'example_job',
+            'exe_env': 'general',
+            'source': 'url_source',
+            'url': ["{0}/0.{1}".format(self.base, index) for index in range(10, 30)],
+            'concurrency': 10,
+            'logic': {}
+        }))
+        # twenty responses of up to .3 seconds, ten at a time
+        self.assertLess(time.time() - start, 2)
+        Data = source.get_data()
+        self.assertEqual(len(Data), 20)
+        self.assertEqual(b'/0.10', Data[0].get('body'))
+        self.assertEqual(b'/0.29', Data[19].get('body'))
+
+    def test_url_parser_cache(self):
+        configuration = {
+            'name': 'test_url_parser_cache',
+            'job': 'example_job',
+            'exe_env': 'general',
+            'source': 'url_source',
+            'url': ["{0}/etag".format(self.base), "{0}/static".format(self.base)],
+            'cache': True,
+            'logic': {}
+        }
+        source = url_source()
+        self.assertTrue(source.parse_source(configuration))
+        self.assertEqual(len(source.get_data()), 2)
+        # nothing is cached until the data is scheduled
+        source = url_source()
+        self.assertTrue(source.parse_source(configuration))
+        self.assertEqual(len(source.get_data()), 2)
+        self.assertFalse(source.commit_checkpoint(None, configuration))
+        # the ETag gets a 304 & the static body hashes the same
+        source = url_source()
+        self.assertTrue(source.parse_source(configuration))
+        self.assertEqual(len(source.get_data()), 0)
+        # other configurations of the same URLs are not affected
+        source = url_source()
+        self.assertTrue(source.parse_source(dict(configuration, name='test_url_parser_cache_other')))
+        self.assertEqual(len(source.get_data()), 2)
+
+    def test_url_parser_timeout(self):
+        source = url_source()
+        start = time.time()
+        self.assertTrue(source.parse_source({
+            'name': 'example_source',
+            'job': 'example_job',
+            'exe_env': 'general',
+            'source': 'url_source',
+            'url': ["{0}/0".format(self.base), "http://{0}/0.1".format(self.base), "{0}/5".format(self.base)],
+            'read_timeout': .5,
+            'logic': {}
+        }))
+        self.assertLess(time.time() - start, 2)
+        Data = source.get_data()
+        self.assertEqual(len(Data), 2)
+        self.assertEqual([b'/0', b'/0.1'], [response.get('body') for response in Data])
+
     def test_url_parser_empty(self):
         source = url_source()
         self.assertFalse(source.parse_source({}))
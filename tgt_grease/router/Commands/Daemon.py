@@ -5,7 +5,6 @@ from tgt_grease.enterprise.Model import PrototypeConfig
 from datetime import datetime
 from bson.objectid import ObjectId
 import threading
-from psutil import cpu_percent, virtual_memory
 
 
 class DaemonProcess(object):
@@ -46,6 +45,7 @@ class DaemonProcess(object):
             bool: Server Success
 
         """
+        from psutil import cpu_percent, virtual_memory
         # Ensure we aren't swamping the system
         cpu = cpu_percent(interval=.1)
         mem = virtual_memory().percent
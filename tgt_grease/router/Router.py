@@ -9,6 +9,10 @@ class GreaseRouter(object):
 
     This class handles routing CLI requests as well as starting the Daemon on Windows/POSIX systems
 
+    Note:
+        The configuration, logger & import tool are shared by all routers but are only built when the first router
+        is constructed, so importing GREASE does not touch the filesystem or logging handlers
+
     Attributes:
         _config (Configuration): Main Configuration Object
         _logger (Logging): Main Logging Instance
@@ -17,12 +21,18 @@ class GreaseRouter(object):
 
     """
 
-    _config = Configuration(os.environ.get('GREASE_CONF', None))
-    _logger = Logging(_config)
-    _importTool = ImportTool(_logger)
+    _config = None
+    _logger = None
+    _importTool = None
     _exit_message = None
 
     def __init__(self):
+        if not isinstance(GreaseRouter._config, Configuration):
+            GreaseRouter._config = Configuration(os.environ.get('GREASE_CONF', None))
+        if not isinstance(GreaseRouter._logger, Logging):
+            GreaseRouter._logger = Logging(GreaseRouter._config)
+        if not isinstance(GreaseRouter._importTool, ImportTool):
+            GreaseRouter._importTool = ImportTool(GreaseRouter._logger)
         self._logger.trace("Router Startup", trace=True)
 
     def StartGREASE(self):